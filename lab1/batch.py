@@ -0,0 +1,209 @@
+"""
+Wektorowe (NumPy) operacje na wielu pozycjach Reversi naraz.
+
+Pozycje przyjmowane są jako tablica (N, 2) masek uint64 (pionki gracza przy ruchu, pionki przeciwnika)
+albo jako tablica plansz (N, 8, 8) z wartościami 0/1/2 jak Reversi.board. Wszystkie funkcje działają
+na całych tablicach, bez pętli po pozycjach - pętle są tylko po 8 kierunkach i krokach propagacji.
+Wyniki są zgodne z funkcjami z bitboard.py i evaluation.py dla pojedynczej pozycji.
+
+Wymaga biblioteki numpy.
+"""
+
+import numpy as np
+
+from bitboard import BOARD_SIZE, FULL_MASK, SHIFTS, SQUARE_WEIGHTS
+from evaluation import CORNERS, CORNER_ACCESS_WEIGHT, MOBILITY_WEIGHT, WIN_WEIGHT
+
+SQUARES = BOARD_SIZE * BOARD_SIZE
+_FULL = np.uint64(FULL_MASK)
+_CORNERS = np.uint64(CORNERS)
+_BITS = np.left_shift(np.uint64(1), np.arange(SQUARES, dtype=np.uint64))
+_WEIGHTS = np.array(SQUARE_WEIGHTS, dtype=np.int64)
+_SHIFTS = [(np.uint64(abs(amount)), amount > 0, np.uint64(mask)) for amount, mask in SHIFTS]
+
+
+def as_bitboards(positions, player=1):
+    """
+    Zamienia wejście na tablicę masek (N, 2) w kolejności (gracz przy ruchu, przeciwnik).
+
+    Parameters:
+    positions (np.ndarray): Tablica (N, 2) masek uint64 albo plansze (N, 8, 8) z wartościami 0/1/2.
+    player (int | np.ndarray): Dla plansz - numer gracza przy ruchu (1 lub 2), wspólny lub osobno dla każdej pozycji.
+
+    Returns:
+    np.ndarray: Tablica (N, 2) typu uint64.
+    """
+    positions = np.asarray(positions)
+    if positions.ndim == 2 and positions.shape[1] == 2:
+        return positions.astype(np.uint64)
+    cells = positions.reshape(len(positions), SQUARES)
+    player = np.broadcast_to(np.asarray(player).reshape(-1, 1), (len(positions), 1))
+    own = np.bitwise_or.reduce(np.where(cells == player, _BITS, np.uint64(0)), axis=1)
+    opp = np.bitwise_or.reduce(np.where((cells != 0) & (cells != player), _BITS, np.uint64(0)), axis=1)
+    return np.stack([own, opp], axis=1)
+
+
+def to_boards(bitboards, player=1):
+    """
+    Zamienia maski (N, 2) na plansze (N, 8, 8) z wartościami 0/1/2.
+
+    Parameters:
+    bitboards (np.ndarray): Maski (gracz przy ruchu, przeciwnik).
+    player (int): Numer gracza przy ruchu wpisywany na planszę.
+
+    Returns:
+    np.ndarray: Plansze (N, 8, 8) typu int8.
+    """
+    own = unpack(bitboards[:, 0])
+    opp = unpack(bitboards[:, 1])
+    boards = np.where(own, player, np.where(opp, 3 - player, 0)).astype(np.int8)
+    return boards.reshape(-1, BOARD_SIZE, BOARD_SIZE)
+
+
+def unpack(bits):
+    """
+    Rozpakowuje maski na tablicę (N, 64) wartości logicznych (kolumna i = pole o indeksie i).
+
+    Parameters:
+    bits (np.ndarray): Tablica masek uint64.
+
+    Returns:
+    np.ndarray: Tablica (N, 64) typu bool.
+    """
+    as_bytes = np.ascontiguousarray(bits, dtype="<u8").view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(as_bytes, axis=1, bitorder="little").astype(bool)
+
+
+def popcount(bits):
+    """
+    Liczy ustawione bity w każdej masce.
+
+    Parameters:
+    bits (np.ndarray): Tablica masek uint64.
+
+    Returns:
+    np.ndarray: Liczby bitów (int64).
+    """
+    return unpack(bits).sum(axis=1)
+
+
+def shift(bits, amount, left, mask):
+    """
+    Wektorowy odpowiednik bitboard.shift dla przesunięcia opisanego w _SHIFTS.
+    """
+    if left:
+        return np.left_shift(bits, amount) & mask & _FULL
+    return np.right_shift(bits, amount) & mask
+
+
+def legal_moves(own, opp):
+    """
+    Wyznacza maski legalnych ruchów dla wszystkich pozycji.
+
+    Parameters:
+    own (np.ndarray): Maski pionków gracza przy ruchu (uint64, kształt (N,)).
+    opp (np.ndarray): Maski pionków przeciwnika.
+
+    Returns:
+    np.ndarray: Maski legalnych ruchów (uint64, kształt (N,)).
+    """
+    empty = ~(own | opp) & _FULL
+    moves = np.zeros_like(own)
+    for amount, left, mask in _SHIFTS:
+        candidates = shift(own, amount, left, mask) & opp
+        for _ in range(BOARD_SIZE - 3):
+            candidates |= shift(candidates, amount, left, mask) & opp
+        moves |= shift(candidates, amount, left, mask) & empty
+    return moves
+
+
+def flips(own, opp, move_bits):
+    """
+    Wyznacza maski odwracanych pionków dla ruchów move_bits (po jednym ruchu na pozycję).
+
+    Parameters:
+    own (np.ndarray): Maski pionków gracza przy ruchu.
+    opp (np.ndarray): Maski pionków przeciwnika.
+    move_bits (np.ndarray): Maski z jednym ustawionym bitem - pola ruchów.
+
+    Returns:
+    np.ndarray: Maski odwracanych pionków (0 dla ruchów nielegalnych).
+    """
+    result = np.zeros_like(own)
+    for amount, left, mask in _SHIFTS:
+        line = shift(move_bits, amount, left, mask) & opp
+        for _ in range(BOARD_SIZE - 3):
+            line |= shift(line, amount, left, mask) & opp
+        bounded = (shift(line, amount, left, mask) & own) != 0
+        result |= np.where(bounded, line, np.uint64(0))
+    return result
+
+
+def play(own, opp, move_bits):
+    """
+    Wykonuje po jednym ruchu w każdej pozycji i zwraca pozycje potomne z punktu widzenia przeciwnika.
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray, np.ndarray]: Maski odwróceń oraz nowe (gracz przy ruchu, przeciwnik),
+    czyli (pionki przeciwnika po ruchu, pionki gracza po ruchu).
+    """
+    flipped = flips(own, opp, move_bits)
+    return flipped, opp ^ flipped, own | move_bits | flipped
+
+
+def children(own, opp):
+    """
+    Generuje wszystkie pozycje potomne wszystkich pozycji naraz.
+
+    Parameters:
+    own (np.ndarray): Maski pionków gracza przy ruchu (N,).
+    opp (np.ndarray): Maski pionków przeciwnika (N,).
+
+    Returns:
+    dict: Tablice długości M (łączna liczba legalnych ruchów):
+          "parent" - indeks pozycji rodzica, "square" - indeks pola ruchu, "flips" - maski odwróceń,
+          "own" i "opp" - pozycje potomne z punktu widzenia gracza, który teraz ma ruch.
+    """
+    move_grid = unpack(legal_moves(own, opp))
+    parent, square = np.nonzero(move_grid)
+    flipped, child_own, child_opp = play(own[parent], opp[parent], _BITS[square])
+    return {"parent": parent, "square": square, "flips": flipped, "own": child_own, "opp": child_opp}
+
+
+def evaluate(own, opp):
+    """
+    Wektorowy odpowiednik evaluation.evaluate: wagi pól, mobilność i dostęp do narożników,
+    a dla pozycji, w których żaden gracz nie ma ruchu - różnica pionków przemnożona przez WIN_WEIGHT.
+
+    Parameters:
+    own (np.ndarray): Maski pionków gracza przy ruchu.
+    opp (np.ndarray): Maski pionków przeciwnika.
+
+    Returns:
+    np.ndarray: Oceny pozycji (int64).
+    """
+    own_moves = legal_moves(own, opp)
+    opp_moves = legal_moves(opp, own)
+    positional = unpack(own) @ _WEIGHTS - unpack(opp) @ _WEIGHTS
+    mobility = popcount(own_moves) - popcount(opp_moves)
+    corners = popcount(own_moves & _CORNERS) - popcount(opp_moves & _CORNERS)
+    heuristic = positional + MOBILITY_WEIGHT * mobility + CORNER_ACCESS_WEIGHT * corners
+    final = WIN_WEIGHT * (popcount(own) - popcount(opp))
+    return np.where((own_moves == 0) & (opp_moves == 0), final, heuristic)
+
+
+def analyze(positions, player=1):
+    """
+    Liczy dla wszystkich pozycji maski legalnych ruchów, liczby ruchów i oceny.
+
+    Parameters:
+    positions (np.ndarray): Tablica (N, 2) masek albo plansze (N, 8, 8).
+    player (int | np.ndarray): Gracz przy ruchu dla plansz (patrz as_bitboards).
+
+    Returns:
+    dict: "moves" - maski legalnych ruchów, "move_count" - liczby ruchów, "evaluation" - oceny pozycji.
+    """
+    bitboards = as_bitboards(positions, player)
+    own, opp = bitboards[:, 0], bitboards[:, 1]
+    moves = legal_moves(own, opp)
+    return {"moves": moves, "move_count": popcount(moves), "evaluation": evaluate(own, opp)}
@@ -0,0 +1,213 @@
+"""
+Benchmarki silnika Reversi z lab1.
+
+Uruchomienie:
+    python benchmark.py tt --depths 6 7 8
+    python benchmark.py ordering --depth 6
+    python benchmark.py parallel --depth 7 --workers 16
+    python benchmark.py profile --depth 6 --log profile.jsonl
+    python benchmark.py sizes --sizes 6 8 10 12 --depth 4
+
+Pozycje testowe powstają z losowych (ale powtarzalnych dzięki ziarnu) otwarć,
+a wyniki wypisywane są jako tabela: liczba węzłów, czas i skuteczność tablicy transpozycji.
+"""
+
+import argparse
+import random
+import time
+
+from bitboard import BitboardReversi
+from evaluation import evaluate, order_moves
+from profiling import ProfiledAlphaBetaSearch
+from search import AlphaBetaSearch, ParallelRootSearch, TranspositionTable
+
+
+def sample_positions(count, plies, seed=0, size=8):
+    """
+    Tworzy pozycje testowe przez rozegranie losowych ruchów od pozycji początkowej.
+
+    Parameters:
+    count (int): Liczba pozycji.
+    plies (int): Liczba losowych półruchów w każdej pozycji.
+    seed (int): Ziarno generatora liczb losowych.
+    size (int): Rozmiar planszy.
+
+    Returns:
+    List[BitboardReversi]: Lista gier w wylosowanych pozycjach.
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        game = BitboardReversi([None, None], size)
+        for _ in range(plies):
+            moves = game.possible_moves()
+            if not moves:
+                break
+            game.make_move(rng.choice(moves))
+            game.switch_player()
+        if game.possible_moves():
+            positions.append(game)
+    return positions
+
+
+def run_search(algorithm, positions):
+    """
+    Przeszukuje wszystkie pozycje i sumuje liczbę węzłów oraz czas.
+
+    Parameters:
+    algorithm (AlphaBetaSearch): Algorytm przeszukiwania.
+    positions (List[BitboardReversi]): Pozycje testowe.
+
+    Returns:
+    Tuple[int, float]: Łączna liczba węzłów i łączny czas w sekundach.
+    """
+    nodes = 0
+    elapsed = 0.0
+    for game in positions:
+        algorithm(game)
+        nodes += algorithm.nodes
+        elapsed += algorithm.elapsed
+    return nodes, elapsed
+
+
+def benchmark_tt(args):
+    """
+    Porównuje przeszukiwanie bez tablicy transpozycji i z nią na kolejnych głębokościach.
+    """
+    positions = sample_positions(args.positions, args.plies, args.seed)
+    print(f"{'depth':>5} {'tt':>5} {'nodes':>10} {'time [s]':>9} {'nodes/s':>9} {'hit rate':>8}")
+    for depth in args.depths:
+        for use_tt in (False, True):
+            tt = TranspositionTable(args.tt_bits, args.replacement) if use_tt else None
+            nodes, elapsed = run_search(AlphaBetaSearch(depth, tt=tt), positions)
+            hit_rate = f"{tt.hit_rate():.1%}" if tt else "-"
+            print(f"{depth:>5} {('on' if use_tt else 'off'):>5} {nodes:>10} {elapsed:>9.2f} "
+                  f"{nodes / elapsed:>9.0f} {hit_rate:>8}")
+
+
+def benchmark_ordering(args):
+    """
+    Porównuje liczbę węzłów na ruch przed zmianami (sama różnica pionków, kolejność wierszami)
+    i po nich (ocena pozycyjna z mobilnością oraz porządkowanie ruchów).
+    """
+    positions = sample_positions(args.positions, args.plies, args.seed)
+    configurations = [
+        ("before: discs", None, None),
+        ("evaluation", evaluate, None),
+        ("after: evaluation + ordering", evaluate, order_moves),
+    ]
+    print(f"depth {args.depth}, {len(positions)} positions")
+    print(f"{'configuration':<30} {'nodes/move':>10} {'time/move [s]':>13}")
+    for name, scoring, ordering in configurations:
+        tt = TranspositionTable(args.tt_bits) if args.tt else None
+        nodes, elapsed = run_search(AlphaBetaSearch(args.depth, scoring, tt, ordering), positions)
+        print(f"{name:<30} {nodes / len(positions):>10.0f} {elapsed / len(positions):>13.3f}")
+
+
+def benchmark_parallel(args):
+    """
+    Porównuje przeszukiwanie sekwencyjne z podziałem korzenia między procesy:
+    czas na ruch i zgodność wybranych ruchów na stałej głębokości.
+    """
+    positions = sample_positions(args.positions, args.plies, args.seed)
+    serial = AlphaBetaSearch(args.depth, evaluate, TranspositionTable(args.tt_bits), order_moves)
+    # Puste tablice po obu stronach, więc wybrane ruchy muszą być zgodne
+    with ParallelRootSearch(args.depth, args.workers, evaluate, order_moves, args.tt_bits,
+                            reuse_tables=False) as parallel:
+        print(f"depth {args.depth}, {parallel.workers} workers")
+        print(f"{'position':>8} {'serial [s]':>10} {'parallel [s]':>12} {'speedup':>7} {'same move':>9}")
+        for index, game in enumerate(positions):
+            serial.tt.clear()
+            serial_move = serial(game)
+            parallel_move = parallel(game)
+            print(f"{index:>8} {serial.elapsed:>10.2f} {parallel.elapsed:>12.2f} "
+                  f"{serial.elapsed / parallel.elapsed:>7.2f} {str(serial_move == parallel_move):>9}")
+
+
+def benchmark_profile(args):
+    """
+    Profiluje przeszukiwanie na pozycjach testowych: gdzie idzie czas (generowanie ruchów vs ocena),
+    jak skuteczne są cięcia i tablica transpozycji. Rekordy można zapisać do pliku JSON Lines.
+    """
+    positions = sample_positions(args.positions, args.plies, args.seed)
+    search = ProfiledAlphaBetaSearch(args.depth, evaluate, TranspositionTable(args.tt_bits), order_moves,
+                                     log_path=args.log)
+    print(f"depth {args.depth}, {len(positions)} positions")
+    print(f"{'position':>8} {'nodes':>8} {'leaves':>8} {'time [s]':>9} {'movegen':>8} {'eval':>8} "
+          f"{'tt hits':>8} {'cut@0':>6} {'EBF':>5}")
+    for index, game in enumerate(positions):
+        search.tt.clear()
+        search(game)
+        record = search.records[-1]
+        tt_hits = record["tt_hits"] / record["tt_lookups"] if record["tt_lookups"] else 0.0
+        print(f"{index:>8} {record['nodes']:>8} {record['leaf_evaluations']:>8} {record['elapsed']:>9.2f} "
+              f"{record['movegen_time'] / record['elapsed']:>8.1%} {record['eval_time'] / record['elapsed']:>8.1%} "
+              f"{tt_hits:>8.1%} {record['first_move_cutoff_rate']:>6.1%} "
+              f"{record['effective_branching_factor']:>5.2f}")
+
+
+def benchmark_sizes(args):
+    """
+    Mierzy przepustowość przeszukiwania (węzły na sekundę) i generowania ruchów na planszach różnych rozmiarów.
+    Pozycje mają tyle losowych półruchów, ile wynosi --plies przeskalowane do liczby pól planszy.
+    """
+    print(f"depth {args.depth}, {args.positions} positions per size")
+    print(f"{'size':>4} {'nodes':>9} {'time [s]':>9} {'nodes/s':>9} {'movegen/s':>10}")
+    for size in args.sizes:
+        plies = max(1, round(args.plies * size * size / 64))
+        positions = sample_positions(args.positions, plies, args.seed, size)
+        search = AlphaBetaSearch(args.depth, evaluate, TranspositionTable(args.tt_bits), order_moves)
+        nodes, elapsed = run_search(search, positions)
+
+        start = time.perf_counter()
+        for _ in range(args.movegen_repeats):
+            for game in positions:
+                game.legal_moves_mask()
+        movegen_rate = args.movegen_repeats * len(positions) / (time.perf_counter() - start)
+        print(f"{size:>4} {nodes:>9} {elapsed:>9.2f} {nodes / elapsed:>9.0f} {movegen_rate:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarki silnika Reversi")
+    parser.add_argument("--positions", type=int, default=5, help="liczba pozycji testowych")
+    parser.add_argument("--plies", type=int, default=20, help="liczba losowych półruchów otwarcia")
+    parser.add_argument("--seed", type=int, default=0)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    tt_parser = subparsers.add_parser("tt", help="węzły i trafienia tablicy transpozycji na głębokościach")
+    tt_parser.add_argument("--depths", type=int, nargs="+", default=[6, 7, 8])
+    tt_parser.add_argument("--tt-bits", type=int, default=20)
+    tt_parser.add_argument("--replacement", choices=["always", "depth"], default="depth")
+    tt_parser.set_defaults(func=benchmark_tt)
+
+    ordering_parser = subparsers.add_parser("ordering", help="węzły na ruch przed i po ocenie pozycyjnej i porządkowaniu")
+    ordering_parser.add_argument("--depth", type=int, default=6)
+    ordering_parser.add_argument("--tt", action="store_true", help="użyj tablicy transpozycji we wszystkich wariantach")
+    ordering_parser.add_argument("--tt-bits", type=int, default=20)
+    ordering_parser.set_defaults(func=benchmark_ordering)
+
+    parallel_parser = subparsers.add_parser("parallel", help="przeszukiwanie sekwencyjne vs podział korzenia między procesy")
+    parallel_parser.add_argument("--depth", type=int, default=6)
+    parallel_parser.add_argument("--workers", type=int, default=None, help="domyślnie liczba rdzeni")
+    parallel_parser.add_argument("--tt-bits", type=int, default=18)
+    parallel_parser.set_defaults(func=benchmark_parallel)
+
+    profile_parser = subparsers.add_parser("profile", help="statystyki przeszukiwania na ruch (profiling.py)")
+    profile_parser.add_argument("--depth", type=int, default=6)
+    profile_parser.add_argument("--tt-bits", type=int, default=20)
+    profile_parser.add_argument("--log", help="plik JSON Lines z rekordami każdego ruchu")
+    profile_parser.set_defaults(func=benchmark_profile)
+
+    sizes_parser = subparsers.add_parser("sizes", help="węzły na sekundę na planszach różnych rozmiarów")
+    sizes_parser.add_argument("--sizes", type=int, nargs="+", default=[6, 8, 10, 12])
+    sizes_parser.add_argument("--depth", type=int, default=4)
+    sizes_parser.add_argument("--tt-bits", type=int, default=18)
+    sizes_parser.add_argument("--movegen-repeats", type=int, default=1000)
+    sizes_parser.set_defaults(func=benchmark_sizes)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
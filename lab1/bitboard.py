@@ -0,0 +1,493 @@
+"""
+Alternatywny silnik planszy Reversi oparty na bitboardach.
+
+Każdy gracz przechowywany jest jako maska bitowa (liczba całkowita dowolnej szerokości), w której bit
+o indeksie x * rozmiar + y odpowiada polu (x, y) planszy. Ruchy legalne wyznaczane są
+przez propagację przesunięć bitowych we wszystkich ośmiu kierunkach, a odwracane
+pionki nakładane są jedną maską. Rozmiar planszy (parzysty, co najmniej 4) jest parametrem gry;
+maski i tablice zależne od rozmiaru zbiera BoardGeometry. Klasa zachowuje API TwoPlayerGame z easyAI
+(possible_moves, make_move, scoring, is_over), więc można jej używać zamiast Reversi
+z lab1.py - zwraca identyczne listy ruchów w tej samej kolejności.
+"""
+
+import random
+from functools import lru_cache
+
+from easyAI import TwoPlayerGame
+
+BOARD_SIZE = 8
+# Ruch "pas": jedyny ruch gracza, który nie może postawić pionka, gdy przeciwnik ma jeszcze ruchy
+PASS = "pass"
+
+# Wagi pól w zależności od odległości od brzegu w pionie i poziomie (0 = brzeg, 3 = środek i dalej):
+# narożniki są stabilne, pola X i C (sąsiadujące z narożnikami) oddają je przeciwnikowi
+EDGE_DISTANCE_WEIGHTS = [
+    [100, -20, 10, 5],
+    [-20, -50, -2, -2],
+    [10, -2, -1, -1],
+    [5, -2, -1, -1],
+]
+
+
+class BoardGeometry:
+    def __init__(self, size):
+        """
+        Wylicza maski, kierunki, klucze Zobrista i wagi pól dla planszy size x size.
+        Obiekty tworzy i zapamiętuje board_geometry, więc wszystkie gry jednego rozmiaru dzielą jedną geometrię.
+
+        Parameters:
+        size (int): Rozmiar planszy (parzysty, co najmniej 4).
+
+        Attributes:
+        self.size (int): Rozmiar planszy.
+        self.squares (int): Liczba pól.
+        self.full_mask (int): Maska wszystkich pól.
+        self.shifts (List[Tuple[int, int]]): Kierunki jako (przesunięcie, maska po przesunięciu);
+                                             dodatnie przesunięcie to przesunięcie w lewo (<<).
+        self.zobrist (List[List[int] | None]): Klucze Zobrista zobrist[gracz][pole].
+        self.zobrist_flip (List[int]): Klucze odwrócenia pionka na polu (XOR kluczy obu graczy).
+        self.zobrist_side (int): Klucz gracza 2 przy ruchu.
+        self.square_weights (List[int]): Statyczne wagi pól.
+        self.corners (int): Maska narożników.
+        self.start (List[int]): Maski pionków w pozycji początkowej indeksowane numerem gracza.
+        """
+        if size < 4 or size % 2:
+            raise ValueError(f"Board size must be even and at least 4, got {size}")
+        self.size = size
+        self.squares = size * size
+        self.full_mask = (1 << self.squares) - 1
+
+        # Maski odcinające pionki, które po przesunięciu "zawinęłyby się" na drugi brzeg planszy
+        not_first_column = 0
+        not_last_column = 0
+        for row in range(size):
+            for col in range(size):
+                if col != 0:
+                    not_first_column |= 1 << (row * size + col)
+                if col != size - 1:
+                    not_last_column |= 1 << (row * size + col)
+        self.shifts = [
+            (-size, self.full_mask),          # (-1, 0)
+            (size, self.full_mask),           # (1, 0)
+            (-1, not_last_column),            # (0, -1)
+            (1, not_first_column),            # (0, 1)
+            (-size - 1, not_last_column),     # (-1, -1)
+            (size + 1, not_first_column),     # (1, 1)
+            (-size + 1, not_first_column),    # (-1, 1)
+            (size - 1, not_last_column),      # (1, -1)
+        ]
+
+        # Stałe ziarno = powtarzalne hashe (dla planszy 8x8 te same klucze co dotychczas)
+        zobrist_random = random.Random(2024)
+        self.zobrist = [None] + [[zobrist_random.getrandbits(64) for _ in range(self.squares)] for _ in range(2)]
+        self.zobrist_flip = [self.zobrist[1][square] ^ self.zobrist[2][square] for square in range(self.squares)]
+        self.zobrist_side = zobrist_random.getrandbits(64)
+
+        last = size - 1
+        self.square_weights = [EDGE_DISTANCE_WEIGHTS[min(x, last - x, 3)][min(y, last - y, 3)]
+                               for x in range(size) for y in range(size)]
+        self.corners = sum(1 << (x * size + y) for x, y in [(0, 0), (0, last), (last, 0), (last, last)])
+
+        half = size // 2
+        self.start = [0, 0, 0]
+        for x, y, player in [(half - 1, half - 1, 2), (half, half, 2), (half - 1, half, 1), (half, half - 1, 1)]:
+            self.start[player] |= 1 << (x * size + y)
+
+
+@lru_cache(maxsize=None)
+def board_geometry(size):
+    """
+    Zwraca (zapamiętaną) geometrię planszy danego rozmiaru.
+
+    Parameters:
+    size (int): Rozmiar planszy.
+
+    Returns:
+    BoardGeometry: Geometria planszy size x size.
+    """
+    return BoardGeometry(size)
+
+
+# Geometria domyślnej planszy 8x8 i jej stałe, używane przez moduły działające tylko na tej planszy
+DEFAULT_GEOMETRY = board_geometry(BOARD_SIZE)
+FULL_MASK = DEFAULT_GEOMETRY.full_mask
+SHIFTS = DEFAULT_GEOMETRY.shifts
+ZOBRIST = DEFAULT_GEOMETRY.zobrist
+ZOBRIST_FLIP = DEFAULT_GEOMETRY.zobrist_flip
+ZOBRIST_SIDE = DEFAULT_GEOMETRY.zobrist_side
+SQUARE_WEIGHTS = DEFAULT_GEOMETRY.square_weights
+
+
+def shift(bits, amount, mask):
+    """
+    Przesuwa maskę o jedno pole w danym kierunku, odrzucając pionki wychodzące poza planszę.
+
+    Parameters:
+    bits (int): Maska pól do przesunięcia.
+    amount (int): Przesunięcie bitowe; dodatnie w lewo, ujemne w prawo.
+    mask (int): Maska dozwolonych pól po przesunięciu (zawarta w masce planszy).
+
+    Returns:
+    int: Przesunięta maska.
+    """
+    if amount > 0:
+        return (bits << amount) & mask
+    return (bits >> -amount) & mask
+
+
+def legal_moves_mask(own, opp, geometry=DEFAULT_GEOMETRY):
+    """
+    Wyznacza maskę wszystkich legalnych ruchów gracza.
+
+    Dla każdego kierunku propagowany jest ciąg pionków przeciwnika przylegających do
+    własnych pionków; puste pole za takim ciągiem jest legalnym ruchem.
+
+    Parameters:
+    own (int): Maska pionków gracza wykonującego ruch.
+    opp (int): Maska pionków przeciwnika.
+    geometry (BoardGeometry): Geometria planszy; domyślnie 8x8.
+
+    Returns:
+    int: Maska pól, na których gracz może postawić pionek.
+    """
+    empty = ~(own | opp) & geometry.full_mask
+    steps = range(geometry.size - 3)
+    moves = 0
+    for amount, mask in geometry.shifts:
+        candidates = shift(own, amount, mask) & opp
+        for _ in steps:
+            candidates |= shift(candidates, amount, mask) & opp
+        moves |= shift(candidates, amount, mask) & empty
+    return moves
+
+
+def flips_mask(own, opp, move_bit, geometry=DEFAULT_GEOMETRY):
+    """
+    Wyznacza maskę pionków przeciwnika odwracanych przez ruch.
+
+    Parameters:
+    own (int): Maska pionków gracza wykonującego ruch.
+    opp (int): Maska pionków przeciwnika.
+    move_bit (int): Maska z jednym ustawionym bitem - pole, na które stawiany jest pionek.
+    geometry (BoardGeometry): Geometria planszy; domyślnie 8x8.
+
+    Returns:
+    int: Maska odwracanych pionków (0, jeśli ruch niczego nie odwraca).
+    """
+    flips = 0
+    for amount, mask in geometry.shifts:
+        line = 0
+        cursor = shift(move_bit, amount, mask)
+        while cursor & opp:
+            line |= cursor
+            cursor = shift(cursor, amount, mask)
+        if cursor & own:
+            flips |= line
+    return flips
+
+
+def square_to_move(square, size=BOARD_SIZE):
+    """
+    Zamienia indeks pola na współrzędne (x, y).
+
+    Parameters:
+    square (int): Indeks pola.
+    size (int): Rozmiar planszy.
+
+    Returns:
+    Tuple[int, int]: Współrzędne (wiersz, kolumna).
+    """
+    return divmod(square, size)
+
+
+def mask_to_moves(moves, size=BOARD_SIZE):
+    """
+    Zamienia maskę ruchów na listę współrzędnych w kolejności wierszami (jak w Reversi.possible_moves).
+
+    Parameters:
+    moves (int): Maska pól.
+    size (int): Rozmiar planszy.
+
+    Returns:
+    List[Tuple[int, int]]: Lista współrzędnych (x, y).
+    """
+    result = []
+    while moves:
+        lowest = moves & -moves
+        result.append(divmod(lowest.bit_length() - 1, size))
+        moves ^= lowest
+    return result
+
+
+def format_board(board):
+    """
+    Formatuje planszę (listę list 0/1/2) jako tekst z numeracją wierszy i kolumn;
+    przy planszach większych niż 10x10 numery są wyrównywane do tej samej szerokości.
+
+    Parameters:
+    board (List[List[int]]): Plansza.
+
+    Returns:
+    List[str]: Linie tekstu (nagłówek z numerami kolumn i po jednej linii na wiersz).
+    """
+    width = len(str(len(board) - 1))
+    symbols = {0: '.', 1: '○', 2: '●'}
+    lines = [" " * (width + 2) + " ".join(str(i).rjust(width) for i in range(len(board)))]
+    for i, row in enumerate(board):
+        lines.append(f"{str(i).rjust(width)}  " + " ".join(symbols[cell].rjust(width) for cell in row))
+    return lines
+
+
+class BitboardReversi(TwoPlayerGame):
+    def __init__(self, players, size=BOARD_SIZE):
+        """
+        Inicjalizuje grę Reversi z planszą przechowywaną jako dwie maski bitowe.
+
+        Parameters:
+        players (List[Player]): Lista graczy biorących udział w grze.
+        size (int): Rozmiar planszy (parzysty, co najmniej 4), domyślnie 8.
+
+        Attributes:
+        self.players (List[Player]): Lista obiektów graczy.
+        self.board_size (int): Rozmiar planszy.
+        self.geometry (BoardGeometry): Maski, klucze Zobrista i wagi pól dla tego rozmiaru planszy.
+        self.bitboards (List[int]): Maski pionków indeksowane numerem gracza;
+                                    self.bitboards[1] to pionki gracza 1, self.bitboards[2] gracza 2.
+        self.current_player (int): Aktualny gracz, 1 oznacza gracza czarnego, który zaczyna.
+        self.history (List[int]): Stos masek pionków odwróconych przez kolejne ruchy, używany przez unmake_move.
+        self.moves_cache (List[Tuple[int, int]] | None): Lista ruchów bieżącej pozycji wyliczona przez possible_moves;
+                                                         unieważniana w make_move, unmake_move i switch_player.
+        self.hash (int): Hash Zobrista pozycji (pionki i gracz przy ruchu), aktualizowany przyrostowo
+                         w make_move, unmake_move i switch_player.
+        self.positional (List[int]): Sumy wag pól (geometry.square_weights) zajętych przez graczy (indeksowane numerem gracza),
+                                     aktualizowane przyrostowo w make_move i unmake_move.
+        """
+        self.players = players
+        self.board_size = size
+        self.geometry = board_geometry(size)
+        self.bitboards = list(self.geometry.start)
+        self.current_player = 1
+        self.history = []
+        self.moves_cache = None
+        self.hash = self.compute_hash()
+        self.positional = self.compute_positional()
+
+    @classmethod
+    def from_position(cls, black, white, current_player, players=None, size=BOARD_SIZE):
+        """
+        Tworzy grę w zadanej pozycji (np. w procesie roboczym albo przy odczycie z pliku).
+
+        Parameters:
+        black (int): Maska pionków gracza 1.
+        white (int): Maska pionków gracza 2.
+        current_player (int): Gracz przy ruchu (1 lub 2).
+        players (List[Player] | None): Lista graczy; domyślnie [None, None].
+        size (int): Rozmiar planszy.
+
+        Returns:
+        BitboardReversi: Gra w podanej pozycji, z pustym stosem ruchów.
+        """
+        game = cls(players if players is not None else [None, None], size)
+        game.bitboards = [0, black, white]
+        game.current_player = current_player
+        game.hash = game.compute_hash()
+        game.positional = game.compute_positional()
+        return game
+
+    def compute_hash(self):
+        """
+        Liczy hash Zobrista pozycji od zera. Służy do inicjalizacji oraz do odtworzenia
+        hasha po ręcznym ustawieniu self.bitboards lub self.current_player.
+
+        Returns:
+        int: 64-bitowy hash pozycji.
+        """
+        value = self.geometry.zobrist_side if self.current_player == 2 else 0
+        for player in (1, 2):
+            bits = self.bitboards[player]
+            while bits:
+                lowest = bits & -bits
+                value ^= self.geometry.zobrist[player][lowest.bit_length() - 1]
+                bits ^= lowest
+        return value
+
+    def compute_positional(self):
+        """
+        Liczy od zera sumy wag pól (geometry.square_weights) zajętych przez każdego z graczy.
+
+        Returns:
+        List[int]: Sumy wag indeksowane numerem gracza (element 0 nieużywany).
+        """
+        positional = [0, 0, 0]
+        for player in (1, 2):
+            bits = self.bitboards[player]
+            while bits:
+                lowest = bits & -bits
+                positional[player] += self.geometry.square_weights[lowest.bit_length() - 1]
+                bits ^= lowest
+        return positional
+
+    def update_incremental(self, square, flips, sign):
+        """
+        Aktualizuje hash Zobrista i sumy wag pól o pionek postawiony na polu square
+        i odwrócone pionki, w czasie O(liczba odwróceń).
+
+        Parameters:
+        square (int): Indeks pola, na które postawiono pionek bieżącego gracza.
+        flips (int): Maska odwróconych pionków.
+        sign (int): 1 przy wykonywaniu ruchu, -1 przy jego cofaniu.
+        """
+        player = self.current_player
+        geometry = self.geometry
+        weights = geometry.square_weights
+        value = self.hash ^ geometry.zobrist[player][square]
+        flipped_weight = 0
+        while flips:
+            lowest = flips & -flips
+            index = lowest.bit_length() - 1
+            value ^= geometry.zobrist_flip[index]
+            flipped_weight += weights[index]
+            flips ^= lowest
+        self.hash = value
+        self.positional[player] += sign * (weights[square] + flipped_weight)
+        self.positional[3 - player] -= sign * flipped_weight
+
+    def switch_player(self):
+        """
+        Zmienia gracza przy ruchu i uwzględnia zmianę w hashu Zobrista.
+        """
+        self.current_player = self.opponent_index
+        self.hash ^= self.geometry.zobrist_side
+        self.moves_cache = None
+
+    @property
+    def board(self):
+        """
+        Zwraca planszę w postaci listy list, zgodnej z Reversi.board z lab1.py.
+
+        Returns:
+        List[List[int]]: 0 - puste pole, 1 - pionek gracza 1, 2 - pionek gracza 2.
+        """
+        board = [[0 for _ in range(self.board_size)] for _ in range(self.board_size)]
+        for player in (1, 2):
+            for x, y in mask_to_moves(self.bitboards[player], self.board_size):
+                board[x][y] = player
+        return board
+
+    def legal_moves_mask(self):
+        """
+        Zwraca maskę legalnych ruchów bieżącego gracza.
+
+        Returns:
+        int: Maska pól, na których bieżący gracz może postawić pionek.
+        """
+        return legal_moves_mask(self.bitboards[self.current_player], self.bitboards[3 - self.current_player],
+                                self.geometry)
+
+    def possible_moves(self):
+        """
+        Zwraca listę wszystkich możliwych ruchów jako współrzędne (x, y).
+        Jeśli bieżący gracz nie może postawić pionka, ale przeciwnik może, jedynym ruchem jest PASS;
+        jeśli żaden z graczy nie ma ruchu, lista jest pusta (koniec gry).
+        Wynik jest zapamiętywany do następnej zmiany pozycji, a zwracana jest jego kopia.
+
+        Returns:
+        List[Tuple[int, int]]: Lista możliwych ruchów w kolejności wierszami.
+        """
+        if self.moves_cache is None:
+            moves = self.legal_moves_mask()
+            if moves:
+                self.moves_cache = mask_to_moves(moves, self.board_size)
+            elif legal_moves_mask(self.bitboards[3 - self.current_player], self.bitboards[self.current_player],
+                                  self.geometry):
+                self.moves_cache = [PASS]
+            else:
+                self.moves_cache = []
+        return list(self.moves_cache)
+
+    def make_move(self, move):
+        """
+        Wykonuje ruch i odwraca pionki jedną operacją na maskach.
+
+        Parameters:
+        move (Tuple[int, int] | str): Współrzędne (x, y) pola, na które stawiany jest pionek, albo PASS.
+        """
+        self.moves_cache = None
+        if move == PASS:
+            self.history.append(0)
+            return
+        x, y = move
+        square = x * self.board_size + y
+        move_bit = 1 << square
+        own = self.bitboards[self.current_player]
+        opp = self.bitboards[3 - self.current_player]
+        flips = flips_mask(own, opp, move_bit, self.geometry)
+        self.bitboards[self.current_player] = own | move_bit | flips
+        self.bitboards[3 - self.current_player] = opp ^ flips
+        self.history.append(flips)
+        self.update_incremental(square, flips, 1)
+
+    def unmake_move(self, move):
+        """
+        Cofa ostatni ruch, zdejmując maskę odwróconych pionków ze stosu self.history.
+        easyAI wywołuje tę metodę po przywróceniu gracza, który wykonał ruch,
+        dzięki czemu Negamax przeszukuje drzewo na jednej instancji gry, bez kopiowania.
+
+        Parameters:
+        move (Tuple[int, int] | str): Współrzędne (x, y) cofanego ruchu albo PASS.
+        """
+        self.moves_cache = None
+        if move == PASS:
+            self.history.pop()
+            return
+        x, y = move
+        square = x * self.board_size + y
+        move_bit = 1 << square
+        flips = self.history.pop()
+        self.bitboards[self.current_player] ^= move_bit | flips
+        self.bitboards[3 - self.current_player] ^= flips
+        self.update_incremental(square, flips, -1)
+
+    def show(self):
+        """
+        Wyświetla aktualny stan planszy z numeracją wierszy i kolumn (format jak w Reversi.show).
+        """
+        for line in format_board(self.board):
+            print(line)
+        print("\n")
+
+    def is_over(self):
+        """
+        Sprawdza, czy gra się skończyła (żaden z graczy nie ma ruchu). Korzysta z listy ruchów
+        zapamiętanej przez possible_moves, więc nie przelicza planszy ponownie.
+
+        Returns:
+        bool: True, jeśli żaden gracz nie ma dostępnych ruchów.
+        """
+        return not self.possible_moves()
+
+    def scoring(self):
+        """
+        Zwraca różnicę liczby pionków między bieżącym graczem a przeciwnikiem.
+
+        Returns:
+        int: Dodatnia wartość oznacza przewagę bieżącego gracza.
+        """
+        return self.bitboards[self.current_player].bit_count() - self.bitboards[3 - self.current_player].bit_count()
+
+    def get_winner(self):
+        """
+        Funkcja drukuje wynik końcowy i informuje kto wygrał grę.
+        """
+        player_1_score = self.bitboards[1].bit_count()
+        player_2_score = self.bitboards[2].bit_count()
+
+        print(f"Player 1 ( ○ ): {player_1_score} pawns")
+        print(f"Player 2 ( ● ): {player_2_score} pawns")
+
+        if player_1_score > player_2_score:
+            print("Player 1 ( ○ ) wins!")
+        elif player_2_score > player_1_score:
+            print("Player 2 ( ● ) wins!")
+        else:
+            print("Tie!")
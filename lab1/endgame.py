@@ -0,0 +1,256 @@
+"""
+Dokładne rozwiązywanie końcówek Reversi.
+
+Gdy na planszy zostało niewiele pustych pól, EndgameSolver przeszukuje drzewo gry do samego
+końca (z uwzględnieniem pasów) i zwraca ruch optymalny względem końcowej różnicy pionków. Przeszukiwanie działa
+bezpośrednio na maskach bitowych (bez obiektu gry) i używa:
+- porządkowania "fastest-first" (najpierw ruchy zostawiające przeciwnikowi najmniej ruchów),
+- porządkowania według parzystości (najpierw pola w ćwiartkach z nieparzystą liczbą pustych pól),
+- osobnej procedury dla ostatnich kilku pustych pól, bez generowania maski ruchów i sortowania.
+"""
+
+import time
+from functools import lru_cache
+
+from bitboard import BOARD_SIZE, DEFAULT_GEOMETRY, PASS, flips_mask, legal_moves_mask, square_to_move
+
+# Powyżej tej liczby pustych pól ruchy porządkowane są według mobilności przeciwnika (fastest-first)
+FASTEST_FIRST_EMPTIES = 7
+# Od tej liczby pustych pól w dół używana jest procedura dla ostatnich ruchów
+LAST_MOVES_EMPTIES = 4
+
+
+@lru_cache(maxsize=None)
+def quadrants(size):
+    """
+    Wylicza maski czterech ćwiartek planszy.
+
+    Parameters:
+    size (int): Rozmiar planszy.
+
+    Returns:
+    List[int]: Maski ćwiartek.
+    """
+    half = size // 2
+    return [sum(1 << ((row_start + x) * size + col_start + y) for x in range(half) for y in range(half))
+            for row_start in (0, half) for col_start in (0, half)]
+
+
+QUADRANTS = quadrants(BOARD_SIZE)
+
+
+def odd_regions(empty, regions=QUADRANTS):
+    """
+    Zwraca maskę ćwiartek planszy z nieparzystą liczbą pustych pól.
+
+    Parameters:
+    empty (int): Maska pustych pól.
+    regions (List[int]): Maski ćwiartek planszy; domyślnie 8x8.
+
+    Returns:
+    int: Suma masek ćwiartek o nieparzystej liczbie pustych pól.
+    """
+    odd = 0
+    for quadrant in regions:
+        if (empty & quadrant).bit_count() & 1:
+            odd |= quadrant
+    return odd
+
+
+class EndgameSolver:
+    def __init__(self, max_empties=12, verbose=False):
+        """
+        Inicjalizuje solver końcówek.
+
+        Parameters:
+        max_empties (int): Maksymalna liczba pustych pól, przy której AI przełącza się na solver.
+        verbose (bool): Czy wypisywać czas i wynik każdego rozwiązania.
+
+        Attributes:
+        self.nodes (int): Liczba węzłów odwiedzonych w ostatnim rozwiązaniu.
+        self.elapsed (float): Czas ostatniego rozwiązania w sekundach.
+        self.value (int): Dokładna końcowa różnica pionków z punktu widzenia gracza przy ruchu.
+        self.solves (List[dict]): Historia rozwiązań: liczba pustych pól, węzły, czas i wynik,
+                                  do strojenia progu max_empties.
+        self.geometry (BoardGeometry): Geometria planszy ostatnio rozwiązywanej pozycji.
+        self.regions (List[int]): Ćwiartki tej planszy (porządkowanie według parzystości).
+        """
+        self.max_empties = max_empties
+        self.verbose = verbose
+        self.nodes = 0
+        self.elapsed = 0.0
+        self.value = 0
+        self.solves = []
+        self.geometry = DEFAULT_GEOMETRY
+        self.regions = QUADRANTS
+
+    def applies(self, game):
+        """
+        Sprawdza, czy pozycja ma na tyle mało pustych pól, by ją rozwiązać dokładnie.
+
+        Parameters:
+        game (BitboardReversi): Gra w bieżącej pozycji.
+
+        Returns:
+        bool: True, jeśli liczba pustych pól nie przekracza self.max_empties.
+        """
+        return game.geometry.squares - (game.bitboards[1] | game.bitboards[2]).bit_count() <= self.max_empties
+
+    def __call__(self, game):
+        """
+        Rozwiązuje pozycję dokładnie i zwraca optymalny ruch (interfejs jak Negamax z easyAI).
+
+        Parameters:
+        game (BitboardReversi): Gra w bieżącej pozycji.
+
+        Returns:
+        Tuple[int, int] | str | None: Optymalny ruch, PASS albo None, jeśli gra jest skończona.
+        """
+        start = time.perf_counter()
+        self.nodes = 0
+        self.geometry = game.geometry
+        self.regions = quadrants(game.board_size)
+        own = game.bitboards[game.current_player]
+        opp = game.bitboards[3 - game.current_player]
+        empties = self.geometry.squares - (own | opp).bit_count()
+
+        self.value, move = self.solve_root(own, opp, empties)
+
+        self.elapsed = time.perf_counter() - start
+        self.solves.append({"empties": empties, "nodes": self.nodes, "elapsed": self.elapsed, "value": self.value})
+        if self.verbose:
+            print(f"Endgame solved: {empties} empties, {self.nodes} nodes, {self.elapsed:.3f} s, "
+                  f"final disc difference {self.value:+d}")
+        return move
+
+    def solve_root(self, own, opp, empties):
+        """
+        Przeszukuje korzeń z pełnym oknem i zapamiętuje najlepszy ruch.
+
+        Returns:
+        Tuple[int, Tuple[int, int] | str | None]: Dokładny wynik i najlepszy ruch
+        (PASS, gdy gracz musi pasować, None, gdy gra jest skończona).
+        """
+        self.nodes += 1
+        alpha, beta = -self.geometry.squares - 1, self.geometry.squares + 1
+        children = self.ordered_children(own, opp, empties)
+        if not children:
+            if legal_moves_mask(opp, own, self.geometry):
+                return -self.solve(opp, own, -beta, -alpha, empties), PASS
+            return own.bit_count() - opp.bit_count(), None
+        best_square = children[0][1]
+        for _, square, new_own, new_opp in children:
+            value = -self.solve(new_opp, new_own, -beta, -alpha, empties - 1)
+            if value > alpha:
+                alpha = value
+                best_square = square
+        return alpha, square_to_move(best_square, self.geometry.size)
+
+    def ordered_children(self, own, opp, empties):
+        """
+        Generuje pozycje po legalnych ruchach w kolejności przeszukiwania.
+
+        Przy więcej niż FASTEST_FIRST_EMPTIES pustych polach kluczem jest liczba ruchów
+        przeciwnika po ruchu (fastest-first), w pozostałych przypadkach parzystość regionu.
+
+        Returns:
+        List[Tuple[int, int, int, int]]: Krotki (klucz, pole, nowe własne pionki, nowe pionki przeciwnika).
+        """
+        geometry = self.geometry
+        moves = legal_moves_mask(own, opp, geometry)
+        odd = odd_regions(~(own | opp) & geometry.full_mask, self.regions)
+        fastest_first = empties > FASTEST_FIRST_EMPTIES
+        children = []
+        while moves:
+            move_bit = moves & -moves
+            moves ^= move_bit
+            flips = flips_mask(own, opp, move_bit, geometry)
+            new_own = own | move_bit | flips
+            new_opp = opp ^ flips
+            parity = 0 if move_bit & odd else 1
+            if fastest_first:
+                key = 2 * legal_moves_mask(new_opp, new_own, geometry).bit_count() + parity
+            else:
+                key = parity
+            children.append((key, move_bit.bit_length() - 1, new_own, new_opp))
+        children.sort(key=lambda child: child[0])
+        return children
+
+    def solve(self, own, opp, alpha, beta, empties):
+        """
+        Negamax z cięciami alfa-beta liczony do końca gry.
+
+        Parameters:
+        own (int): Pionki gracza przy ruchu.
+        opp (int): Pionki przeciwnika.
+        alpha (int): Dolne ograniczenie okna.
+        beta (int): Górne ograniczenie okna.
+        empties (int): Liczba pustych pól.
+
+        Returns:
+        int: Końcowa różnica pionków z punktu widzenia gracza przy ruchu (dokładna wewnątrz okna).
+        """
+        if empties <= LAST_MOVES_EMPTIES:
+            return self.solve_last_moves(own, opp, alpha, beta)
+        self.nodes += 1
+        children = self.ordered_children(own, opp, empties)
+        if not children:
+            if legal_moves_mask(opp, own, self.geometry):
+                return -self.solve(opp, own, -beta, -alpha, empties)
+            return own.bit_count() - opp.bit_count()
+        best = -self.geometry.squares - 1
+        for _, _, new_own, new_opp in children:
+            value = -self.solve(new_opp, new_own, -beta, -alpha, empties - 1)
+            if value > best:
+                best = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+        return best
+
+    def solve_last_moves(self, own, opp, alpha, beta, passed=False):
+        """
+        Procedura dla ostatnich pustych pól: zamiast generować maskę ruchów sprawdza bezpośrednio
+        odwrócenia na każdym pustym polu (pola w nieparzystych ćwiartkach najpierw), a ostatnie
+        puste pole liczy bez rekurencji.
+
+        Parameters:
+        passed (bool): Czy przeciwnik właśnie spasował (drugi pas z rzędu kończy grę).
+
+        Returns:
+        int: Końcowa różnica pionków z punktu widzenia gracza przy ruchu.
+        """
+        self.nodes += 1
+        geometry = self.geometry
+        empty = ~(own | opp) & geometry.full_mask
+        if empty and not empty & (empty - 1):
+            flips = flips_mask(own, opp, empty, geometry)
+            if flips:
+                return (own | empty | flips).bit_count() - (opp ^ flips).bit_count()
+            flips = flips_mask(opp, own, empty, geometry)
+            if flips:
+                return (own ^ flips).bit_count() - (opp | empty | flips).bit_count()
+            return own.bit_count() - opp.bit_count()
+
+        odd = odd_regions(empty, self.regions)
+        best = None
+        for squares in (empty & odd, empty & ~odd):
+            while squares:
+                move_bit = squares & -squares
+                squares ^= move_bit
+                flips = flips_mask(own, opp, move_bit, geometry)
+                if not flips:
+                    continue
+                value = -self.solve_last_moves(opp ^ flips, own | move_bit | flips, -beta, -alpha)
+                if best is None or value > best:
+                    best = value
+                    if value > alpha:
+                        alpha = value
+                        if alpha >= beta:
+                            return best
+        if best is None:
+            if passed:
+                return own.bit_count() - opp.bit_count()
+            return -self.solve_last_moves(opp, own, -beta, -alpha, True)
+        return best
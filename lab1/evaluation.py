@@ -0,0 +1,93 @@
+"""
+Ocena pozycji i porządkowanie ruchów dla przeszukiwania Reversi.
+
+evaluate() łączy przyrostowo utrzymywaną sumę wag pól (BitboardReversi.positional)
+z mobilnością i dostępem do narożników. order_moves() to hak porządkujący ruchy
+dla AlphaBetaSearch: najpierw narożniki, na końcu pola X.
+"""
+
+from functools import lru_cache
+
+from bitboard import BOARD_SIZE, board_geometry, legal_moves_mask
+
+MOBILITY_WEIGHT = 5
+CORNER_ACCESS_WEIGHT = 25
+# Wynik zakończonej gry jest skalowany, żeby zawsze przeważał nad oceną heurystyczną
+WIN_WEIGHT = 1000
+
+
+@lru_cache(maxsize=None)
+def move_priority(size):
+    """
+    Wylicza priorytety pól przy porządkowaniu ruchów (większy = wcześniej): narożniki pierwsze,
+    pola X ostatnie, pozostałe według statycznych wag pól.
+
+    Parameters:
+    size (int): Rozmiar planszy.
+
+    Returns:
+    List[int]: Priorytety indeksowane numerem pola.
+    """
+    last = size - 1
+    priority = list(board_geometry(size).square_weights)
+    for x, y in [(0, 0), (0, last), (last, 0), (last, last)]:
+        priority[x * size + y] = 1000
+    for x, y in [(1, 1), (1, last - 1), (last - 1, 1), (last - 1, last - 1)]:
+        priority[x * size + y] = -1000
+    return priority
+
+
+# Maska narożników i priorytety pól planszy 8x8
+CORNERS = board_geometry(BOARD_SIZE).corners
+MOVE_PRIORITY = move_priority(BOARD_SIZE)
+
+
+def evaluate(game):
+    """
+    Ocenia pozycję z punktu widzenia gracza przy ruchu.
+
+    Składniki oceny:
+    - różnica sum wag pól zajętych przez graczy (utrzymywana przyrostowo przez grę),
+    - różnica mobilności (liczby legalnych ruchów),
+    - różnica liczby narożników dostępnych w jednym ruchu.
+    Jeśli żaden z graczy nie ma ruchów, gra jest skończona i zwracana jest
+    różnica pionków przemnożona przez WIN_WEIGHT.
+
+    Parameters:
+    game (BitboardReversi): Oceniana gra.
+
+    Returns:
+    int: Ocena pozycji; dodatnia oznacza przewagę gracza przy ruchu.
+    """
+    player = game.current_player
+    geometry = game.geometry
+    own = game.bitboards[player]
+    opp = game.bitboards[3 - player]
+    own_moves = legal_moves_mask(own, opp, geometry)
+    opp_moves = legal_moves_mask(opp, own, geometry)
+    if not own_moves and not opp_moves:
+        return WIN_WEIGHT * (own.bit_count() - opp.bit_count())
+    corners = geometry.corners
+    return (game.positional[player] - game.positional[3 - player]
+            + MOBILITY_WEIGHT * (own_moves.bit_count() - opp_moves.bit_count())
+            + CORNER_ACCESS_WEIGHT * ((own_moves & corners).bit_count() - (opp_moves & corners).bit_count()))
+
+
+def order_moves(game, moves):
+    """
+    Porządkuje ruchy tak, by najbardziej obiecujące były sprawdzane jako pierwsze:
+    narożniki na początku, pola X (po przekątnej od narożników) na końcu.
+
+    Parameters:
+    game (BitboardReversi): Gra w bieżącej pozycji.
+    moves (List[Tuple[int, int]]): Legalne ruchy.
+
+    Returns:
+    List[Tuple[int, int]]: Ruchy w kolejności przeszukiwania.
+    """
+    if len(moves) < 2:
+        # Jedyny ruch (także PASS) nie wymaga porządkowania
+        return moves
+    size = game.board_size
+    priority = move_priority(size)
+    return sorted(moves, key=lambda move: -priority[move[0] * size + move[1]])
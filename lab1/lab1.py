@@ -2,19 +2,36 @@
 - Zasady gry: https://pl.wikipedia.org/wiki/Reversi
 - Sebastian Kalwasiński, Karol Spica
 - Wymaga do działania biblioteki easyAI - test na wersji 2.0.12
-- Ruchy podawanie w formie "wierszkolumna" jako cyfry
+- Ruchy podawanie w formie "wierszkolumna" jako cyfry (na planszach większych niż 10x10: "wiersz kolumna")
 - Gramy czarnymi(tym tutaj: ○ ), zaczynami jako pierwsi
 """
 
-from easyAI import TwoPlayerGame, AI_Player, Human_Player, Negamax
+import os
+
+from easyAI import TwoPlayerGame, AI_Player, Human_Player
+
+from bitboard import PASS, BitboardReversi, format_board
+from endgame import EndgameSolver
+from evaluation import evaluate, order_moves
+from opening_book import BookSearch, OpeningBook
+from profiling import ProfiledAlphaBetaSearch
+from search import AlphaBetaSearch, TranspositionTable
+
+# Księga otwarć zbudowana przez opening_book.py; jeśli plik istnieje, AI gra z niej otwarcie bez przeszukiwania
+OPENING_BOOK_PATH = "opening_book.bin"
+# Plik JSON Lines ze statystykami przeszukiwania każdego ruchu AI (None wyłącza profilowanie)
+PROFILE_LOG_PATH = None
+# Rozmiar planszy (parzysty, co najmniej 4); księga otwarć działa tylko dla 8
+BOARD_SIZE = 8
 
 class Reversi(TwoPlayerGame):
-    def __init__(self, players):
+    def __init__(self, players, board_size=8):
         """
         Inicjalizuje grę Reversi, ustawiając planszę, graczy i podstawowe zmienne.
 
         Parameters:
         players (List[Player]): Lista graczy biorących udział w grze. Gracze mogą być obiektami klasy CustomHumanPlayer lub AI_Player.
+        board_size (int): Rozmiar planszy (parzysty, co najmniej 4), domyślnie 8.
 
         Attributes:
         self.players (List[Player]): Lista obiektów graczy.
@@ -23,26 +40,54 @@ class Reversi(TwoPlayerGame):
                                       Zera oznaczają puste pola, jedynki pionki gracza 1, a dwójki pionki gracza 2.
         self.current_player (int): Aktualny gracz, 1 oznacza gracza czarnego, który zaczyna.
         self.directions (List[Tuple[int, int]]): Lista kierunków (x, y), które są używane do sprawdzania poprawności ruchów.
+        self.history (List[List[Tuple[int, int]]]): Stos list pól odwróconych przez kolejne ruchy,
+                                                    używany przez unmake_move do cofania ruchów.
+        self.moves_cache (List[Tuple[int, int]] | None): Lista ruchów bieżącej pozycji wyliczona przez possible_moves;
+                                                         unieważniana w make_move, unmake_move i switch_player.
         """
 
         self.players = players
-        self.board_size = 8
+        self.board_size = board_size
         self.board = [[0 for _ in range(self.board_size)] for _ in range(self.board_size)]
-        self.board[3][3], self.board[4][4] = 2, 2
-        self.board[3][4], self.board[4][3] = 1, 1
+        half = self.board_size // 2
+        self.board[half - 1][half - 1], self.board[half][half] = 2, 2
+        self.board[half - 1][half], self.board[half][half - 1] = 1, 1
         self.current_player = 1
         self.directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, 1), (-1, 1), (1, -1)]
+        self.history = []
+        self.moves_cache = None
 
     def possible_moves(self):
         """
         Zwraca listę wszystkich możliwych ruchów jako współrzędne (x, y).
+        Jeśli bieżący gracz nie może postawić pionka, ale przeciwnik może, jedynym ruchem jest PASS;
+        jeśli żaden z graczy nie ma ruchu, lista jest pusta (koniec gry).
+        Wynik jest zapamiętywany do następnej zmiany pozycji, więc kolejne wywołania
+        (is_over, ask_move, easyAI) nie skanują planszy ponownie.
 
         Returns:
         List[Tuple[int, int]]: Lista krotek zawierających współrzędne (x, y)
         możliwych ruchów. Każda krotka reprezentuje pole, na którym
         można wykonać ruch.
         """
-        
+        if self.moves_cache is None:
+            moves = self.scan_moves()
+            if not moves:
+                self.current_player = 3 - self.current_player
+                opponent_can_move = bool(self.scan_moves())
+                self.current_player = 3 - self.current_player
+                if opponent_can_move:
+                    moves = [PASS]
+            self.moves_cache = moves
+        return list(self.moves_cache)
+
+    def scan_moves(self):
+        """
+        Skanuje całą planszę w poszukiwaniu pól, na których bieżący gracz może postawić pionek.
+
+        Returns:
+        List[Tuple[int, int]]: Lista współrzędnych (x, y) legalnych ruchów.
+        """
         moves = []
         for x in range(self.board_size):
             for y in range(self.board_size):
@@ -101,17 +146,50 @@ class Reversi(TwoPlayerGame):
     def make_move(self, move):
         """
         Wykonuje ruch i odwraca pionki.
+        Odwrócone pola zapisywane są na stosie self.history, dzięki czemu
+        ruch można cofnąć metodą unmake_move.
 
         Parameters:
-        move (Tuple[int, int]): Krotka zawierająca współrzędne (x, y)
-        pola, na które ma zostać wykonany ruch.
+        move (Tuple[int, int] | str): Krotka zawierająca współrzędne (x, y)
+        pola, na które ma zostać wykonany ruch, albo PASS.
         """
+        self.moves_cache = None
+        if move == PASS:
+            self.history.append([])
+            return
         x, y = move
         self.board[x][y] = self.current_player
 
+        flipped = []
         for dx, dy in self.directions:
             if self.is_direction_valid(x, y, dx, dy):
-                self.flip_in_direction(x, y, dx, dy)
+                flipped.extend(self.flip_in_direction(x, y, dx, dy))
+        self.history.append(flipped)
+
+    def unmake_move(self, move):
+        """
+        Cofa ostatni ruch w czasie proporcjonalnym do liczby odwróconych pionków.
+        easyAI wywołuje tę metodę po przywróceniu gracza, który wykonał ruch,
+        więc pionki wracają do przeciwnika bieżącego gracza.
+
+        Parameters:
+        move (Tuple[int, int] | str): Współrzędne (x, y) cofanego ruchu albo PASS.
+        """
+        self.moves_cache = None
+        flipped = self.history.pop()
+        if move == PASS:
+            return
+        x, y = move
+        self.board[x][y] = 0
+        for i, j in flipped:
+            self.board[i][j] = 3 - self.current_player
+
+    def switch_player(self):
+        """
+        Zmienia gracza przy ruchu i unieważnia zapamiętaną listę ruchów.
+        """
+        self.current_player = self.opponent_index
+        self.moves_cache = None
 
     def flip_in_direction(self, x, y, dx, dy):
         """
@@ -126,19 +204,25 @@ class Reversi(TwoPlayerGame):
         y (int): Współrzędna y pola, od którego rozpoczyna się odwracanie.
         dx (int): Zmiana współrzędnej x (kierunek w poziomie).
         dy (int): Zmiana współrzędnej y (kierunek w pionie).
+
+        Returns:
+        List[Tuple[int, int]]: Lista współrzędnych odwróconych pionków.
         """
+        flipped = []
         i, j = x + dx, y + dy
         while self.board[i][j] == 3 - self.current_player:
             self.board[i][j] = self.current_player
+            flipped.append((i, j))
             i += dx
             j += dy
+        return flipped
 
     def show(self):
         """
         Wyświetla aktualny stan planszy z numeracją wierszy i kolumn.
         Metoda renderuje planszę gry w formacie tekstowym, pokazując aktualne
         położenie pionków obu graczy oraz oznaczając puste pola.
-        Numeracja kolumn i wierszy zaczyna się od 0.
+        Numeracja kolumn i wierszy zaczyna się od 0 (na dużych planszach numery są wyrównane).
 
         W reprezentacji:
         - '○' oznacza pionek gracza 1 (czarny).
@@ -146,23 +230,14 @@ class Reversi(TwoPlayerGame):
         - '.' oznacza puste pole.
         """
 
-        print("   " + " ".join([str(i) for i in range(self.board_size)]))
-
-        for i, row in enumerate(self.board):
-            line = []
-            for j, cell in enumerate(row):
-                if cell == 1:
-                    line.append('○')
-                elif cell == 2:
-                    line.append('●')
-                else:
-                    line.append('.')
-            print(f"{i}  " + " ".join(line))
+        for line in format_board(self.board):
+            print(line)
         print("\n")
 
     def is_over(self):
         """
-        Sprawdza, czy gra się skończyła (brak ruchów).
+        Sprawdza, czy gra się skończyła (żaden z graczy nie ma ruchu).
+        Korzysta z listy ruchów zapamiętanej przez possible_moves.
 
         Returns:
         bool: True, jeśli gra się skończyła (brak dostępnych ruchów),
@@ -206,7 +281,8 @@ class CustomHumanPlayer(Human_Player):
         Zapytanie gracza o ruch w formacie x y.
 
         Metoda pobiera od gracza ruch w formacie dwóch cyfr "xy"
-        złączonych razem jako jedna cyfra, a następnie konwertuje je na krotkę
+        złączonych razem jako jedna cyfra (albo dwóch liczb "x y" rozdzielonych spacją,
+        co jest wymagane na planszach większych niż 10x10), a następnie konwertuje je na krotkę
         reprezentującą współrzędne na planszy. Proces trwa, aż gracz
         wprowadzi poprawny ruch, który znajduje się wśród możliwych ruchów.
 
@@ -216,28 +292,67 @@ class CustomHumanPlayer(Human_Player):
 
         Returns:
         Tuple[int, int]: Krotka zawierająca współrzędne (x, y)
-        reprezentujące ruch gracza.
+        reprezentujące ruch gracza (albo PASS, gdy gracz nie ma ruchu).
         """
+        possible_moves = game.possible_moves()
+        if possible_moves == [PASS]:
+            print("No moves available, you have to pass.")
+            return PASS
         move = None
-        while move not in game.possible_moves():
+        while move not in possible_moves:
             try:
-                move_str = input("Make your move (rowcolumn): ")
-                move = (int(move_str[0]), int(move_str[1]))
-                if move not in game.possible_moves():
+                move = self.parse_move(input("Make your move (rowcolumn or row column): "), game.board_size)
+                if move not in possible_moves:
                     print("Invalid move, try again.")
             except (ValueError, IndexError):
-                print("Invalid input format. Please use 'rowcolumn' together as one number.")
+                print("Invalid input format. Please use 'rowcolumn' together as one number or 'row column'.")
         return move
 
+    @staticmethod
+    def parse_move(move_str, board_size):
+        """
+        Zamienia tekst wpisany przez gracza na współrzędne pola.
 
-# Definicja sztucznej inteligencji
-ai_algo = Negamax(6)
-
-# Rozpoczęcie gry: gracz vs AI
-game = Reversi([CustomHumanPlayer(), AI_Player(ai_algo)])
-game.play()
+        Parameters:
+        move_str (str): "wierszkolumna" (dwie cyfry, tylko na planszach do 10x10) albo "wiersz kolumna".
+        board_size (int): Rozmiar planszy.
 
-# Gdy gra się zakończy, wyświetl wynik końcowy
-if game.is_over():
-    game.show()
-    game.get_winner()
+        Returns:
+        Tuple[int, int]: Współrzędne (x, y); ValueError, gdy tekst nie jest w żadnym z formatów.
+        """
+        parts = move_str.replace(",", " ").split()
+        if len(parts) == 2:
+            return int(parts[0]), int(parts[1])
+        if len(parts) == 1 and len(parts[0]) == 2 and board_size <= 10:
+            return int(parts[0][0]), int(parts[0][1])
+        raise ValueError(f"Invalid move: {move_str}")
+
+
+def main():
+    """
+    Rozgrywka gracz vs AI w terminalu. Wywoływana tylko przy uruchomieniu pliku jako skryptu,
+    dzięki czemu klasy z lab1.py można importować (np. w tournament.py) bez startu interaktywnej gry.
+    """
+    # Definicja sztucznej inteligencji (Negamax z alfa-beta, tablicą transpozycji, oceną pozycyjną i porządkowaniem ruchów;
+    # przy 12 i mniej pustych polach ruch wybiera dokładny solver końcówek, który wypisuje czas rozwiązania)
+    # (z PROFILE_LOG_PATH ta sama wersja z profilowaniem, zapisująca statystyki każdego ruchu)
+    search_class = ProfiledAlphaBetaSearch if PROFILE_LOG_PATH else AlphaBetaSearch
+    ai_algo = search_class(6, scoring=evaluate, tt=TranspositionTable(), order_moves=order_moves,
+                           endgame=EndgameSolver(max_empties=12, verbose=True))
+    if PROFILE_LOG_PATH:
+        ai_algo.log_path = PROFILE_LOG_PATH
+    if os.path.exists(OPENING_BOOK_PATH):
+        ai_algo = BookSearch(OpeningBook(OPENING_BOOK_PATH), ai_algo)
+
+    # Rozpoczęcie gry: gracz vs AI
+    game = BitboardReversi([CustomHumanPlayer(), AI_Player(ai_algo)], BOARD_SIZE)
+    game.play()
+
+    # Gdy gra się zakończy, wyświetl wynik końcowy
+    if game.is_over():
+        game.show()
+        game.get_winner()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Księga otwarć Reversi budowana z partii AI vs AI.
+
+Pozycje zapisywane są w postaci kanonicznej: z ośmiu symetrii planszy (obroty i odbicia)
+wybierana jest ta o najmniejszej parze masek (czarne, białe), więc symetryczne pozycje
+zajmują jeden wpis. Plik to posortowana tablica rekordów o stałej długości:
+
+    czarne (uint64) | białe (uint64) | gracz przy ruchu (uint8) | pole ruchu (uint8) | liczba wystąpień (uint16)
+
+Pole ruchu zapisane jest w układzie pozycji kanonicznej. Plik jest mapowany do pamięci (mmap),
+a wpis wyszukiwany binarnie, więc odczyt nie wymaga wczytywania całej księgi.
+
+Uruchomienie:
+    python opening_book.py --games 2000 --plies 12 --depth 6 --workers 16 --output opening_book.bin
+"""
+
+import argparse
+import mmap
+import os
+import random
+import struct
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from bitboard import BOARD_SIZE, PASS, BitboardReversi
+from evaluation import evaluate, order_moves
+from search import AlphaBetaSearch, TranspositionTable
+
+RECORD = struct.Struct("<QQBBH")
+MAX_COUNT = 0xFFFF
+
+_last = BOARD_SIZE - 1
+# Osiem symetrii planszy jako przekształcenia współrzędnych (x, y)
+SYMMETRIES = [
+    lambda x, y: (x, y),
+    lambda x, y: (y, x),
+    lambda x, y: (_last - x, y),
+    lambda x, y: (x, _last - y),
+    lambda x, y: (_last - x, _last - y),
+    lambda x, y: (_last - y, _last - x),
+    lambda x, y: (y, _last - x),
+    lambda x, y: (_last - y, x),
+]
+# Indeks symetrii odwrotnej (obroty o 90 i 270 stopni są swoimi odwrotnościami, pozostałe - same sobie)
+INVERSE = [0, 1, 2, 3, 4, 5, 7, 6]
+
+
+def _map_square(symmetry, square):
+    x, y = symmetry(*divmod(square, BOARD_SIZE))
+    return x * BOARD_SIZE + y
+
+
+# SQUARE_MAPS[s][pole] = pole po przekształceniu symetrią s
+SQUARE_MAPS = [[_map_square(symmetry, square) for square in range(BOARD_SIZE * BOARD_SIZE)] for symmetry in SYMMETRIES]
+
+
+def transform(bits, symmetry):
+    """
+    Przekształca maskę pól podaną symetrią planszy.
+
+    Parameters:
+    bits (int): Maska pól.
+    symmetry (int): Indeks symetrii z SYMMETRIES.
+
+    Returns:
+    int: Przekształcona maska.
+    """
+    square_map = SQUARE_MAPS[symmetry]
+    result = 0
+    while bits:
+        lowest = bits & -bits
+        result |= 1 << square_map[lowest.bit_length() - 1]
+        bits ^= lowest
+    return result
+
+
+def canonical(black, white):
+    """
+    Wyznacza kanoniczną postać pozycji spośród ośmiu symetrii.
+
+    Parameters:
+    black (int): Maska pionków gracza 1.
+    white (int): Maska pionków gracza 2.
+
+    Returns:
+    Tuple[int, int, int]: Kanoniczne maski (czarne, białe) i indeks symetrii, która do nich prowadzi.
+    """
+    best = None
+    for symmetry in range(len(SYMMETRIES)):
+        candidate = (transform(black, symmetry), transform(white, symmetry), symmetry)
+        if best is None or candidate[:2] < best[:2]:
+            best = candidate
+    return best
+
+
+class OpeningBook:
+    def __init__(self, path):
+        """
+        Otwiera plik księgi i mapuje go do pamięci tylko do odczytu.
+
+        Parameters:
+        path (str): Ścieżka do pliku zbudowanego przez write_book.
+
+        Attributes:
+        self.size (int): Liczba pozycji w księdze.
+        """
+        self.path = path
+        self.file = open(path, "rb")
+        file_size = os.fstat(self.file.fileno()).st_size
+        self.size = file_size // RECORD.size
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if file_size else b""
+
+    def close(self):
+        """
+        Zamyka mapowanie i plik księgi.
+        """
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+    def find(self, black, white, current_player):
+        """
+        Wyszukuje binarnie rekord pozycji kanonicznej.
+
+        Returns:
+        Tuple[int, int] | None: (pole ruchu w układzie kanonicznym, liczba wystąpień) lub None.
+        """
+        key = (black, white, current_player)
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            record = RECORD.unpack_from(self.data, middle * RECORD.size)
+            if record[:3] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.size:
+            record = RECORD.unpack_from(self.data, low * RECORD.size)
+            if record[:3] == key:
+                return record[3], record[4]
+        return None
+
+    def lookup(self, game):
+        """
+        Zwraca ruch z księgi dla bieżącej pozycji gry.
+
+        Parameters:
+        game (BitboardReversi): Gra w bieżącej pozycji.
+
+        Returns:
+        Tuple[int, int] | None: Ruch (x, y) lub None, jeśli pozycji nie ma w księdze
+        (księga obejmuje tylko planszę 8x8).
+        """
+        if game.board_size != BOARD_SIZE:
+            return None
+        black, white, symmetry = canonical(game.bitboards[1], game.bitboards[2])
+        found = self.find(black, white, game.current_player)
+        if found is None:
+            return None
+        square = SQUARE_MAPS[INVERSE[symmetry]][found[0]]
+        move = divmod(square, BOARD_SIZE)
+        return move if move in game.possible_moves() else None
+
+    def __deepcopy__(self, memo):
+        """
+        Księga jest tylko do odczytu, więc kopie gry tworzone przez easyAI współdzielą mapowanie pliku.
+        """
+        return self
+
+
+class BookSearch:
+    def __init__(self, book, algorithm):
+        """
+        Algorytm AI, który najpierw sprawdza księgę otwarć, a dopiero gdy pozycji w niej nie ma,
+        wywołuje właściwe przeszukiwanie (np. AlphaBetaSearch).
+
+        Parameters:
+        book (OpeningBook): Księga otwarć.
+        algorithm (Callable): Algorytm wywoływany poza księgą.
+
+        Attributes:
+        self.nodes (int): Liczba węzłów ostatniego ruchu (0 dla ruchu z księgi).
+        self.book_hits (int): Liczba ruchów zagranych z księgi.
+        """
+        self.book = book
+        self.algorithm = algorithm
+        self.nodes = 0
+        self.book_hits = 0
+
+    def __call__(self, game):
+        """
+        Zwraca ruch z księgi albo, poza księgą, ruch wybrany przez algorytm.
+
+        Parameters:
+        game (BitboardReversi): Gra w bieżącej pozycji.
+
+        Returns:
+        Tuple[int, int]: Wybrany ruch.
+        """
+        move = self.book.lookup(game)
+        if move is not None:
+            self.book_hits += 1
+            self.nodes = 0
+            return move
+        move = self.algorithm(game)
+        self.nodes = getattr(self.algorithm, "nodes", 0)
+        return move
+
+
+def self_play_positions(index, plies, depth, explore, seed):
+    """
+    Rozgrywa początek jednej partii AI vs AI i zbiera wybory AI w pozycjach kanonicznych.
+
+    Z prawdopodobieństwem explore zamiast ruchu AI grany jest losowy ruch (żeby partie się różniły),
+    ale do księgi trafiają tylko ruchy wybrane przez przeszukiwanie.
+
+    Returns:
+    List[Tuple[int, int, int, int]]: Krotki (czarne, białe, gracz przy ruchu, pole ruchu) w układzie kanonicznym.
+    """
+    rng = random.Random(seed * 1_000_003 + index)
+    search = AlphaBetaSearch(depth, evaluate, TranspositionTable(16), order_moves)
+    game = BitboardReversi([None, None])
+    positions = []
+    for _ in range(plies):
+        moves = game.possible_moves()
+        if not moves or moves == [PASS]:
+            break
+        move = search(game)
+        black, white, symmetry = canonical(game.bitboards[1], game.bitboards[2])
+        positions.append((black, white, game.current_player, SQUARE_MAPS[symmetry][move[0] * BOARD_SIZE + move[1]]))
+        if rng.random() < explore:
+            move = rng.choice(moves)
+        game.make_move(move)
+        game.switch_player()
+    return positions
+
+
+def write_book(path, choices):
+    """
+    Zapisuje księgę jako posortowaną tablicę rekordów; dla każdej pozycji wybierany jest
+    najczęściej wskazywany przez AI ruch.
+
+    Parameters:
+    path (str): Ścieżka pliku wyjściowego.
+    choices (Dict[Tuple[int, int, int], Counter]): Liczniki ruchów dla pozycji kanonicznych.
+    """
+    with open(path, "wb") as file:
+        for key in sorted(choices):
+            square, _ = choices[key].most_common(1)[0]
+            count = min(sum(choices[key].values()), MAX_COUNT)
+            file.write(RECORD.pack(*key, square, count))
+
+
+def build_book(path, games, plies, depth, explore=0.3, workers=None, seed=0):
+    """
+    Buduje księgę otwarć z partii AI vs AI rozgrywanych w puli procesów.
+
+    Parameters:
+    path (str): Ścieżka pliku wyjściowego.
+    games (int): Liczba partii.
+    plies (int): Liczba półruchów od początku partii zapisywanych w księdze.
+    depth (int): Głębokość przeszukiwania wybierającego ruchy.
+    explore (float): Prawdopodobieństwo zagrania losowego ruchu zamiast ruchu AI.
+    workers (int | None): Liczba procesów; domyślnie liczba rdzeni.
+    seed (int): Ziarno losowania.
+
+    Returns:
+    int: Liczba pozycji w księdze.
+    """
+    choices = defaultdict(Counter)
+    with ProcessPoolExecutor(workers or os.cpu_count()) as pool:
+        futures = [pool.submit(self_play_positions, index, plies, depth, explore, seed) for index in range(games)]
+        for future in futures:
+            for black, white, player, square in future.result():
+                choices[(black, white, player)][square] += 1
+    write_book(path, choices)
+    return len(choices)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Budowa księgi otwarć Reversi z partii AI vs AI")
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--plies", type=int, default=12)
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--explore", type=float, default=0.3)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="opening_book.bin")
+    args = parser.parse_args()
+
+    positions = build_book(args.output, args.games, args.plies, args.depth, args.explore, args.workers, args.seed)
+    print(f"Saved {positions} positions ({positions * RECORD.size} bytes) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Profilowanie przeszukiwania Reversi.
+
+ProfiledAlphaBetaSearch i ProfiledIterativeDeepeningSearch mają ten sam interfejs co AlphaBetaSearch
+i IterativeDeepeningSearch, ale dla każdego ruchu zbierają statystyki:
+- liczbę węzłów, ocen liści i węzłów wewnętrznych,
+- cięcia beta według indeksu ruchu, po którym nastąpiły (0 = pierwszy sprawdzony ruch),
+- zapytania i trafienia tablicy transpozycji,
+- czas generowania ruchów (game.possible_moves) i czas oceny pozycji,
+- efektywny współczynnik rozgałęzienia (węzły ** (1 / głębokość)).
+
+Instrumentacja siedzi wyłącznie w tych podklasach; AlphaBetaSearch i pozostałe algorytmy nie są zmieniane,
+więc gdy profilowanie nie jest używane, nie kosztuje nic. Każdy ruch daje rekord (słownik) dopisywany
+do self.records i - jeśli podano log_path - jako jedna linia JSON do pliku (do analizy offline).
+"""
+
+import json
+import time
+from collections import Counter
+
+from bitboard import PASS
+from search import AlphaBetaSearch, IterativeDeepeningSearch
+
+
+class SearchProfilerMixin:
+    """
+    Domieszka dodająca profilowanie do klasy przeszukiwania pochodnej od AlphaBetaSearch.
+    Musi stać w liście klas bazowych przed klasą przeszukiwania.
+    """
+
+    def __init__(self, *args, log_path=None, **kwargs):
+        """
+        Parameters:
+        *args, **kwargs: Argumenty klasy przeszukiwania.
+        log_path (str | None): Plik, do którego dopisywane są rekordy w formacie JSON Lines.
+
+        Attributes:
+        self.records (List[dict]): Rekordy wszystkich profilowanych ruchów.
+        """
+        super().__init__(*args, **kwargs)
+        self.log_path = log_path
+        self.records = []
+        self.reset_profile()
+
+    def reset_profile(self):
+        """
+        Zeruje liczniki bieżącego ruchu.
+        """
+        self.leaf_evaluations = 0
+        self.interior_nodes = 0
+        self.searched_children = 0
+        self.cutoffs = Counter()
+        self.movegen_calls = 0
+        self.movegen_time = 0.0
+        self.eval_time = 0.0
+        # Dla każdego półruchu bieżącej ścieżki: liczba przeszukanych dzieci i liczba legalnych ruchów
+        self.children = []
+        self.move_counts = []
+        self.ply = 0
+
+    def __call__(self, game):
+        """
+        Wybiera ruch algorytmem bazowym, mierząc przy tym generowanie ruchów i ocenę,
+        a następnie zapisuje rekord ruchu.
+
+        Parameters:
+        game (BitboardReversi): Gra w bieżącej pozycji.
+
+        Returns:
+        Tuple[int, int] | str | None: Wybrany ruch.
+        """
+        self.reset_profile()
+        endgame = self.endgame is not None and self.endgame.applies(game)
+        empties = game.geometry.squares - (game.bitboards[1] | game.bitboards[2]).bit_count()
+        tt_lookups = self.tt.lookups if self.tt is not None else 0
+        tt_hits = self.tt.hits if self.tt is not None else 0
+        generate = type(game).possible_moves
+
+        def timed_possible_moves():
+            start = time.perf_counter()
+            moves = generate(game)
+            self.movegen_time += time.perf_counter() - start
+            self.movegen_calls += 1
+            if self.ply < len(self.move_counts):
+                self.move_counts[self.ply] = len(moves)
+            return moves
+
+        # Atrybut instancji przesłania metodę klasy, więc is_over() też korzysta z mierzonej wersji
+        game.possible_moves = timed_possible_moves
+        try:
+            move = super().__call__(game)
+        finally:
+            del game.possible_moves
+
+        record = self.make_record(game, move, endgame, empties, tt_lookups, tt_hits)
+        self.records.append(record)
+        if self.log_path:
+            with open(self.log_path, "a") as file:
+                file.write(json.dumps(record) + "\n")
+        return move
+
+    def search(self, game, depth, alpha, beta, ply=0):
+        """
+        Przeszukuje węzeł algorytmem bazowym i zlicza dzieci oraz cięcia beta.
+        Cięcie to przerwanie pętli po ruchach przed ostatnim ruchem albo wynik >= beta.
+        """
+        if ply:
+            self.children[ply - 1] += 1
+        if len(self.children) <= ply:
+            self.children.append(0)
+            self.move_counts.append(0)
+        self.children[ply] = 0
+        self.move_counts[ply] = 0
+        self.ply = ply
+
+        value, move = super().search(game, depth, alpha, beta, ply)
+
+        searched = self.children[ply]
+        if searched:
+            self.interior_nodes += 1
+            self.searched_children += searched
+            if searched < self.move_counts[ply] or value >= beta:
+                self.cutoffs[searched - 1] += 1
+        return value, move
+
+    def evaluate(self, game):
+        """
+        Ocenia liść algorytmem bazowym, licząc oceny i ich czas.
+        """
+        start = time.perf_counter()
+        value = super().evaluate(game)
+        self.eval_time += time.perf_counter() - start
+        self.leaf_evaluations += 1
+        return value
+
+    def make_record(self, game, move, endgame, empties, tt_lookups, tt_hits):
+        """
+        Składa rekord statystyk ostatniego ruchu.
+
+        Returns:
+        dict: Rekord gotowy do zapisania jako JSON.
+        """
+        depth = getattr(self, "completed_depth", self.depth)
+        cutoffs = [self.cutoffs[index] for index in range(max(self.cutoffs, default=-1) + 1)]
+        total_cutoffs = sum(cutoffs)
+        return {
+            "player": game.current_player,
+            "empties": empties,
+            "move": move if move is None or move == PASS else list(move),
+            "endgame": endgame,
+            "depth": empties if endgame else depth,
+            "value": self.value,
+            "nodes": self.nodes,
+            "elapsed": self.elapsed,
+            "nodes_per_sec": self.nodes / self.elapsed if self.elapsed else 0.0,
+            "leaf_evaluations": self.leaf_evaluations,
+            "interior_nodes": self.interior_nodes,
+            "mean_children": self.searched_children / self.interior_nodes if self.interior_nodes else 0.0,
+            "cutoffs": total_cutoffs,
+            "cutoffs_by_index": cutoffs,
+            "first_move_cutoff_rate": cutoffs[0] / total_cutoffs if total_cutoffs else 0.0,
+            "tt_lookups": (self.tt.lookups - tt_lookups) if self.tt is not None else 0,
+            "tt_hits": (self.tt.hits - tt_hits) if self.tt is not None else 0,
+            "movegen_calls": self.movegen_calls,
+            "movegen_time": self.movegen_time,
+            "eval_time": self.eval_time,
+            "effective_branching_factor": self.nodes ** (1 / depth) if depth and not endgame else 0.0,
+        }
+
+
+class ProfiledAlphaBetaSearch(SearchProfilerMixin, AlphaBetaSearch):
+    """
+    AlphaBetaSearch zbierający statystyki każdego ruchu (patrz SearchProfilerMixin).
+    """
+
+
+class ProfiledIterativeDeepeningSearch(SearchProfilerMixin, IterativeDeepeningSearch):
+    """
+    IterativeDeepeningSearch zbierający statystyki każdego ruchu; głębokością rekordu
+    jest ostatnia ukończona iteracja, a statystyki obejmują wszystkie iteracje.
+    """
+
+
+def load_records(path):
+    """
+    Wczytuje rekordy zapisane przez profilowane przeszukiwanie.
+
+    Parameters:
+    path (str): Plik w formacie JSON Lines.
+
+    Returns:
+    List[dict]: Rekordy w kolejności zapisu.
+    """
+    with open(path) as file:
+        return [json.loads(line) for line in file if line.strip()]
@@ -0,0 +1,584 @@
+"""
+Przeszukiwanie drzewa gry Reversi: Negamax z cięciami alfa-beta i tablicą transpozycji.
+
+AlphaBetaSearch ma ten sam interfejs co Negamax z easyAI (obiekt wywoływany z grą,
+zwracający ruch), więc można go podać do AI_Player. Wymaga gry z metodą unmake_move
+oraz przyrostowo aktualizowanym hashem Zobrista w atrybucie hash (BitboardReversi).
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from easyAI import AI_Player
+from easyAI.AI.Negamax import LOWERBOUND, EXACT, UPPERBOUND
+
+from bitboard import BitboardReversi
+from evaluation import evaluate, order_moves
+
+inf = float("infinity")
+
+REPLACEMENT_POLICIES = ("always", "depth")
+
+# Co ile węzłów sprawdzany jest zegar (maska bitowa na licznik węzłów)
+DEADLINE_CHECK_MASK = 255
+
+
+class SearchTimeout(Exception):
+    """
+    Zgłaszany wewnątrz przeszukiwania, gdy minie czas przeznaczony na ruch.
+    """
+
+
+class TranspositionTable:
+    def __init__(self, size_bits=20, replacement="depth"):
+        """
+        Inicjalizuje tablicę transpozycji o stałym rozmiarze 2 ** size_bits pozycji.
+
+        Wpis jest krotką (hash, głębokość, typ ograniczenia, wartość, najlepszy ruch, generacja).
+        Pozycja wpisu w tablicy to dolne bity hasha Zobrista, a pełny hash chroni przed kolizjami.
+
+        Parameters:
+        size_bits (int): Logarytm dwójkowy liczby wpisów.
+        replacement (str): Polityka zastępowania wpisów przy kolizji:
+                           "always" - nowy wpis zawsze zastępuje stary,
+                           "depth" - stary wpis zostaje, jeśli pochodzi z bieżącego wyszukiwania
+                                     i był liczony na większą głębokość.
+
+        Attributes:
+        self.lookups (int): Liczba zapytań do tablicy.
+        self.hits (int): Liczba zapytań, dla których znaleziono wpis danej pozycji.
+        self.stores (int): Liczba zapisanych wpisów.
+        self.rejected (int): Liczba zapisów odrzuconych przez politykę "depth".
+        """
+        if replacement not in REPLACEMENT_POLICIES:
+            raise ValueError(f"Unknown replacement policy: {replacement}")
+        self.size = 1 << size_bits
+        self.mask = self.size - 1
+        self.replacement = replacement
+        self.entries = [None] * self.size
+        self.generation = 0
+        self.lookups = 0
+        self.hits = 0
+        self.stores = 0
+        self.rejected = 0
+
+    def __deepcopy__(self, memo):
+        """
+        TwoPlayerGame.play z easyAI kopiuje grę razem z graczami (a więc i z tablicą) po każdym ruchu.
+        Tablica jest tylko pamięcią podręczną, więc kopie współdzielą ją zamiast kopiować milion wpisów.
+        """
+        return self
+
+    def new_search(self):
+        """
+        Oznacza początek nowego wyszukiwania; wpisy z poprzednich wyszukiwań mogą być zawsze zastąpione.
+        """
+        self.generation += 1
+
+    def lookup(self, key):
+        """
+        Zwraca wpis dla pozycji o podanym hashu.
+
+        Parameters:
+        key (int): Hash Zobrista pozycji.
+
+        Returns:
+        tuple | None: Wpis (hash, głębokość, typ, wartość, ruch, generacja) lub None.
+        """
+        self.lookups += 1
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, flag, value, move):
+        """
+        Zapisuje wynik przeszukania pozycji zgodnie z polityką zastępowania.
+
+        Parameters:
+        key (int): Hash Zobrista pozycji.
+        depth (int): Głębokość, na jaką pozycja została przeszukana.
+        flag (int): EXACT, LOWERBOUND lub UPPERBOUND.
+        value (float): Wartość pozycji.
+        move (Tuple[int, int]): Najlepszy znaleziony ruch.
+        """
+        index = key & self.mask
+        old = self.entries[index]
+        if (self.replacement == "depth" and old is not None and old[0] != key
+                and old[5] == self.generation and old[1] > depth):
+            self.rejected += 1
+            return
+        self.entries[index] = (key, depth, flag, value, move, self.generation)
+        self.stores += 1
+
+    def hit_rate(self):
+        """
+        Zwraca odsetek zapytań zakończonych trafieniem.
+
+        Returns:
+        float: Wartość z przedziału [0, 1].
+        """
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def clear(self):
+        """
+        Usuwa wszystkie wpisy i zeruje statystyki.
+        """
+        self.entries = [None] * self.size
+        self.lookups = self.hits = self.stores = self.rejected = 0
+
+
+class AlphaBetaSearch:
+    def __init__(self, depth, scoring=None, tt=None, order_moves=None, endgame=None):
+        """
+        Inicjalizuje algorytm Negamax z cięciami alfa-beta.
+
+        Parameters:
+        depth (int): Głębokość przeszukiwania w półruchach.
+        scoring (Callable | None): Funkcja oceny f(game) -> liczba z punktu widzenia gracza przy ruchu;
+                                   domyślnie game.scoring().
+        tt (TranspositionTable | None): Tablica transpozycji odczytywana i zapisywana w każdym węźle.
+        order_moves (Callable | None): Hak porządkujący ruchy f(game, moves) -> moves (np. evaluation.order_moves).
+                                       Ruch z tablicy transpozycji i wariantu głównego i tak idzie pierwszy.
+        endgame (EndgameSolver | None): Solver końcówek; gdy liczba pustych pól spadnie do jego progu,
+                                        ruch wybierany jest dokładnym rozwiązaniem zamiast przeszukiwania.
+
+        Attributes:
+        self.nodes (int): Liczba węzłów odwiedzonych w ostatnim wyszukiwaniu.
+        self.elapsed (float): Czas ostatniego wyszukiwania w sekundach.
+        self.value (float): Wartość pozycji z ostatniego wyszukiwania.
+        self.deadline (float | None): Chwila (time.perf_counter), po której przeszukiwanie jest przerywane.
+        self.pv (List[Tuple[int, Tuple[int, int]]]): Wariant główny jako lista (hash pozycji, ruch);
+                                                     ruchy z niego sprawdzane są jako pierwsze.
+        """
+        self.depth = depth
+        self.scoring = scoring
+        self.tt = tt
+        self.order_moves = order_moves
+        self.endgame = endgame
+        self.nodes = 0
+        self.elapsed = 0.0
+        self.value = 0
+        self.deadline = None
+        self.pv = []
+
+    def __call__(self, game):
+        """
+        Zwraca najlepszy ruch dla bieżącego gracza.
+
+        Parameters:
+        game (BitboardReversi): Gra, na której wykonywane są ruchy i ich cofnięcia.
+
+        Returns:
+        Tuple[int, int]: Wybrany ruch.
+        """
+        if self.endgame is not None and self.endgame.applies(game):
+            return self.solve_endgame(game)
+        self.nodes = 0
+        start = time.perf_counter()
+        if self.tt is not None:
+            self.tt.new_search()
+        self.value, move = self.search(game, self.depth, -inf, inf)
+        self.elapsed = time.perf_counter() - start
+        return move
+
+    def solve_endgame(self, game):
+        """
+        Wybiera ruch solverem końcówek i przepisuje jego statystyki (węzły, czas, wynik).
+
+        Parameters:
+        game (BitboardReversi): Gra w bieżącej pozycji.
+
+        Returns:
+        Tuple[int, int]: Optymalny ruch.
+        """
+        move = self.endgame(game)
+        self.nodes = self.endgame.nodes
+        self.elapsed = self.endgame.elapsed
+        self.value = self.endgame.value
+        return move
+
+    def evaluate(self, game):
+        """
+        Ocenia liść drzewa z punktu widzenia gracza przy ruchu.
+
+        Parameters:
+        game (BitboardReversi): Oceniana gra.
+
+        Returns:
+        float: Ocena pozycji.
+        """
+        return self.scoring(game) if self.scoring else game.scoring()
+
+    def search(self, game, depth, alpha, beta, ply=0):
+        """
+        Rekurencyjny Negamax z cięciami alfa-beta i tablicą transpozycji.
+        Jeśli ustawiono self.deadline, po jego upływie zgłaszany jest SearchTimeout,
+        a gra jest przywracana do pozycji sprzed wywołania.
+
+        Parameters:
+        game (BitboardReversi): Gra w przeszukiwanej pozycji.
+        depth (int): Pozostała głębokość.
+        alpha (float): Dolne ograniczenie okna.
+        beta (float): Górne ograniczenie okna.
+        ply (int): Odległość od korzenia w półruchach.
+
+        Returns:
+        Tuple[float, Tuple[int, int] | None]: Wartość pozycji i najlepszy ruch (None w liściu).
+        """
+        self.nodes += 1
+        if self.deadline is not None and not self.nodes & DEADLINE_CHECK_MASK and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        alpha_orig = alpha
+        tt_move = None
+
+        if self.tt is not None:
+            entry = self.tt.lookup(game.hash)
+            if entry is not None:
+                _, entry_depth, flag, value, tt_move, _ = entry
+                if entry_depth >= depth:
+                    if flag == EXACT:
+                        return value, tt_move
+                    elif flag == LOWERBOUND:
+                        alpha = max(alpha, value)
+                    elif flag == UPPERBOUND:
+                        beta = min(beta, value)
+                    if alpha >= beta:
+                        return value, tt_move
+
+        if depth == 0 or game.is_over():
+            return self.evaluate(game), None
+
+        moves = game.possible_moves()
+        if self.order_moves is not None:
+            moves = self.order_moves(game, moves)
+        if tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+        if ply < len(self.pv) and self.pv[ply][0] == game.hash and self.pv[ply][1] in moves:
+            pv_move = self.pv[ply][1]
+            moves.remove(pv_move)
+            moves.insert(0, pv_move)
+
+        best_value = -inf
+        best_move = moves[0]
+        for move in moves:
+            game.make_move(move)
+            game.switch_player()
+            try:
+                value = -self.search(game, depth - 1, -beta, -alpha, ply + 1)[0]
+            finally:
+                game.switch_player()
+                game.unmake_move(move)
+
+            if value > best_value:
+                best_value = value
+                best_move = move
+            if value > alpha:
+                alpha = value
+                if alpha >= beta:
+                    break
+
+        if self.tt is not None:
+            if best_value <= alpha_orig:
+                flag = UPPERBOUND
+            elif best_value >= beta:
+                flag = LOWERBOUND
+            else:
+                flag = EXACT
+            self.tt.store(game.hash, depth, flag, best_value, best_move)
+
+        return best_value, best_move
+
+
+class IterativeDeepeningSearch(AlphaBetaSearch):
+    def __init__(self, time_limit, max_depth=60, scoring=None, tt=None, order_moves=None, endgame=None,
+                 aspiration_window=16):
+        """
+        Inicjalizuje przeszukiwanie z iteracyjnym pogłębianiem ograniczone czasem.
+
+        Kolejne iteracje przeszukują głębokości 1, 2, ... aż do upływu time_limit sekund.
+        Każda iteracja od głębokości 2 startuje z oknem aspiracyjnym wokół wyniku poprzedniej,
+        a wariant główny poprzedniej iteracji (odczytany z tablicy transpozycji) jest sprawdzany jako pierwszy.
+
+        Parameters:
+        time_limit (float): Czas na ruch w sekundach.
+        max_depth (int): Maksymalna głębokość iteracji.
+        scoring (Callable | None): Funkcja oceny, jak w AlphaBetaSearch.
+        tt (TranspositionTable | None): Tablica transpozycji; domyślnie tworzona nowa.
+        order_moves (Callable | None): Hak porządkujący ruchy, jak w AlphaBetaSearch.
+        endgame (EndgameSolver | None): Solver końcówek, jak w AlphaBetaSearch (działa bez limitu czasu).
+        aspiration_window (float): Połowa szerokości okna aspiracyjnego.
+
+        Attributes:
+        self.completed_depth (int): Głębokość ostatniej ukończonej iteracji.
+        """
+        super().__init__(max_depth, scoring, tt if tt is not None else TranspositionTable(), order_moves, endgame)
+        self.time_limit = time_limit
+        self.aspiration_window = aspiration_window
+        self.completed_depth = 0
+
+    def __call__(self, game):
+        """
+        Zwraca najlepszy ruch znaleziony przed upływem czasu.
+        Głębokość 1 jest zawsze przeszukiwana do końca, więc zawsze zwracany jest legalny ruch.
+
+        Parameters:
+        game (BitboardReversi): Gra, na której wykonywane są ruchy i ich cofnięcia.
+
+        Returns:
+        Tuple[int, int]: Wybrany ruch.
+        """
+        if self.endgame is not None and self.endgame.applies(game):
+            return self.solve_endgame(game)
+        start = time.perf_counter()
+        self.nodes = 0
+        self.completed_depth = 0
+        self.pv = []
+        self.tt.new_search()
+
+        self.deadline = None
+        self.value, best_move = self.search(game, 1, -inf, inf)
+        self.completed_depth = 1
+        self.deadline = start + self.time_limit
+
+        try:
+            for depth in range(2, self.depth + 1):
+                self.pv = self.principal_variation(game, depth)
+                value, move = self.aspiration_search(game, depth, self.value)
+                self.value, best_move = value, move
+                self.completed_depth = depth
+                if time.perf_counter() > self.deadline:
+                    break
+        except SearchTimeout:
+            pass
+        finally:
+            self.deadline = None
+            self.elapsed = time.perf_counter() - start
+        return best_move
+
+    def aspiration_search(self, game, depth, guess):
+        """
+        Przeszukuje korzeń w wąskim oknie wokół wartości guess; przy wyniku poza oknem
+        poszerza je po stronie, po której nastąpiło przekroczenie, i powtarza przeszukanie.
+
+        Parameters:
+        game (BitboardReversi): Gra w pozycji korzenia.
+        depth (int): Głębokość iteracji.
+        guess (float): Oczekiwana wartość pozycji (wynik poprzedniej iteracji).
+
+        Returns:
+        Tuple[float, Tuple[int, int]]: Dokładna wartość korzenia i najlepszy ruch.
+        """
+        alpha, beta = guess - self.aspiration_window, guess + self.aspiration_window
+        while True:
+            value, move = self.search(game, depth, alpha, beta)
+            if value <= alpha:
+                alpha = -inf
+            elif value >= beta:
+                beta = inf
+            else:
+                return value, move
+
+    def principal_variation(self, game, max_length):
+        """
+        Odczytuje wariant główny z tablicy transpozycji, idąc po najlepszych ruchach od korzenia.
+
+        Parameters:
+        game (BitboardReversi): Gra w pozycji korzenia (po wywołaniu pozostaje niezmieniona).
+        max_length (int): Maksymalna długość wariantu.
+
+        Returns:
+        List[Tuple[int, Tuple[int, int]]]: Lista par (hash pozycji, ruch).
+        """
+        pv = []
+        for _ in range(max_length):
+            entry = self.tt.lookup(game.hash)
+            if entry is None or entry[4] not in game.possible_moves():
+                break
+            pv.append((game.hash, entry[4]))
+            game.make_move(entry[4])
+            game.switch_player()
+        for _, move in reversed(pv):
+            game.switch_player()
+            game.unmake_move(move)
+        return pv
+
+
+# Stan procesu roboczego ParallelRootSearch, ustawiany przez _init_root_worker
+_shared_alpha = None
+_worker_search = None
+_worker_search_id = None
+
+
+def _init_root_worker(shared_alpha, depth, scoring, order_moves, tt_bits):
+    """
+    Inicjalizuje proces roboczy: zapamiętuje wspólne ograniczenie alfa i tworzy
+    własne przeszukiwanie z własną tablicą transpozycji (zachowywaną między wyszukiwaniami).
+    """
+    global _shared_alpha, _worker_search
+    _shared_alpha = shared_alpha
+    _worker_search = AlphaBetaSearch(depth, scoring, TranspositionTable(tt_bits), order_moves)
+
+
+def _search_root_move(black, white, current_player, move, size, search_id, reuse_tables):
+    """
+    Przeszukuje poddrzewo jednego ruchu z korzenia w procesie roboczym.
+    Pierwsze zadanie nowego wyszukiwania (nowy search_id) w danym procesie rozpoczyna nowe
+    pokolenie wpisów tablicy transpozycji albo - przy reuse_tables=False - czyści tablicę.
+
+    Dolną granicą okna jest wspólne alfa pomniejszone o 1, dzięki czemu ruch o wartości
+    równej dotychczas najlepszej dostaje wartość dokładną i remisy rozstrzygane są tak samo
+    jak w przeszukiwaniu sekwencyjnym (wymaga całkowitoliczbowej funkcji oceny).
+
+    Returns:
+    Tuple[float, int]: Wartość ruchu z punktu widzenia gracza w korzeniu i liczba odwiedzonych węzłów.
+    """
+    global _worker_search_id
+    if search_id != _worker_search_id:
+        _worker_search_id = search_id
+        if reuse_tables:
+            _worker_search.tt.new_search()
+        else:
+            _worker_search.tt.clear()
+
+    game = BitboardReversi.from_position(black, white, current_player, size=size)
+    game.make_move(move)
+    game.switch_player()
+    alpha = _shared_alpha.value - 1
+    _worker_search.nodes = 0
+    value = -_worker_search.search(game, _worker_search.depth - 1, -inf, -alpha, 1)[0]
+    with _shared_alpha.get_lock():
+        if value > _shared_alpha.value:
+            _shared_alpha.value = value
+    return value, _worker_search.nodes
+
+
+class ParallelRootSearch:
+    def __init__(self, depth, workers=None, scoring=None, order_moves=None, tt_bits=18, reuse_tables=True):
+        """
+        Inicjalizuje przeszukiwanie z podziałem ruchów z korzenia między procesy.
+
+        Każdy ruch z possible_moves() jest osobnym zadaniem ProcessPoolExecutor. Pula procesów tworzona jest
+        przy pierwszym wyszukiwaniu i używana w kolejnych (close() albo blok with ją zamyka), więc procesy
+        robocze i ich tablice transpozycji przechodzą z ruchu na ruch. Procesy dzielą jedno ograniczenie alfa
+        (multiprocessing.Value), zerowane na początku każdego wyszukiwania, które zawęża okno kolejnych
+        poddrzew. Przy pustych tablicach (reuse_tables=False) wybrany ruch jest taki sam jak w AlphaBetaSearch
+        z tą samą głębokością, oceną i porządkowaniem ruchów.
+
+        Parameters:
+        depth (int): Głębokość przeszukiwania w półruchach.
+        workers (int | None): Liczba procesów; domyślnie liczba rdzeni.
+        scoring (Callable | None): Całkowitoliczbowa funkcja oceny zdefiniowana na poziomie modułu
+                                   (przekazywana do procesów przez pickle).
+        order_moves (Callable | None): Hak porządkujący ruchy, jak w AlphaBetaSearch.
+        tt_bits (int): Rozmiar tablicy transpozycji każdego procesu (log2 liczby wpisów).
+        reuse_tables (bool): Czy zachowywać tablice transpozycji procesów między wyszukiwaniami.
+
+        Attributes:
+        self.nodes (int): Suma węzłów odwiedzonych przez wszystkie procesy w ostatnim wyszukiwaniu.
+        self.elapsed (float): Czas ostatniego wyszukiwania w sekundach.
+        self.value (float): Wartość pozycji z ostatniego wyszukiwania.
+        """
+        self.depth = depth
+        self.workers = workers or os.cpu_count()
+        self.scoring = scoring
+        self.order_moves = order_moves
+        self.tt_bits = tt_bits
+        self.reuse_tables = reuse_tables
+        self.nodes = 0
+        self.elapsed = 0.0
+        self.value = 0
+        self._pool = None
+        self._shared_alpha = None
+        self._searches = 0
+
+    def __deepcopy__(self, memo):
+        """
+        TwoPlayerGame.play z easyAI kopiuje graczy po każdym ruchu; kopie współdzielą pulę procesów.
+        """
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_pool(self):
+        """
+        Zwraca pulę procesów, tworząc ją (razem ze wspólnym alfa) przy pierwszym użyciu.
+
+        Returns:
+        ProcessPoolExecutor: Pula procesów roboczych.
+        """
+        if self._pool is None:
+            self._shared_alpha = multiprocessing.Value("d", -inf)
+            initargs = (self._shared_alpha, self.depth, self.scoring, self.order_moves, self.tt_bits)
+            self._pool = ProcessPoolExecutor(self.workers, initializer=_init_root_worker, initargs=initargs)
+        return self._pool
+
+    def close(self):
+        """
+        Zamyka pulę procesów (kolejne wyszukiwanie utworzy nową).
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._shared_alpha = None
+
+    def __call__(self, game):
+        """
+        Zwraca najlepszy ruch dla bieżącego gracza.
+
+        Parameters:
+        game (BitboardReversi): Gra w pozycji korzenia.
+
+        Returns:
+        Tuple[int, int] | None: Wybrany ruch (None, jeśli gracz nie ma ruchów).
+        """
+        start = time.perf_counter()
+        moves = game.possible_moves()
+        if self.order_moves is not None:
+            moves = self.order_moves(game, moves)
+        if not moves:
+            return None
+
+        pool = self.get_pool()
+        # Wszystkie zadania poprzedniego przeszukiwania są zakończone, więc granicę można wyzerować
+        with self._shared_alpha.get_lock():
+            self._shared_alpha.value = -inf
+        self._searches += 1
+        futures = [pool.submit(_search_root_move, game.bitboards[1], game.bitboards[2], game.current_player,
+                               move, game.board_size, self._searches, self.reuse_tables) for move in moves]
+        results = [future.result() for future in futures]
+
+        self.nodes = 1 + sum(nodes for _, nodes in results)
+        best_index = 0
+        for index, (value, _) in enumerate(results):
+            if value > results[best_index][0]:
+                best_index = index
+        self.value = results[best_index][0]
+        self.elapsed = time.perf_counter() - start
+        return moves[best_index]
+
+
+class TimedAI_Player(AI_Player):
+    """
+    Gracz AI z ograniczonym czasem na ruch, do użycia zamiast AI_Player(Negamax(...)).
+    Używa oceny pozycji evaluation.evaluate i porządkowania ruchów evaluation.order_moves.
+    """
+
+    def __init__(self, time_limit, name="AI", tt=None, endgame=None):
+        """
+        Parameters:
+        time_limit (float): Czas na ruch w sekundach.
+        name (str): Nazwa gracza.
+        tt (TranspositionTable | None): Tablica transpozycji współdzielona między ruchami.
+        endgame (EndgameSolver | None): Solver końcówek używany poniżej jego progu pustych pól.
+        """
+        super().__init__(IterativeDeepeningSearch(time_limit, scoring=evaluate, tt=tt, order_moves=order_moves,
+                                                  endgame=endgame), name)
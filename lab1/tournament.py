@@ -0,0 +1,239 @@
+"""
+Turniej AI vs AI bez interfejsu: tysiące partii rozgrywanych w wielu procesach.
+
+Uruchomienie:
+    python tournament.py --games 1000 --black depth:4 --white time:0.05 --workers 16 \
+        --csv games.csv --json summary.json
+
+Gracze opisywani są specyfikacją:
+- "depth:N"  - AlphaBetaSearch na głębokość N z oceną pozycyjną, porządkowaniem ruchów i solverem końcówek,
+- "time:S"   - TimedAI_Player z S sekundami na ruch,
+- "random"   - losowy legalny ruch.
+Kolory zamieniane są co partię, a pierwsze --random-plies półruchów jest losowanych (powtarzalnie z --seed),
+żeby partie deterministycznych silników się różniły. Partie nie wywołują show() ani input().
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from easyAI import AI_Player
+
+from bitboard import BitboardReversi
+from endgame import EndgameSolver
+from evaluation import evaluate, order_moves
+from opening_book import BookSearch, OpeningBook
+from search import AlphaBetaSearch, TimedAI_Player, TranspositionTable
+
+
+class RandomPlayer:
+    """
+    Gracz wybierający losowy legalny ruch (punkt odniesienia dla silników).
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.name = "random"
+
+    def ask_move(self, game):
+        return self.rng.choice(game.possible_moves())
+
+
+def make_player(spec, rng, endgame_empties, book_path=None):
+    """
+    Tworzy gracza na podstawie specyfikacji tekstowej.
+
+    Parameters:
+    spec (str): "depth:N", "time:S" lub "random".
+    rng (random.Random): Generator liczb losowych dla gracza losowego.
+    endgame_empties (int): Próg pustych pól solvera końcówek (0 wyłącza solver).
+    book_path (str | None): Plik księgi otwarć, z której korzystają gracze AI.
+
+    Returns:
+    Player: Obiekt z metodą ask_move(game).
+    """
+    kind, _, value = spec.partition(":")
+    endgame = EndgameSolver(endgame_empties) if endgame_empties else None
+    if kind == "depth":
+        player = AI_Player(AlphaBetaSearch(int(value), evaluate, TranspositionTable(18), order_moves, endgame), spec)
+    elif kind == "time":
+        player = TimedAI_Player(float(value), spec, TranspositionTable(18), endgame)
+    elif kind == "random":
+        return RandomPlayer(rng)
+    else:
+        raise ValueError(f"Unknown player specification: {spec}")
+    if book_path:
+        player.AI_algo = BookSearch(OpeningBook(book_path), player.AI_algo)
+    return player
+
+
+def play_game(index, black_spec, white_spec, random_plies, seed, endgame_empties, book_path=None, size=8):
+    """
+    Rozgrywa jedną partię bez wyświetlania planszy.
+
+    Parameters:
+    index (int): Numer partii (wyznacza też ziarno losowego otwarcia).
+    black_spec (str): Specyfikacja gracza 1 (czarne, zaczynają).
+    white_spec (str): Specyfikacja gracza 2.
+    random_plies (int): Liczba losowych półruchów otwierających partię.
+    seed (int): Ziarno turnieju.
+    endgame_empties (int): Próg pustych pól solvera końcówek.
+    book_path (str | None): Plik księgi otwarć dla graczy AI.
+    size (int): Rozmiar planszy.
+
+    Returns:
+    dict: Wynik partii: gracze, liczby pionków, zwycięzca, liczba półruchów, węzły i czas przeszukiwania.
+    """
+    rng = random.Random(seed * 1_000_003 + index)
+    players = [make_player(black_spec, rng, endgame_empties, book_path),
+               make_player(white_spec, rng, endgame_empties, book_path)]
+    game = BitboardReversi(players, size)
+    nodes = [0, 0, 0]
+    search_time = [0.0, 0.0, 0.0]
+    plies = 0
+    start = time.perf_counter()
+
+    while not game.is_over():
+        if plies < random_plies:
+            move = rng.choice(game.possible_moves())
+        else:
+            player = game.player
+            move_start = time.perf_counter()
+            move = player.ask_move(game)
+            search_time[game.current_player] += time.perf_counter() - move_start
+            algorithm = getattr(player, "AI_algo", None)
+            nodes[game.current_player] += getattr(algorithm, "nodes", 0)
+        game.make_move(move)
+        game.switch_player()
+        plies += 1
+
+    elapsed = time.perf_counter() - start
+    black_discs = game.bitboards[1].bit_count()
+    white_discs = game.bitboards[2].bit_count()
+    total_time = search_time[1] + search_time[2]
+    return {
+        "game": index,
+        "size": size,
+        "black": black_spec,
+        "white": white_spec,
+        "black_discs": black_discs,
+        "white_discs": white_discs,
+        "winner": "black" if black_discs > white_discs else "white" if white_discs > black_discs else "tie",
+        "plies": plies,
+        "black_nodes": nodes[1],
+        "white_nodes": nodes[2],
+        "black_time": search_time[1],
+        "white_time": search_time[2],
+        "elapsed": elapsed,
+        "nodes_per_sec": (nodes[1] + nodes[2]) / total_time if total_time else 0.0,
+    }
+
+
+def summarize(results, player_a, player_b, wall_time, workers):
+    """
+    Agreguje wyniki partii: bilans graczy, średnia różnica pionków i przepustowość.
+
+    Returns:
+    dict: Podsumowanie turnieju.
+    """
+    score_a = score_b = 0.0
+    disc_difference = 0
+    for result in results:
+        # Gracz A gra czarnymi w partiach parzystych (jak w run_tournament), co działa też dla player_a == player_b
+        a_is_black = result["game"] % 2 == 0
+        a_discs = result["black_discs"] if a_is_black else result["white_discs"]
+        b_discs = result["white_discs"] if a_is_black else result["black_discs"]
+        disc_difference += a_discs - b_discs
+        if a_discs > b_discs:
+            score_a += 1
+        elif b_discs > a_discs:
+            score_b += 1
+        else:
+            score_a += 0.5
+            score_b += 0.5
+
+    total_nodes = sum(result["black_nodes"] + result["white_nodes"] for result in results)
+    total_search_time = sum(result["black_time"] + result["white_time"] for result in results)
+    return {
+        "games": len(results),
+        "workers": workers,
+        "player_a": player_a,
+        "player_b": player_b,
+        "score_a": score_a,
+        "score_b": score_b,
+        "mean_disc_difference_a": disc_difference / len(results) if results else 0.0,
+        "total_nodes": total_nodes,
+        "nodes_per_sec": total_nodes / total_search_time if total_search_time else 0.0,
+        "games_per_sec": len(results) / wall_time if wall_time else 0.0,
+        "wall_time": wall_time,
+    }
+
+
+def run_tournament(games, player_a, player_b, workers=None, random_plies=4, seed=0, endgame_empties=10,
+                   book_path=None, size=8):
+    """
+    Rozgrywa turniej w puli procesów, zamieniając kolory co partię.
+
+    Parameters:
+    games (int): Liczba partii.
+    player_a (str): Specyfikacja pierwszego gracza (czarne w partiach parzystych).
+    player_b (str): Specyfikacja drugiego gracza.
+    workers (int | None): Liczba procesów; domyślnie liczba rdzeni.
+    random_plies (int): Liczba losowych półruchów otwarcia.
+    seed (int): Ziarno turnieju.
+    endgame_empties (int): Próg pustych pól solvera końcówek (0 wyłącza solver).
+    book_path (str | None): Plik księgi otwarć dla graczy AI.
+    size (int): Rozmiar planszy.
+
+    Returns:
+    Tuple[List[dict], dict]: Wyniki poszczególnych partii i podsumowanie.
+    """
+    workers = workers or os.cpu_count()
+    tasks = []
+    for index in range(games):
+        black, white = (player_a, player_b) if index % 2 == 0 else (player_b, player_a)
+        tasks.append((index, black, white, random_plies, seed, endgame_empties, book_path, size))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        results = list(pool.map(play_game, *zip(*tasks), chunksize=max(1, games // (workers * 8))))
+    wall_time = time.perf_counter() - start
+    return results, summarize(results, player_a, player_b, wall_time, workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Turniej AI vs AI w Reversi bez interfejsu")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--black", default="depth:4", help="gracz A (czarne w partiach parzystych)")
+    parser.add_argument("--white", default="depth:2", help="gracz B")
+    parser.add_argument("--workers", type=int, default=None, help="domyślnie liczba rdzeni")
+    parser.add_argument("--random-plies", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--endgame-empties", type=int, default=10, help="0 wyłącza solver końcówek")
+    parser.add_argument("--size", type=int, default=8, help="rozmiar planszy (parzysty, co najmniej 4)")
+    parser.add_argument("--book", help="plik księgi otwarć (opening_book.py) dla graczy AI")
+    parser.add_argument("--csv", help="plik CSV z wynikami poszczególnych partii")
+    parser.add_argument("--json", help="plik JSON z wynikami partii i podsumowaniem")
+    args = parser.parse_args()
+
+    results, summary = run_tournament(args.games, args.black, args.white, args.workers,
+                                      args.random_plies, args.seed, args.endgame_empties, args.book, args.size)
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(results[0].keys()))
+            writer.writeheader()
+            writer.writerows(results)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"summary": summary, "games": results}, file, indent=2)
+
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+import argparse
+import functools
+import time
+
+import numpy as np
+
+import FuzzyBatch
+import FuzzyLogic
+import FuzzyTable
+import Options
+import Rocket
+import Simulation
+
+"""
+Symulacja wielu rakiet naraz w NumPy (struktura tablic).
+
+RocketBatch przechowuje stan N rakiet (x, y, vel_x, vel_y, angleDegrees, fuel, status) w tablicach i wykonuje
+krok fizyki dla wszystkich jednocześnie, według tych samych reguł co Rocket, Simulation.step i Game.update_status.
+Sterownik wsadowy dostaje cały zbiór rakiet i zwraca wyjścia thrust i rotate dla każdej z nich, np.
+table_policy(FuzzyTable.CompiledController.load(...)) albo fuzzy_policy(FuzzyBatch.BatchInference(autopilot_ctrl)).
+
+Uruchomienie (losowe stany początkowe, porównanie z Simulation.run_episodes dla części epizodów):
+    python BatchSimulation.py --rockets 10000 --check 200
+"""
+
+FLYING, SUCCESS, CRASH, TIMEOUT = 0, 1, 2, 3
+# Nazwy statusów jak w Rocket.status i wynikach Simulation.run_episode
+STATUS_NAMES = ("flying", "success", "crash", "timeout")
+
+
+class RocketBatch:
+    def __init__(self, x, y, vel_x=0.0, vel_y=0.0, angle=0.0, fuel=1000.0):
+        """
+        Inicjalizuje zbiór rakiet; każdy parametr to tablica długości N albo liczba wspólna dla wszystkich.
+
+        Parameters:
+        x (np.ndarray | float): Początkowe współrzędne x.
+        y (np.ndarray | float): Początkowe współrzędne y.
+        vel_x (np.ndarray | float): Początkowe prędkości w osi X.
+        vel_y (np.ndarray | float): Początkowe prędkości w osi Y.
+        angle (np.ndarray | float): Początkowe kąty w stopniach.
+        fuel (np.ndarray | float): Początkowe ilości paliwa.
+
+        Attributes:
+        self.status (np.ndarray): Status każdej rakiety (FLYING, SUCCESS, CRASH albo TIMEOUT).
+        self.steps (np.ndarray): Liczba kroków, w których rakieta leciała.
+        self.thrusting (np.ndarray): Czy w ostatnim kroku rakieta włączyła napęd.
+        """
+        x = np.asarray(x, dtype=float)
+        self.x, self.y, self.vel_x, self.vel_y, self.angleDegrees, self.fuel = (
+            np.array(np.broadcast_to(np.asarray(value, dtype=float), x.shape)) for value in (x, y, vel_x, vel_y, angle, fuel))
+        self.status = np.full(x.shape, FLYING, dtype=np.int8)
+        self.steps = np.zeros(x.shape, dtype=np.int64)
+        self.thrusting = np.zeros(x.shape, dtype=bool)
+        # Wymiary rakiety takie jak w Rocket
+        template = Rocket.Rocket(0, 0)
+        self.width = template.width
+        self.height = template.height
+
+    @classmethod
+    def from_starts(cls, starts):
+        """
+        Tworzy zbiór rakiet ze stanów początkowych w postaci argumentów Simulation.make_rocket.
+
+        Parameters:
+        starts (List[dict]): Stany początkowe (np. Simulation.random_starts).
+
+        Returns:
+        RocketBatch: Zbiór rakiet w kolejności stanów.
+        """
+        defaults = {"x": 250, "y": 500, "vel_x": 0, "vel_y": 0, "angle": 0, "fuel": 1000}
+        columns = {key: np.array([start.get(key, default) for start in starts], dtype=float)
+                   for key, default in defaults.items()}
+        return cls(**columns)
+
+    def __len__(self):
+        return len(self.x)
+
+    def select(self, indices):
+        """
+        Tworzy zbiór z kopią stanu wybranych rakiet (np. tylko lecących, dla sterownika).
+
+        Parameters:
+        indices (np.ndarray): Indeksy rakiet.
+
+        Returns:
+        RocketBatch: Nowy zbiór rakiet.
+        """
+        part = RocketBatch.__new__(RocketBatch)
+        part.__dict__.update({name: value[indices] if isinstance(value, np.ndarray) else value
+                              for name, value in self.__dict__.items()})
+        return part
+
+    def get_distance(self, platform):
+        """
+        Oblicza dystans między środkami rakiet a środkiem platformy (jak Landing.get_distance).
+
+        Parameters:
+        platform (LandingPlatform): Obiekt platformy lądowania.
+
+        Returns:
+        Tuple[np.ndarray, np.ndarray]: Dystanse w osi X i Y.
+        """
+        platform_center_x, platform_center_y = platform.get_center_pos()
+        return platform_center_x - (self.x + self.width / 2), platform_center_y - (self.y + self.height / 2)
+
+    def step(self, platform, policy=None, max_steps=None, stop_below_platform=False):
+        """
+        Wykonuje jeden krok fizyki dla wszystkich lecących rakiet w kolejności Simulation.step: grawitacja,
+        zaokrąglone wyjścia sterownika (jak FuzzyLogic.apply_control), ruch i sprawdzenie lądowania.
+        Po max_steps krokach rakiety kończą lot jako TIMEOUT (jak Simulation.run_episode). Sterownik liczony jest
+        tylko dla rakiet, które nadal lecą.
+
+        Parameters:
+        platform (LandingPlatform): Obiekt platformy lądowania.
+        policy (Callable | None): Sterownik wsadowy (batch, platform) -> (thrust, rotate); None oznacza brak sterowania.
+        max_steps (int | None): Limit kroków; None oznacza brak limitu.
+        stop_below_platform (bool): Czy kończyć jako CRASH lot rakiet poniżej platformy (odstępstwo od gry,
+                                    jak w Simulation.run_episode).
+
+        Returns:
+        int: Liczba rakiet, które nadal lecą.
+        """
+        flying = self.status == FLYING
+        self.vel_y[flying] += Options.GRAVITY
+
+        thrust_output = np.zeros(len(self))
+        rotate_output = np.zeros(len(self))
+        if policy is not None:
+            active = np.flatnonzero(flying)
+            thrust_output[active], rotate_output[active] = policy(
+                self.select(active) if len(active) < len(self) else self, platform)
+
+        thrust = flying & (np.rint(thrust_output) > 0)
+        self.thrusting = thrust
+        burn = thrust & (self.fuel > 0)
+        radians = np.radians(self.angleDegrees[burn])
+        self.vel_x[burn] += Options.THRUST * np.sin(radians)
+        self.vel_y[burn] -= Options.THRUST * np.cos(radians)
+        self.fuel[burn] -= Options.FUEL_CONSUMPTION_RATE
+
+        rotate = np.rint(rotate_output)
+        left = flying & (rotate < 0) & (self.angleDegrees > -Options.MAX_ROCKET_ROTATION)
+        right = flying & (rotate > 0) & (self.angleDegrees < Options.MAX_ROCKET_ROTATION)
+        self.angleDegrees[left] -= Options.ROTATION_SPEED
+        self.angleDegrees[right] += Options.ROTATION_SPEED
+
+        self.x[flying] += self.vel_x[flying]
+        self.y[flying] += self.vel_y[flying]
+        self.steps[flying] += 1
+
+        bottom = self.y + self.height // 2
+        on_platform = (flying & (platform.x < self.x) & (self.x < platform.x + platform.width)
+                       & (platform.y < bottom) & (bottom < platform.y + platform.height))
+        safe = ((np.abs(self.vel_x) <= Options.MAX_SAFE_VELOCITY) & (np.abs(self.vel_y) <= Options.MAX_SAFE_VELOCITY)
+                & (np.abs(self.angleDegrees) <= Options.MAX_SAFE_ANGLE))
+        self.status[on_platform & safe] = SUCCESS
+        self.status[on_platform & ~safe] = CRASH
+        if stop_below_platform:
+            self.status[flying & ~on_platform & (bottom >= platform.y + platform.height)] = CRASH
+        if max_steps is not None:
+            self.status[(self.status == FLYING) & (self.steps >= max_steps)] = TIMEOUT
+        return int(np.count_nonzero(self.status == FLYING))
+
+    def results(self):
+        """
+        Zwraca wyniki wszystkich rakiet w postaci wyników Simulation.run_episode (bez trajektorii).
+
+        Returns:
+        List[dict]: Wyniki w kolejności rakiet.
+        """
+        return [{"status": STATUS_NAMES[status], "steps": int(steps), "time": steps / Options.FPS, "x": x, "y": y,
+                 "vel_x": vel_x, "vel_y": vel_y, "angle": angle, "fuel": fuel}
+                for status, steps, x, y, vel_x, vel_y, angle, fuel in zip(
+                    self.status.tolist(), self.steps.tolist(), self.x.tolist(), self.y.tolist(), self.vel_x.tolist(),
+                    self.vel_y.tolist(), self.angleDegrees.tolist(), self.fuel.tolist())]
+
+
+def table_policy(controller):
+    """
+    Tworzy sterownik wsadowy ze skompilowanej tablicy sterownika rozmytego.
+
+    Parameters:
+    controller (FuzzyTable.CompiledController): Skompilowany sterownik.
+
+    Returns:
+    Callable: Funkcja (batch, platform) -> (thrust, rotate) dla wszystkich rakiet.
+    """
+    def policy(batch, platform):
+        distance_x, distance_y = batch.get_distance(platform)
+        outputs = controller.evaluate(np.column_stack((distance_x, distance_y, batch.vel_x, batch.vel_y,
+                                                       batch.angleDegrees)))
+        return outputs["thrust"], outputs["rotate"]
+    return policy
+
+
+def fuzzy_policy(engine):
+    """
+    Tworzy sterownik wsadowy z pełnego wnioskowania rozmytego liczonego na tablicach.
+
+    Parameters:
+    engine (FuzzyBatch.BatchInference): Wsadowe wnioskowanie sterownika.
+
+    Returns:
+    Callable: Funkcja (batch, platform) -> (thrust, rotate) dla wszystkich rakiet.
+    """
+    def policy(batch, platform):
+        distance_x, distance_y = batch.get_distance(platform)
+        outputs = engine.evaluate(np.column_stack((distance_x, distance_y, batch.vel_x, batch.vel_y,
+                                                   batch.angleDegrees)))
+        return outputs["thrust"], outputs["rotate"]
+    return policy
+
+
+def run_batch(policy, batch, platform=None, max_steps=None, stop_below_platform=False):
+    """
+    Symuluje wszystkie rakiety do zakończenia lotu lub przekroczenia limitu kroków.
+
+    Parameters:
+    policy (Callable): Sterownik wsadowy (batch, platform) -> (thrust, rotate).
+    batch (RocketBatch): Zbiór rakiet (modyfikowany w miejscu).
+    platform (LandingPlatform | None): Platforma lądowania; domyślnie Simulation.default_platform().
+    max_steps (int | None): Limit kroków; domyślnie Options.SIMULATION_MAX_STEPS.
+    stop_below_platform (bool): Czy kończyć jako CRASH lot rakiet poniżej platformy (RocketBatch.step).
+
+    Returns:
+    RocketBatch: Ten sam zbiór rakiet po symulacji.
+    """
+    platform = platform or Simulation.default_platform()
+    max_steps = Options.SIMULATION_MAX_STEPS if max_steps is None else max_steps
+    while batch.step(platform, policy, max_steps, stop_below_platform):
+        pass
+    return batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wsadowa symulacja wielu rakiet z autopilotem rozmytym")
+    parser.add_argument("--rockets", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-steps", type=int, default=None)
+    parser.add_argument("--table", default=Options.FUZZY_TABLE_PATH,
+                        help="skompilowana tablica sterownika (FuzzyTable.py); bez pliku pełne wnioskowanie wsadowe")
+    parser.add_argument("--check", type=int, default=0,
+                        help="liczba pierwszych rakiet porównywanych z Simulation.run_episodes")
+    args = parser.parse_args()
+    controller = FuzzyTable.load_compiled(args.table)
+    if controller is not None:
+        batch_policy = table_policy(controller)
+        policy = functools.partial(FuzzyTable.table_control, controller=controller)
+    else:
+        autopilot_ctrl = FuzzyLogic.load_fuzzy_logic()
+        batch_policy = fuzzy_policy(FuzzyBatch.BatchInference(autopilot_ctrl))
+        policy = functools.partial(FuzzyLogic.fuzzy_control, autopilot_ctrl=autopilot_ctrl)
+
+    starts = Simulation.random_starts(args.rockets, args.seed)
+    start = time.perf_counter()
+    batch = run_batch(batch_policy, RocketBatch.from_starts(starts), max_steps=args.max_steps)
+    elapsed = time.perf_counter() - start
+    results = batch.results()
+
+    for key, value in Simulation.summarize(results).items():
+        print(f"{key}: {value:.4g}")
+    print(f"{args.rockets / elapsed * 60:.0f} episodes per minute, {batch.steps.sum() / elapsed:.0f} rocket steps per second")
+
+    if args.check:
+        reference = Simulation.run_episodes(policy, starts[:args.check], args.max_steps)
+        same = sum(result["status"] == expected["status"] and result["steps"] == expected["steps"]
+                   for result, expected in zip(results, reference))
+        print(f"same outcome and length as Simulation.run_episodes: {same}/{args.check}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+import argparse
+import datetime
+import json
+import os
+import platform as system_platform
+import subprocess
+import sys
+import time
+from importlib import metadata
+
+# The suite never opens a window; SDL's dummy driver keeps pygame (imported by Rocket) off the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+import BatchSimulation
+import Evaluation
+import FuzzyLogic
+import Options
+import Simulation
+
+"""
+Zestaw pomiarów wydajności sterowników Moon Lander (bez okna).
+
+Mierzy:
+- czas budowy systemu sterowania rozmytego (FuzzyLogic.setup_fuzzy_logic),
+- czas wywołania FuzzyLogic.fuzzy_control (p50 / p99) na stanach z trajektorii autopilota - ze wspólną symulacją
+  (jak w grze) i z nową symulacją scikit-fuzzy w każdym wywołaniu,
+- liczbę kroków fizyki na sekundę bez sterownika (Simulation.step i BatchSimulation.RocketBatch.step),
+- liczbę epizodów na sekundę z autopilotem (Simulation.run_episodes) dla dostępnych autopilotów (autopilot rozmyty
+  tylko ze skompilowaną tablicą - pełne wnioskowanie trwa minuty na epizod).
+Wyniki zapisywane są do pliku JSON razem z opisem środowiska (commit, wersje Pythona i pakietów, procesor),
+a --compare porównuje je z wcześniejszym plikiem, np. z innego commitu.
+
+Uruchomienie:
+    python Benchmark.py --output benchmark.json
+    python Benchmark.py --output new.json --compare benchmark.json
+"""
+
+# Pakiety, których wersje trafiają do opisu środowiska
+PACKAGES = ("numpy", "scikit-fuzzy", "scipy", "networkx", "pygame")
+# Końcówki nazw wyników porównywanych przez --compare (pozostałe to parametry pomiaru)
+METRIC_SUFFIXES = ("_us", "_ms", "_per_second", "_rate")
+
+
+def percentiles(durations):
+    """
+    Returns:
+    dict: Liczba pomiarów oraz średnia, p50 i p99 czasów w mikrosekundach.
+    """
+    durations = np.asarray(durations) * 1e6
+    return {"count": len(durations), "mean_us": float(durations.mean()),
+            "p50_us": float(np.percentile(durations, 50)), "p99_us": float(np.percentile(durations, 99))}
+
+
+def environment():
+    """
+    Zbiera opis środowiska pomiaru.
+
+    Returns:
+    dict: Czas, commit git (i czy drzewo ma niezapisane zmiany), Python, system, procesor i wersje pakietów.
+    """
+    def git(*args):
+        try:
+            return subprocess.run(("git",) + args, capture_output=True, text=True, timeout=30,
+                                  cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    versions = {}
+    for package in PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+
+    status = git("status", "--porcelain")
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "python": sys.version.split()[0],
+        "implementation": system_platform.python_implementation(),
+        "system": system_platform.platform(),
+        "machine": system_platform.machine(),
+        "processor": system_platform.processor() or None,
+        "cpu_count": os.cpu_count(),
+        "packages": versions,
+        "sdl_video_driver": os.environ.get("SDL_VIDEODRIVER"),
+    }
+
+
+def bench_setup(repeats=5):
+    """
+    Mierzy czas budowy systemu sterowania rozmytego.
+
+    Returns:
+    dict: Najkrótszy i medianowy czas w milisekundach.
+    """
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        FuzzyLogic.setup_fuzzy_logic()
+        durations.append(time.perf_counter() - start)
+    return {"repeats": repeats, "min_ms": min(durations) * 1000, "median_ms": float(np.median(durations)) * 1000}
+
+
+def trajectory_states(count):
+    """
+    Zbiera stany rakiety z lotu autopilota rozmytego ze startu gry (uzupełnione stanami z losowych startów,
+    jeśli epizod jest krótszy).
+
+    Parameters:
+    count (int): Liczba stanów.
+
+    Returns:
+    List[tuple]: Stany w kolejności Simulation.TRAJECTORY_COLUMNS.
+    """
+    controller = Simulation.make_controller("fuzzy")
+    states = []
+    for start in [None] + Simulation.random_starts(count):
+        # Only the missing states are simulated (full fuzzy inference is slow without a compiled table)
+        trajectory = Simulation.run_episode(controller, start, max_steps=count - len(states))["trajectory"]
+        states.extend(map(tuple, trajectory[:-1]))
+        if len(states) >= count:
+            break
+    return states[:count]
+
+
+def bench_fuzzy_control(states):
+    """
+    Mierzy czas wywołania FuzzyLogic.fuzzy_control na podanych stanach (wspólna symulacja, jak w grze) oraz czas
+    tego samego wnioskowania z nową ControlSystemSimulation w każdym wywołaniu.
+
+    Parameters:
+    states (List[tuple]): Stany w kolejności Simulation.TRAJECTORY_COLUMNS.
+
+    Returns:
+    dict: Czasy "shared" i "fresh" (p50 / p99).
+    """
+    autopilot_ctrl = FuzzyLogic.setup_fuzzy_logic()
+    platform = Simulation.default_platform()
+    rocket = Simulation.make_rocket()
+    shared = []
+    for x, y, vel_x, vel_y, angle, fuel, _ in states:
+        rocket.x, rocket.y, rocket.vel_x, rocket.vel_y, rocket.angleDegrees, rocket.fuel = x, y, vel_x, vel_y, angle, fuel
+        start = time.perf_counter()
+        FuzzyLogic.fuzzy_control(rocket, platform, autopilot_ctrl)
+        shared.append(time.perf_counter() - start)
+
+    platform_x, platform_y = platform.get_center_pos()
+    fresh = []
+    for x, y, vel_x, vel_y, angle, _, _ in states:
+        inputs = (platform_x - x - rocket.width / 2, platform_y - y - rocket.height / 2, vel_x, vel_y, angle)
+        start = time.perf_counter()
+        FuzzyLogic.FuzzyAutopilot(autopilot_ctrl).compute(*inputs)
+        fresh.append(time.perf_counter() - start)
+
+    return {"shared": percentiles(shared), "fresh": percentiles(fresh)}
+
+
+def bench_physics(steps=200000, rockets=10000, batch_steps=200):
+    """
+    Mierzy liczbę kroków fizyki na sekundę bez sterownika: Simulation.step dla jednej rakiety (rakieta jest
+    ustawiana od nowa po lądowaniu) i RocketBatch.step dla wielu rakiet naraz.
+
+    Returns:
+    dict: Kroki na sekundę pojedynczej rakiety i kroki rakiet na sekundę w symulacji wsadowej.
+    """
+    platform = Simulation.default_platform()
+    floor = platform.y + platform.height
+    rocket = Simulation.make_rocket(y=0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        Simulation.step(rocket, platform)
+        if rocket.status != "flying" or rocket.y + rocket.height // 2 >= floor:
+            rocket = Simulation.make_rocket(y=0)
+    single = steps / (time.perf_counter() - start)
+
+    batch = BatchSimulation.RocketBatch(np.full(rockets, 250.0), np.full(rockets, -1e6))
+    start = time.perf_counter()
+    for _ in range(batch_steps):
+        batch.step(platform, max_steps=batch_steps + 1)
+    batched = rockets * batch_steps / (time.perf_counter() - start)
+    return {"steps_per_second": single, "batch_rocket_steps_per_second": batched, "batch_rockets": rockets}
+
+
+def bench_episodes(episodes, seed=0):
+    """
+    Mierzy liczbę epizodów na sekundę (Simulation.run_episodes) dla autopilotów dostępnych w tym drzewie.
+    Autopilot rozmyty mierzony jest tylko ze skompilowaną tablicą (FuzzyTable.py), a tablica polityki tylko wtedy,
+    gdy została wyznaczona (PolicyTable.py); pozostałe są pomijane.
+
+    Parameters:
+    episodes (int): Liczba epizodów na autopilota.
+    seed (int): Ziarno stanów początkowych (Evaluation.sample_starts).
+
+    Returns:
+    dict: Nazwa autopilota -> epizody i kroki na sekundę oraz odsetek udanych lądowań albo powód pominięcia.
+    """
+    starts = Evaluation.sample_starts(episodes, seed)
+    results = {}
+    for name in Simulation.CONTROLLERS:
+        if name == "table" and not os.path.exists(Options.POLICY_TABLE_PATH):
+            results[name] = {"skipped": f"{Options.POLICY_TABLE_PATH} not found"}
+            continue
+        controller = Simulation.make_controller(name, live_fallback=False)
+        if controller is None:
+            results[name] = {"skipped": f"no up-to-date {Options.FUZZY_TABLE_PATH}, full fuzzy inference takes "
+                                        f"minutes per episode"}
+            continue
+        start = time.perf_counter()
+        episode_results = Simulation.run_episodes(controller, starts)
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "variant": "compiled" if name == "fuzzy" else "policy",
+            "episodes": episodes,
+            "episodes_per_second": episodes / elapsed,
+            "steps_per_second": sum(result["steps"] for result in episode_results) / elapsed,
+            "success_rate": Simulation.summarize(episode_results)["success_rate"],
+        }
+    return results
+
+
+def flatten(results, prefix=""):
+    """
+    Returns:
+    dict: Wartości liczbowe wyników pod kluczami "sekcja.nazwa" (do porównań).
+    """
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[prefix + key] = value
+    return flat
+
+
+def compare(results, baseline):
+    """
+    Wypisuje zmiany wyników względem wcześniejszego pomiaru.
+
+    Parameters:
+    results (dict): Bieżące wyniki ("results" z pliku JSON).
+    baseline (dict): Wcześniejszy plik JSON.
+    """
+    print(f"Compared with {baseline['environment'].get('commit')} ({baseline['environment'].get('timestamp')})")
+    current, previous = flatten(results), flatten(baseline["results"])
+    for key in sorted(current.keys() & previous.keys()):
+        if key.endswith(METRIC_SUFFIXES) and previous[key]:
+            print(f"  {key}: {previous[key]:.4g} -> {current[key]:.4g} ({current[key] / previous[key] - 1:+.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pomiary wydajności sterowników Moon Lander")
+    parser.add_argument("--setup-repeats", type=int, default=5)
+    parser.add_argument("--states", type=int, default=1000, help="liczba stanów do pomiaru fuzzy_control")
+    parser.add_argument("--physics-steps", type=int, default=200000)
+    parser.add_argument("--episodes", type=int, default=20,
+                        help="epizody na autopilota (autopilot rozmyty tylko ze skompilowaną tablicą)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--compare", default=None, help="wcześniejszy plik JSON do porównania")
+    args = parser.parse_args()
+
+    results = {}
+    results["setup_fuzzy_logic"] = bench_setup(args.setup_repeats)
+    print(f"setup_fuzzy_logic: {results['setup_fuzzy_logic']['median_ms']:.1f} ms")
+    results["fuzzy_control"] = bench_fuzzy_control(trajectory_states(args.states))
+    for variant in ("shared", "fresh"):
+        timing = results["fuzzy_control"][variant]
+        print(f"fuzzy_control ({variant}): p50 {timing['p50_us']:.1f} us, p99 {timing['p99_us']:.1f} us")
+    results["physics"] = bench_physics(args.physics_steps)
+    print(f"physics: {results['physics']['steps_per_second']:.0f} steps/s, "
+          f"batch {results['physics']['batch_rocket_steps_per_second']:.0f} rocket steps/s")
+    results["episodes"] = bench_episodes(args.episodes, args.seed)
+    for name, episode_results in results["episodes"].items():
+        if "skipped" in episode_results:
+            print(f"episodes ({name}): skipped, {episode_results['skipped']}")
+        else:
+            print(f"episodes ({name}, {episode_results['variant']}): "
+                  f"{episode_results['episodes_per_second']:.2f} episodes/s")
+
+    report = {"environment": environment(), "results": results}
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
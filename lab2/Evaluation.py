@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import BatchSimulation
+import FuzzyBatch
+import FuzzyLogic
+import FuzzyTable
+import Options
+import Simulation
+
+"""
+Ocena autopilota metodą Monte-Carlo.
+
+Stany początkowe losowane są wokół startu gry (Rocket(250, 500), prędkość zero), a epizody rozgrywane bez okna
+(BatchSimulation) w puli procesów. Raport podaje odsetek udanych lądowań, zużyte paliwo i czas do lądowania
+oraz przyczyny rozbić: zbyt duża prędkość, zbyt duży kąt przy dotknięciu platformy albo chybienie platformy.
+Chybienie wymaga odstępstwa od gry: rakieta, która spadnie poniżej platformy, kończy epizod jako rozbicie
+(BatchSimulation.run_batch z stop_below_platform=True, jak w FuzzyTuner.py), zamiast spadać do limitu kroków.
+Ten sam seed daje te same stany początkowe i ten sam raport niezależnie od liczby procesów.
+
+Uruchomienie:
+    python Evaluation.py --episodes 5000 --seed 0 --workers 4 --output evaluation.json
+"""
+
+# Rozrzut stanów początkowych wokół startu gry (rozkład jednostajny +- wartość)
+START_X = 250
+START_Y = 500
+START_X_SPREAD = 150
+START_Y_SPREAD = 100
+START_VELOCITY_SPREAD = 1.5
+START_FUEL = 1000
+CRASH_CAUSES = ("velocity", "angle", "velocity_and_angle", "miss")
+
+# Sterownik wsadowy procesu roboczego, ustawiany przez _init_worker
+_worker_policy = None
+
+
+def sample_starts(count, seed=0):
+    """
+    Losuje stany początkowe wokół startu gry.
+
+    Parameters:
+    count (int): Liczba stanów.
+    seed (int): Ziarno losowania.
+
+    Returns:
+    List[dict]: Stany początkowe w postaci argumentów Simulation.make_rocket.
+    """
+    rng = np.random.default_rng(seed)
+    x = START_X + rng.uniform(-START_X_SPREAD, START_X_SPREAD, count)
+    y = START_Y + rng.uniform(-START_Y_SPREAD, START_Y_SPREAD, count)
+    vel_x, vel_y = rng.uniform(-START_VELOCITY_SPREAD, START_VELOCITY_SPREAD, (2, count))
+    return [{"x": float(x[i]), "y": float(y[i]), "vel_x": float(vel_x[i]), "vel_y": float(vel_y[i]),
+             "fuel": START_FUEL} for i in range(count)]
+
+
+def crash_cause(result, platform):
+    """
+    Ustala przyczynę rozbicia na podstawie końcowego stanu rakiety.
+
+    Parameters:
+    result (dict): Wynik epizodu ze statusem "crash".
+    platform (LandingPlatform): Obiekt platformy lądowania.
+
+    Returns:
+    str: "velocity", "angle" albo "velocity_and_angle" dla zbyt szybkiego lub przechylonego dotknięcia platformy,
+         "miss", gdy rakieta minęła platformę.
+    """
+    if not platform.x < result["x"] < platform.x + platform.width:
+        return "miss"
+    too_fast = abs(result["vel_x"]) > Options.MAX_SAFE_VELOCITY or abs(result["vel_y"]) > Options.MAX_SAFE_VELOCITY
+    too_tilted = abs(result["angle"]) > Options.MAX_SAFE_ANGLE
+    if too_fast and too_tilted:
+        return "velocity_and_angle"
+    if too_fast:
+        return "velocity"
+    if too_tilted:
+        return "angle"
+    # Dotknięcie platformy poniżej jej krawędzi (przeskoczenie okna lądowania w jednym kroku)
+    return "miss"
+
+
+def make_policy(table_path=None, params_path=Options.FUZZY_PARAMS_PATH):
+    """
+    Tworzy sterownik wsadowy: skompilowaną tablicę, jeśli podano istniejący plik zgodny z params_path,
+    w przeciwnym razie pełne wnioskowanie wsadowe.
+
+    Parameters:
+    table_path (str | None): Ścieżka tablicy sterownika (FuzzyTable.py).
+    params_path (str): Nastrojone funkcje przynależności (FuzzyTuner.py); bez pliku domyślne.
+
+    Returns:
+    Callable: Sterownik wsadowy (batch, platform) -> (thrust, rotate).
+    """
+    compiled = FuzzyTable.load_compiled(table_path, params_path)
+    if compiled is not None:
+        return BatchSimulation.table_policy(compiled)
+    return BatchSimulation.fuzzy_policy(FuzzyBatch.BatchInference(FuzzyLogic.load_fuzzy_logic(params_path)))
+
+
+def _init_worker(table_path, params_path):
+    global _worker_policy
+    _worker_policy = make_policy(table_path, params_path)
+
+
+def _evaluate_chunk(starts, max_steps):
+    """
+    Rozgrywa epizody dla części stanów początkowych (w procesie roboczym).
+
+    Returns:
+    List[dict]: Wyniki epizodów w kolejności stanów.
+    """
+    batch = BatchSimulation.RocketBatch.from_starts(starts)
+    # Misses end below the platform as crashes, so crash_cause can report them
+    return BatchSimulation.run_batch(_worker_policy, batch, max_steps=max_steps, stop_below_platform=True).results()
+
+
+def run_evaluation(starts, table_path=None, workers=None, chunk_size=1000, max_steps=None,
+                   params_path=Options.FUZZY_PARAMS_PATH):
+    """
+    Rozgrywa epizody dla wszystkich stanów początkowych w puli procesów.
+
+    Parameters:
+    starts (List[dict]): Stany początkowe.
+    table_path (str | None): Tablica sterownika; bez niej pełne wnioskowanie wsadowe.
+    workers (int | None): Liczba procesów; domyślnie liczba rdzeni.
+    chunk_size (int): Liczba epizodów symulowanych razem w jednym procesie.
+    max_steps (int | None): Limit kroków epizodu.
+    params_path (str): Nastrojone funkcje przynależności; bez pliku domyślne.
+
+    Returns:
+    List[dict]: Wyniki epizodów w kolejności stanów.
+    """
+    chunks = [starts[start:start + chunk_size] for start in range(0, len(starts), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(table_path, params_path)) as pool:
+        for chunk_results in pool.map(_evaluate_chunk, chunks, [max_steps] * len(chunks)):
+            results.extend(chunk_results)
+    return results
+
+
+def report(starts, results, platform=None):
+    """
+    Składa raport z wyników epizodów.
+
+    Parameters:
+    starts (List[dict]): Stany początkowe (do liczenia zużytego paliwa).
+    results (List[dict]): Wyniki epizodów w tej samej kolejności.
+    platform (LandingPlatform | None): Platforma lądowania; domyślnie Simulation.default_platform().
+
+    Returns:
+    dict: Odsetki wyników, przyczyny rozbić oraz statystyki paliwa i czasu udanych lądowań.
+    """
+    platform = platform or Simulation.default_platform()
+    count = len(results)
+    summary = {"episodes": count}
+    for status in ("success", "crash", "timeout"):
+        summary[f"{status}_rate"] = sum(result["status"] == status for result in results) / count
+
+    causes = [crash_cause(result, platform) for result in results if result["status"] == "crash"]
+    summary["crash_causes"] = {cause: causes.count(cause) for cause in CRASH_CAUSES}
+
+    landed = [(start, result) for start, result in zip(starts, results) if result["status"] == "success"]
+    fuel_used = np.array([start.get("fuel", START_FUEL) - result["fuel"] for start, result in landed])
+    landing_time = np.array([result["time"] for _, result in landed])
+    for name, values in (("fuel_used", fuel_used), ("time_to_land", landing_time)):
+        summary[name] = ({"mean": float(values.mean()), "median": float(np.median(values)),
+                          "p90": float(np.percentile(values, 90))} if len(values) else None)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ocena autopilota Moon Lander metodą Monte-Carlo")
+    parser.add_argument("--episodes", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="domyślnie liczba rdzeni")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--max-steps", type=int, default=None)
+    parser.add_argument("--table", default=None, help="skompilowana tablica sterownika; domyślnie pełne wnioskowanie")
+    parser.add_argument("--params", default=Options.FUZZY_PARAMS_PATH,
+                        help="nastrojone funkcje przynależności (FuzzyTuner.py); bez pliku domyślne")
+    parser.add_argument("--output", default=None, help="plik JSON z raportem")
+    args = parser.parse_args()
+
+    # A missing or stale table falls back to full inference once here, instead of in every worker
+    table = args.table if FuzzyTable.load_compiled(args.table, args.params) is not None else None
+
+    starts = sample_starts(args.episodes, args.seed)
+    start = time.perf_counter()
+    results = run_evaluation(starts, table, args.workers, args.chunk_size, args.max_steps, args.params)
+    elapsed = time.perf_counter() - start
+
+    summary = report(starts, results)
+    summary["seed"] = args.seed
+    summary["controller"] = table or ("fuzzy: " + args.params if os.path.exists(args.params) else "fuzzy")
+    print(json.dumps(summary, indent=2))
+    print(f"{args.episodes} episodes in {elapsed:.1f} s")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(summary, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
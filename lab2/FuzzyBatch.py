@@ -0,0 +1,246 @@
+import argparse
+import time
+
+import numpy as np
+from skfuzzy import control as ctrl
+from skfuzzy.control.term import Term
+
+import FuzzyLogic
+import FuzzyTable
+
+"""
+Wsadowe wnioskowanie rozmyte dla wielu stanów rakiety naraz.
+
+BatchInference odczytuje z systemu sterowania scikit-fuzzy (FuzzyLogic.setup_fuzzy_logic()) uniwersa, funkcje
+przynależności i reguły, a następnie wykonuje te same kroki co ControlSystemSimulation, ale na tablicach NumPy
+o długości N (liczba stanów):
+- rozmywanie: interpolacja funkcji przynależności w wartościach wejść przyciętych do uniwersum,
+- odpalenie reguł: AND i OR jako funkcje and_func / or_func reguły (domyślnie minimum i maksimum), NOT jako 1 - x,
+- kumulacja: aktywacje reguł o tym samym następniku łączone metodą accumulation_method wyjścia (maksimum),
+- agregacja i defuzyfikacja: uniwersum wyjścia uzupełniane o punkty przecięcia funkcji przynależności z poziomem
+  odcięcia (jak CrispValueCalculator.find_memberships), maksimum obciętych funkcji i dokładny środek ciężkości
+  funkcji liniowej między punktami (jak skfuzzy.defuzz(..., 'centroid')).
+
+Wyniki zgadzają się z scikit-fuzzy z dokładnością do błędów zaokrągleń. Gdy żadna reguła wyjścia nie jest aktywna,
+scikit-fuzzy nie zwraca wartości wyjścia; tu zwracana jest wartość undefined (domyślnie 0, jak w FuzzyTable).
+
+Uruchomienie (porównanie z scikit-fuzzy i pomiar czasu):
+    python FuzzyBatch.py --samples 500 --batch 100000
+"""
+
+
+def trimf(x, a, b, c):
+    """
+    Trójkątna funkcja przynależności liczona jak fuzz.trimf, z parametrami osobnymi dla każdego elementu x.
+
+    Parameters:
+    x (np.ndarray): Wartości (N,).
+    a, b, c (np.ndarray): Parametry trójkąta (N,), a <= b <= c.
+
+    Returns:
+    np.ndarray: Przynależność (N,).
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rising = np.where((a < x) & (x < b), (x - a) / (b - a), 0.0)
+        falling = np.where((b < x) & (x < c), (c - x) / (c - b), 0.0)
+    return np.where(x == b, 1.0, rising + falling)
+
+
+class BatchInference:
+    def __init__(self, autopilot_ctrl):
+        """
+        Przygotowuje wsadowe wnioskowanie dla systemu sterowania.
+
+        Parameters:
+        autopilot_ctrl (ControlSystem): System sterowania rozmytego (FuzzyLogic.setup_fuzzy_logic()).
+
+        Attributes:
+        self.input_names (Tuple[str, ...]): Kolejność kolumn wejść (FuzzyTable.INPUT_NAMES).
+        self.antecedents (dict): Nazwa wejścia -> (uniwersum, {nazwa termu: funkcja przynależności}).
+        self.consequents (dict): Nazwa wyjścia -> (uniwersum, {nazwa termu: funkcja przynależności}, metoda kumulacji).
+        self.rules (list): Krotki (reguła, lista (wyjście, term, waga)).
+        """
+        self.input_names = FuzzyTable.INPUT_NAMES
+        self.antecedents = {variable.label: (variable.universe.astype(float),
+                                             {label: term.mf.astype(float) for label, term in variable.terms.items()})
+                            for variable in autopilot_ctrl.antecedents}
+        self.consequents = {}
+        for variable in autopilot_ctrl.consequents:
+            if variable.defuzzify_method != "centroid":
+                raise ValueError(f"Unsupported defuzzify method for {variable.label}: {variable.defuzzify_method}")
+            self.consequents[variable.label] = (variable.universe.astype(float),
+                                                {label: term.mf.astype(float) for label, term in variable.terms.items()},
+                                                variable.accumulation_method)
+        self.rules = [(rule, [(weighted.term.parent.label, weighted.term.label, weighted.weight)
+                              for weighted in rule.consequent])
+                      for rule in autopilot_ctrl.rules]
+
+    def fuzzify(self, values, triangles=None):
+        """
+        Liczy przynależność każdego stanu do każdego termu wejść.
+
+        Parameters:
+        values (np.ndarray): Tablica (N, len(self.input_names)) wejść.
+        triangles (dict | None): (nazwa wejścia, nazwa termu) -> tablica (N, 3) parametrów [a, b, c] trójkątnej
+                                 funkcji przynależności, osobnych dla każdego stanu (np. różne warianty sterownika
+                                 w jednej symulacji). Jak w scikit-fuzzy funkcja jest próbkowana w punktach
+                                 uniwersum i interpolowana liniowo między nimi.
+
+        Returns:
+        dict: (nazwa wejścia, nazwa termu) -> tablica (N,) przynależności.
+        """
+        memberships = {}
+        for column, name in enumerate(self.input_names):
+            universe, terms = self.antecedents[name]
+            # ControlSystemSimulation przycina wejścia do uniwersum (clip_to_bounds)
+            x = np.clip(values[:, column], universe[0], universe[-1])
+            if triangles is not None:
+                # Sąsiednie punkty uniwersum, między którymi interpolowana jest próbkowana funkcja
+                index = np.clip(np.searchsorted(universe, x, side="right") - 1, 0, len(universe) - 2)
+                lower, upper = universe[index], universe[index + 1]
+                t = (x - lower) / (upper - lower)
+            for label, mf in terms.items():
+                if triangles is not None and (name, label) in triangles:
+                    a, b, c = triangles[(name, label)].T
+                    memberships[(name, label)] = (1 - t) * trimf(lower, a, b, c) + t * trimf(upper, a, b, c)
+                else:
+                    memberships[(name, label)] = np.interp(x, universe, mf, left=0.0, right=0.0)
+        return memberships
+
+    def firing(self, antecedent, memberships, rule):
+        """
+        Liczy stopień spełnienia poprzednika reguły (drzewa termów połączonych AND, OR i NOT).
+
+        Returns:
+        np.ndarray: Tablica (N,) stopni spełnienia.
+        """
+        if isinstance(antecedent, Term):
+            return memberships[(antecedent.parent.label, antecedent.label)]
+        if antecedent.kind == "not":
+            return 1.0 - self.firing(antecedent.term1, memberships, rule)
+        left = self.firing(antecedent.term1, memberships, rule)
+        right = self.firing(antecedent.term2, memberships, rule)
+        return rule.and_func(left, right) if antecedent.kind == "and" else rule.or_func(left, right)
+
+    def cuts(self, values, triangles=None):
+        """
+        Odpala reguły i kumuluje aktywacje w poziomy odcięcia termów wyjść.
+
+        Parameters:
+        values (np.ndarray): Tablica (N, len(self.input_names)) wejść.
+
+        Returns:
+        dict: Nazwa wyjścia -> {nazwa termu: tablica (N,) poziomów odcięcia}; termy, których nie ustawia żadna
+              reguła, są pomijane (jak w scikit-fuzzy).
+        """
+        memberships = self.fuzzify(values, triangles)
+        cuts = {name: {} for name in self.consequents}
+        for rule, consequents in self.rules:
+            activation = self.firing(rule.antecedent, memberships, rule)
+            for output, label, weight in consequents:
+                value = activation * weight
+                previous = cuts[output].get(label)
+                accumulate = self.consequents[output][2]
+                cuts[output][label] = value if previous is None else accumulate(value, previous)
+        return cuts
+
+    def aggregate(self, output, term_cuts):
+        """
+        Buduje zagregowaną funkcję przynależności wyjścia dla każdego stanu.
+
+        Uniwersum każdego stanu to punkty uniwersum wyjścia i punkty, w których funkcja przynależności termu
+        przecina jego poziom odcięcia; w odcinkach bez przecięcia dodawany jest punkt już istniejący (odcinek
+        zerowej szerokości nie zmienia pola ani momentu), więc wszystkie stany mają tyle samo punktów.
+
+        Parameters:
+        output (str): Nazwa wyjścia.
+        term_cuts (dict): Nazwa termu -> tablica (N,) poziomów odcięcia.
+
+        Returns:
+        Tuple[np.ndarray, np.ndarray]: Posortowane punkty uniwersum i wartości zagregowanej funkcji (obie (N, K)).
+        """
+        universe, terms, _ = self.consequents[output]
+        count = len(next(iter(term_cuts.values())))
+        points = [np.broadcast_to(universe, (count, len(universe)))]
+        for label, cut in term_cuts.items():
+            mf = terms[label]
+            cut = cut[:, None]
+            # Jak _interp_universe_fast: przecięcia poziomu 0 liczone dla mf > 0, pozostałe dla mf >= cut
+            above = np.where(cut == 0, mf > 0, mf >= cut)
+            crossing = above[:, :-1] != above[:, 1:]
+            rise = mf[1:] - mf[:-1]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                crossed = universe[:-1] + (cut - mf[:-1]) * (universe[1:] - universe[:-1]) / rise
+            points.append(np.where(crossing, crossed, universe[:-1]))
+        points = np.sort(np.concatenate(points, axis=1), axis=1)
+
+        aggregated = np.zeros_like(points)
+        for label, cut in term_cuts.items():
+            upsampled = np.interp(points, universe, terms[label], left=0.0, right=0.0)
+            np.maximum(aggregated, np.minimum(cut[:, None], upsampled), out=aggregated)
+        return points, aggregated
+
+    def evaluate(self, values, undefined=0.0, triangles=None):
+        """
+        Liczy wyjścia sterownika dla wielu stanów naraz.
+
+        Parameters:
+        values (np.ndarray): Tablica (N, len(self.input_names)) wejść w kolejności FuzzyTable.INPUT_NAMES.
+        undefined (float): Wartość wyjścia w stanach, w których żadna jego reguła nie jest aktywna.
+        triangles (dict | None): Funkcje przynależności wejść osobne dla każdego stanu (patrz fuzzify).
+
+        Returns:
+        dict: Nazwa wyjścia -> tablica (N,) wartości.
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        result = {}
+        for output, term_cuts in self.cuts(values, triangles).items():
+            if not term_cuts:
+                result[output] = np.full(len(values), undefined)
+                continue
+            x, mf = self.aggregate(output, term_cuts)
+            x1, x2, y1, y2 = x[:, :-1], x[:, 1:], mf[:, :-1], mf[:, 1:]
+            width = x2 - x1
+            area = (width * (y1 + y2) / 2).sum(axis=1)
+            moment = (width / 6 * (y1 * (2 * x1 + x2) + y2 * (x1 + 2 * x2))).sum(axis=1)
+            # scikit-fuzzy zgłasza pustą funkcję przynależności, gdy suma jej wartości wynosi 0
+            defined = mf.sum(axis=1) > 0
+            result[output] = np.where(defined, moment / np.where(defined, area, 1.0), undefined)
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wsadowe wnioskowanie rozmyte - zgodność z scikit-fuzzy i czas")
+    parser.add_argument("--samples", type=int, default=500, help="liczba stanów porównywanych z scikit-fuzzy")
+    parser.add_argument("--batch", type=int, default=100000, help="liczba stanów w pomiarze czasu")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    autopilot_ctrl = FuzzyLogic.setup_fuzzy_logic()
+    engine = BatchInference(autopilot_ctrl)
+    rng = np.random.default_rng(args.seed)
+
+    def random_states(count):
+        # Wartości także nieco poza uniwersami, żeby sprawdzić przycinanie
+        return np.column_stack([rng.uniform(engine.antecedents[name][0][0] - 5, engine.antecedents[name][0][-1] + 5,
+                                            count) for name in engine.input_names])
+
+    values = random_states(args.samples)
+    simulation = ctrl.ControlSystemSimulation(autopilot_ctrl)
+    start = time.perf_counter()
+    live = np.array([FuzzyTable.live_outputs(simulation, row) for row in values])
+    live_time = (time.perf_counter() - start) / args.samples
+    batch = engine.evaluate(values)
+    for column, output in enumerate(FuzzyTable.OUTPUT_NAMES):
+        print(f"{output}_max_error: {np.abs(batch[output] - live[:, column]).max():.3g}")
+
+    values = random_states(args.batch)
+    start = time.perf_counter()
+    engine.evaluate(values)
+    batch_time = (time.perf_counter() - start) / args.batch
+    print(f"scikit-fuzzy: {live_time * 1e6:.0f} us per state, batch: {batch_time * 1e6:.2f} us per state "
+          f"({live_time / batch_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,62 @@
+import json
+import os
+import weakref
+
 import numpy as np
 import skfuzzy as fuzz
 from skfuzzy import control as ctrl
+import Landing
 import Options
-import Game
 
 
-def setup_fuzzy_logic():
+# Trójkątne funkcje przynależności wejść [a, b, c] (fuzz.trimf); FuzzyTuner.py stroi te wartości
+MEMBERSHIP = {
+    'velocity_x': {
+        'fast_left': [-10, -4, -2],
+        'slow_left': [-3, -1, 0],
+        'zero': [-1, 0, 1],
+        'slow_right': [0, 1, 3],
+        'fast_right': [2, 4, 10],
+    },
+    'velocity_y': {
+        'fast_up': [-10, -4, -2],
+        'slow_up': [-3, -1, 0],
+        'zero': [-1, 0, 1],
+        'slow_down': [0, 1, 3],
+        'fast_down': [2, 4, 10],
+    },
+    'distance_x': {
+        'far_left': [-600, -400, -100],
+        'close_left': [-100, -50, 3],
+        'zero': [-5, 0, 5],
+        'close_right': [-3, 50, 100],
+        'far_right': [100, 400, 600],
+    },
+    'distance_y': {
+        'far': [100, 300, 600],
+        'close': [-50, 0, 200],
+    },
+    'angle': {
+        'big_left': [-90, -60, -50],
+        'small_left': [-60, -30, -5],
+        'straight': [-10, 0, 10],
+        'small_right': [5, 30, 60],
+        'big_right': [50, 60, 90],
+    },
+}
+
+
+def setup_fuzzy_logic(membership=None):
     """
     Konfiguruje system sterowania rozmytego dla działania autopilota.
     Metoda definiuje rozmyte zmienne wejściowe (distance_x, distance_y, velocity_x, velocity_y, angle) oraz
     wyjściowe (thrust, rotate), a także funkcje przynależności dla każdej zmiennej. Następnie ustanawia reguły
     dla systemu sterowania rozmytego, które mają na celu kierowanie ciągiem i rotacją rakiety w oparciu o stan wejściowy.
 
+    Parameters:
+        membership (dict | None): Funkcje przynależności wejść zastępujące wartości z MEMBERSHIP
+                                  ({wejście: {term: [a, b, c]}}, np. wczytane przez load_membership).
+
     Returns:
         autopilot_ctrl (ControlSystem): Skonfigurowany system sterowania rozmytego dla autopilota rakiety.
     """
@@ -38,34 +83,11 @@ def setup_fuzzy_logic():
     rotate['zero'] = fuzz.trimf(rotate.universe, [0, 0, 0])
     rotate['right'] = fuzz.trimf(rotate.universe, [0, 1, 1])
 
-    velocity_x['fast_left'] = fuzz.trimf(velocity_x.universe, [-10, -4, -2])
-    velocity_x['slow_left'] = fuzz.trimf(velocity_x.universe, [-3, -1, 0])
-    velocity_x['zero'] = fuzz.trimf(velocity_x.universe,      [-1, 0, 1])
-    velocity_x['slow_right'] = fuzz.trimf(velocity_x.universe, [0, 1, 3])
-    velocity_x['fast_right'] = fuzz.trimf(velocity_x.universe, [2, 4, 10])
-
-
-    velocity_y['fast_up'] = fuzz.trimf(velocity_x.universe, [-10, -4, -2])
-    velocity_y['slow_up'] = fuzz.trimf(velocity_x.universe, [-3, -1, 0])
-    velocity_y['zero'] = fuzz.trimf(velocity_x.universe,      [-1, 0, 1])
-    velocity_y['slow_down'] = fuzz.trimf(velocity_x.universe, [0, 1, 3])
-    velocity_y['fast_down'] = fuzz.trimf(velocity_x.universe, [2, 4, 10])
-
-
-    distance_x['far_left'] = fuzz.trimf(distance_x.universe, [-600, -400, -100])
-    distance_x['close_left'] = fuzz.trimf(distance_x.universe, [-100, -50, 3])
-    distance_x['zero'] = fuzz.trimf(distance_x.universe, [-5, 0, 5])
-    distance_x['close_right'] = fuzz.trimf(distance_x.universe, [-3, 50, 100])
-    distance_x['far_right'] = fuzz.trimf(distance_x.universe, [100, 400, 600])
-
-    distance_y['far'] = fuzz.trimf(distance_y.universe, [100, 300, 600])
-    distance_y['close'] = fuzz.trimf(distance_y.universe, [-50, 0, 200])
-
-    angle['big_left'] = fuzz.trimf(angle.universe, [-90, -60, -50])
-    angle['small_left'] = fuzz.trimf(angle.universe, [-60, -30, -5])
-    angle['straight'] = fuzz.trimf(angle.universe, [-10, 0, 10])
-    angle['small_right'] = fuzz.trimf(angle.universe, [5, 30, 60])
-    angle['big_right'] = fuzz.trimf(angle.universe, [50, 60, 90,])
+    # Membership functions of the inputs (default hand-picked values, optionally overridden by a tuned set)
+    params = merge_membership(membership)
+    for variable in (velocity_x, velocity_y, distance_x, distance_y, angle):
+        for label, points in params[variable.label].items():
+            variable[label] = fuzz.trimf(variable.universe, points)
 
     rules = [
 
@@ -144,6 +166,123 @@ def setup_fuzzy_logic():
     return autopilot_ctrl
 
 
+def merge_membership(membership=None):
+    """
+    Uzupełnia funkcje przynależności wejść wartościami domyślnymi z MEMBERSHIP.
+
+    Parameters:
+        membership (dict | None): Funkcje przynależności zastępujące domyślne ({wejście: {term: [a, b, c]}}).
+
+    Returns:
+        dict: Pełne funkcje przynależności, z którymi setup_fuzzy_logic buduje system sterowania.
+    """
+    params = {name: dict(terms) for name, terms in MEMBERSHIP.items()}
+    for name, terms in (membership or {}).items():
+        params[name].update(terms)
+    return params
+
+
+def save_membership(path, membership):
+    """
+    Zapisuje funkcje przynależności wejść do pliku JSON.
+
+    Parameters:
+        path (str): Ścieżka pliku.
+        membership (dict): Funkcje przynależności ({wejście: {term: [a, b, c]}}).
+    """
+    with open(path, 'w') as file:
+        json.dump(membership, file, indent=2)
+
+
+def load_membership(path):
+    """
+    Wczytuje funkcje przynależności wejść zapisane przez save_membership.
+
+    Parameters:
+        path (str): Ścieżka pliku.
+
+    Returns:
+        dict: Funkcje przynależności ({wejście: {term: [a, b, c]}}).
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+def tuned_membership(path=Options.FUZZY_PARAMS_PATH):
+    """
+    Wczytuje nastrojone funkcje przynależności, jeśli plik istnieje.
+
+    Parameters:
+        path (str): Ścieżka pliku zapisanego przez FuzzyTuner.py.
+
+    Returns:
+        dict | None: Funkcje przynależności albo None (domyślne z MEMBERSHIP).
+    """
+    return load_membership(path) if os.path.exists(path) else None
+
+
+def load_fuzzy_logic(path=Options.FUZZY_PARAMS_PATH):
+    """
+    Konfiguruje system sterowania z nastrojonymi funkcjami przynależności, jeśli plik istnieje,
+    a w przeciwnym razie z domyślnymi.
+
+    Parameters:
+        path (str): Ścieżka pliku zapisanego przez FuzzyTuner.py.
+
+    Returns:
+        autopilot_ctrl (ControlSystem): Skonfigurowany system sterowania rozmytego.
+    """
+    return setup_fuzzy_logic(tuned_membership(path))
+
+
+class FuzzyAutopilot:
+    def __init__(self, autopilot_ctrl):
+        """
+        Sterownik rozmyty z jedną, wielokrotnie używaną symulacją (bez budowania jej od nowa w każdej klatce).
+
+        Parameters:
+            autopilot_ctrl (ControlSystem): System sterowania rozmytego (setup_fuzzy_logic()).
+
+        Attributes:
+            self.simulation (ControlSystemSimulation): Symulacja używana do wszystkich obliczeń.
+        """
+        self.simulation = ctrl.ControlSystemSimulation(autopilot_ctrl)
+
+    def compute(self, distance_x, distance_y, velocity_x, velocity_y, angle):
+        """
+        Zwraca wyjścia sterownika dla stanu rakiety. Wejścia nie są zaokrąglane, tak jak w Evaluation.py
+        i BatchSimulation.py.
+
+        Returns:
+            Tuple[float, float]: Wyjścia (thrust, rotate); 0 dla wyjścia, którego żadna reguła nie ustawiła.
+        """
+        for name, value in zip(('distance_x', 'distance_y', 'velocity_x', 'velocity_y', 'angle'),
+                               (distance_x, distance_y, velocity_x, velocity_y, angle)):
+            self.simulation.input[name] = value
+        self.simulation.compute()
+        return float(self.simulation.output.get('thrust', 0.0)), float(self.simulation.output.get('rotate', 0.0))
+
+
+# Sterownik dla każdego systemu sterowania (znika razem z systemem)
+_autopilots = weakref.WeakKeyDictionary()
+
+
+def get_autopilot(autopilot_ctrl):
+    """
+    Zwraca wspólny FuzzyAutopilot dla systemu sterowania, tworząc go przy pierwszym użyciu.
+
+    Parameters:
+        autopilot_ctrl (ControlSystem): System sterowania rozmytego.
+
+    Returns:
+        FuzzyAutopilot: Sterownik z symulacją tego systemu.
+    """
+    autopilot = _autopilots.get(autopilot_ctrl)
+    if autopilot is None:
+        autopilot = _autopilots[autopilot_ctrl] = FuzzyAutopilot(autopilot_ctrl)
+    return autopilot
+
+
 def fuzzy_control(rocket, platform, autopilot_ctrl):
     """
     Wykonuje sterowanie rozmyte rakietą przy użyciu systemu sterowania rozmytego autopilota.
@@ -151,34 +290,41 @@ def fuzzy_control(rocket, platform, autopilot_ctrl):
     Metoda pobiera bieżące dane wejściowe, takie jak odległość w osi X i Y między rakietą a platformą, prędkości w osiach X i Y oraz kąt rakiety.
     Wartości te są wprowadzane do symulacji systemu rozmytego, a następnie obliczane są wyjścia sterujące: załączenie ciągu (thrust) i kierunek obrotu (rotate).
     Wyniki wyjściowe są zaokrąglane i stosowane w celu dostosowania stanu rakiety (np. włączenie ciągu lub obrót rakiety w odpowiednim kierunku).
+    Symulacja jest wspólna dla wszystkich wywołań z tym samym systemem (get_autopilot).
 
     Parameters:
         rocket (Rocket): Obiekt rakiety, który ma być sterowany.
         platform (Platform): Obiekt platformy lądowania używany do określenia odległości.
         autopilot_ctrl (ControlSystem): System sterowania rozmytego skonfigurowany wcześniej do sterowania autopilotem rakiety.
+
+    Returns:
+        Tuple[float, float]: Wyjścia thrust i rotate sterownika przed zaokrągleniem (np. do zapisu przebiegu w Replay.py).
     """
 
-    distance_x_input, distance_y_input = Game.get_distance(rocket, platform)
+    distance_x_input, distance_y_input = Landing.get_distance(rocket, platform)
     velocity_x_input = rocket.vel_x
     velocity_y_input = rocket.vel_y
     angle_input = rocket.angleDegrees
 
-    # Create control system
-    autopilot_simulation = ctrl.ControlSystemSimulation(autopilot_ctrl)
+    # Compute the fuzzy output (shared simulation)
+    thrust_output, rotate_output = get_autopilot(autopilot_ctrl).compute(distance_x_input, distance_y_input,
+                                                                        velocity_x_input, velocity_y_input,
+                                                                        angle_input)
 
-    # Input values
-    autopilot_simulation.input['distance_x'] = distance_x_input
-    autopilot_simulation.input['distance_y'] = distance_y_input
-    autopilot_simulation.input['velocity_x'] = velocity_x_input
-    autopilot_simulation.input['velocity_y'] = velocity_y_input
-    autopilot_simulation.input['angle'] = angle_input
+    apply_control(rocket, thrust_output, rotate_output)
+    return thrust_output, rotate_output
 
-    # Compute the fuzzy output
-    autopilot_simulation.compute()
 
-    thrust_output = autopilot_simulation.output['thrust']
-    rotate_output = autopilot_simulation.output['rotate']
+def apply_control(rocket, thrust_output, rotate_output):
+    """
+    Zaokrągla wyjścia sterownika i stosuje je do rakiety (włączenie ciągu, obrót w lewo lub w prawo).
+    Wspólne dla sterowania pełnym wnioskowaniem (fuzzy_control) i tablicą (FuzzyTable.table_control).
 
+    Parameters:
+        rocket (Rocket): Obiekt rakiety, który ma być sterowany.
+        thrust_output (float): Wyjście thrust sterownika.
+        rotate_output (float): Wyjście rotate sterownika.
+    """
     rounded_thrust_output = int(round(thrust_output, 0))
     rounded_rotate_output = int(round(rotate_output, 0))
 
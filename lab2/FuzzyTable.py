@@ -0,0 +1,450 @@
+import argparse
+import bisect
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from skfuzzy import control as ctrl
+from skfuzzy.control.controlsystem import CrispValueCalculator
+
+import FuzzyLogic
+import Landing
+import Options
+
+"""
+Skompilowana tablica sterownika rozmytego autopilota.
+
+Pełne wnioskowanie scikit-fuzzy (ponad 40 reguł) kosztuje milisekundy na klatkę. Krok "kompilacji"
+przelicza sterownik na siatce wartości wejść, a w trakcie gry wyjścia są odczytywane interpolacją
+wieloliniową w NumPy - mikrosekundy na klatkę.
+
+Wyjście sterownika to środek ciężkości (centroid) zagregowanej funkcji przynależności, czyli iloraz
+momentu i pola pod nią. Sam iloraz jest nieciągły na granicy obszaru, w którym żadna reguła nie jest
+aktywna (pole spada do zera, a wynik skacze), więc tablice przechowują osobno pole i moment - obie
+wielkości są ciągłe - a wyjście liczone jest z ich interpolacji. Gdy pole wynosi zero, scikit-fuzzy
+nie zwraca wartości wyjścia; tablica przyjmuje wtedy 0 (brak ciągu, brak obrotu).
+
+Każde wyjście zależy tylko od wejść występujących w regułach, które je ustawiają (rotate od distance_x,
+velocity_x i angle, thrust od angle, velocity_y i distance_y), więc zamiast jednej siatki pięciowymiarowej
+kompilowane są dwie trójwymiarowe. Węzły siatki leżą w punktach załamania funkcji przynależności,
+a każdy przedział między nimi dzielony jest na kilka części.
+
+Uruchomienie (kompilacja, zapis i raport błędu względem scikit-fuzzy):
+    python FuzzyTable.py --subdivisions 2 --samples 300 --output fuzzy_table.npz
+"""
+
+# Kolejność wejść w tablicach przekazywanych do CompiledController.evaluate
+INPUT_NAMES = ("distance_x", "distance_y", "velocity_x", "velocity_y", "angle")
+OUTPUT_NAMES = ("thrust", "rotate")
+# Pole poniżej tej wartości traktowane jest jako brak aktywnych reguł
+MIN_AREA = 1e-12
+
+
+def area_moment(universe, mf):
+    """
+    Liczy dokładnie pole i moment (całkę x * mf) funkcji przynależności liniowej między punktami uniwersum.
+
+    Parameters:
+    universe (np.ndarray): Punkty uniwersum.
+    mf (np.ndarray): Wartości funkcji przynależności.
+
+    Returns:
+    Tuple[float, float]: Pole i moment; ich iloraz to centroid (jak skfuzzy.defuzz(..., 'centroid')).
+    """
+    x1, x2, y1, y2 = universe[:-1], universe[1:], mf[:-1], mf[1:]
+    width = x2 - x1
+    area = (width * (y1 + y2) / 2).sum()
+    moment = (width / 6 * (y1 * (2 * x1 + x2) + y2 * (x1 + 2 * x2))).sum()
+    return float(area), float(moment)
+
+
+def live_area_moments(simulation, values):
+    """
+    Wykonuje pełne wnioskowanie scikit-fuzzy i zwraca pole i moment zagregowanej funkcji
+    przynależności każdego wyjścia.
+
+    Parameters:
+    simulation (ControlSystemSimulation): Symulacja sterownika.
+    values (Sequence[float]): Wartości wejść w kolejności INPUT_NAMES.
+
+    Returns:
+    dict: Nazwa wyjścia -> (pole, moment); (0, 0), gdy żadna reguła wyjścia nie jest aktywna.
+    """
+    for name, value in zip(INPUT_NAMES, values):
+        simulation.input[name] = value
+    simulation.compute()
+    result = {}
+    for consequent in simulation.ctrl.consequents:
+        # Ta sama agregacja, której scikit-fuzzy używa przed defuzyfikacją
+        universe, mf, term_mfs = CrispValueCalculator(consequent, simulation).find_memberships()
+        result[consequent.label] = area_moment(universe, mf) if term_mfs else (0.0, 0.0)
+    return result
+
+
+def live_outputs(simulation, values):
+    """
+    Liczy wyjścia sterownika pełnym wnioskowaniem scikit-fuzzy.
+
+    Parameters:
+    simulation (ControlSystemSimulation): Symulacja sterownika.
+    values (Sequence[float]): Wartości wejść w kolejności INPUT_NAMES.
+
+    Returns:
+    Tuple[float, float]: Wyjścia (thrust, rotate); 0 dla wyjścia, którego żadna reguła nie ustawiła.
+    """
+    for name, value in zip(INPUT_NAMES, values):
+        simulation.input[name] = value
+    simulation.compute()
+    return tuple(float(simulation.output.get(name, 0.0)) for name in OUTPUT_NAMES)
+
+
+def rule_inputs(autopilot_ctrl):
+    """
+    Wyznacza, od których wejść zależy każde wyjście (wejścia z reguł ustawiających to wyjście).
+
+    Parameters:
+    autopilot_ctrl (ControlSystem): System sterowania rozmytego.
+
+    Returns:
+    dict: Nazwa wyjścia -> krotka nazw wejść w kolejności INPUT_NAMES.
+    """
+    used = {name: set() for name in OUTPUT_NAMES}
+    for rule in autopilot_ctrl.rules:
+        inputs = {term.parent.label for term in rule.antecedent_terms}
+        for consequent in rule.consequent:
+            used[consequent.term.parent.label] |= inputs
+    return {output: tuple(name for name in INPUT_NAMES if name in inputs) for output, inputs in used.items()}
+
+
+def grid_axis(antecedent, subdivisions):
+    """
+    Wyznacza węzły siatki dla jednego wejścia: końce uniwersum i punkty załamania wszystkich
+    funkcji przynależności, z każdym przedziałem podzielonym na subdivisions części.
+
+    Parameters:
+    antecedent (Antecedent): Zmienna wejściowa sterownika.
+    subdivisions (int): Liczba części, na które dzielony jest przedział między punktami załamania.
+
+    Returns:
+    np.ndarray: Rosnące węzły siatki.
+    """
+    universe = antecedent.universe.astype(float)
+    knots = {universe[0], universe[-1]}
+    for term in antecedent.terms.values():
+        bends = np.nonzero(np.abs(np.diff(term.mf, 2)) > 1e-12)[0] + 1
+        knots.update(universe[bends])
+    knots = np.array(sorted(knots))
+    steps = np.linspace(0, 1, subdivisions + 1)[:-1]
+    return np.append((knots[:-1, None] + np.diff(knots)[:, None] * steps).ravel(), knots[-1])
+
+
+# Stan procesu roboczego kompilacji, ustawiany przez _init_compile_worker
+_worker_simulation = None
+
+
+def _init_compile_worker(autopilot_ctrl):
+    global _worker_simulation
+    _worker_simulation = ctrl.ControlSystemSimulation(autopilot_ctrl)
+
+
+def _compile_points(points):
+    """
+    Liczy pola i momenty wyjść w liście punktów siatki (w procesie roboczym).
+
+    Returns:
+    List[dict]: Wyniki live_area_moments dla kolejnych punktów.
+    """
+    return [live_area_moments(_worker_simulation, values) for values in points]
+
+
+class CompiledController:
+    def __init__(self, axes, inputs, areas, moments, membership=None):
+        """
+        Inicjalizuje sterownik odczytujący wyjścia z przeliczonych tablic.
+
+        Parameters:
+        axes (dict): Nazwa wejścia -> węzły siatki (np.ndarray).
+        inputs (dict): Nazwa wyjścia -> krotka nazw wejść, od których zależy.
+        areas (dict): Nazwa wyjścia -> tablica pól zagregowanej funkcji przynależności w węzłach siatki.
+        moments (dict): Nazwa wyjścia -> tablica momentów w węzłach siatki.
+        membership (dict | None): Pełne funkcje przynależności wejść, z którymi skompilowano tablice
+                                  (FuzzyLogic.merge_membership); None - nieznane.
+        """
+        self.axes = axes
+        self.inputs = inputs
+        self.areas = areas
+        self.moments = moments
+        self.membership = membership
+        self.columns = {output: [INPUT_NAMES.index(name) for name in names] for output, names in inputs.items()}
+        # Dane dla compute(): osie jako listy, kroki indeksów i spłaszczone tablice (pole, moment) węzłów
+        self.scalar = {}
+        for output in OUTPUT_NAMES:
+            shape = areas[output].shape
+            strides = [int(np.prod(shape[axis + 1:])) for axis in range(len(shape))]
+            corners = [sum(offset * stride for offset, stride in zip(corner, strides))
+                       for corner in itertools.product((0, 1), repeat=len(shape))]
+            nodes = list(zip(areas[output].ravel().tolist(), moments[output].ravel().tolist()))
+            self.scalar[output] = ([axes[name].tolist() for name in inputs[output]], strides, corners, nodes)
+
+    @classmethod
+    def compile(cls, autopilot_ctrl, subdivisions=2, workers=None, verbose=False, membership=None):
+        """
+        Przelicza sterownik pełnym wnioskowaniem scikit-fuzzy we wszystkich węzłach siatek, w puli procesów.
+        Jedno wnioskowanie daje oba wyjścia, więc węzły siatek thrust i rotate liczone są parami.
+
+        Parameters:
+        autopilot_ctrl (ControlSystem): System sterowania rozmytego (FuzzyLogic.setup_fuzzy_logic()).
+        subdivisions (int): Podział przedziałów między punktami załamania (gęstość siatki).
+        workers (int | None): Liczba procesów; domyślnie liczba rdzeni.
+        verbose (bool): Czy wypisywać postęp.
+        membership (dict | None): Funkcje przynależności, z którymi zbudowano autopilot_ctrl
+                                  (FuzzyLogic.setup_fuzzy_logic); zapisywane razem z tablicami.
+
+        Returns:
+        CompiledController: Skompilowany sterownik.
+        """
+        antecedents = {variable.label: variable for variable in autopilot_ctrl.antecedents}
+        axes = {name: grid_axis(antecedents[name], subdivisions) for name in INPUT_NAMES}
+        inputs = rule_inputs(autopilot_ctrl)
+        shapes = {output: tuple(len(axes[name]) for name in inputs[output]) for output in OUTPUT_NAMES}
+        indices = {output: list(np.ndindex(*shapes[output])) for output in OUTPUT_NAMES}
+
+        points = []
+        for step in range(max(len(output_indices) for output_indices in indices.values())):
+            values = {name: axes[name][0] for name in INPUT_NAMES}
+            for output in OUTPUT_NAMES:
+                if step < len(indices[output]):
+                    values.update(zip(inputs[output],
+                                      (axes[name][i] for name, i in zip(inputs[output], indices[output][step]))))
+            points.append([values[name] for name in INPUT_NAMES])
+
+        workers = workers or os.cpu_count()
+        chunk = max(1, len(points) // (workers * 16))
+        chunks = [points[start:start + chunk] for start in range(0, len(points), chunk)]
+        results = []
+        with ProcessPoolExecutor(workers, initializer=_init_compile_worker, initargs=(autopilot_ctrl,)) as pool:
+            for chunk_results in pool.map(_compile_points, chunks):
+                results.extend(chunk_results)
+                if verbose:
+                    print(f"compiled {len(results)}/{len(points)} grid points")
+
+        areas = {output: np.zeros(shapes[output]) for output in OUTPUT_NAMES}
+        moments = {output: np.zeros(shapes[output]) for output in OUTPUT_NAMES}
+        for output in OUTPUT_NAMES:
+            for index, result in zip(indices[output], results):
+                areas[output][index], moments[output][index] = result[output]
+        return cls(axes, inputs, areas, moments, FuzzyLogic.merge_membership(membership))
+
+    def evaluate(self, values):
+        """
+        Odczytuje wyjścia dla wielu stanów naraz interpolacją wieloliniową pola i momentu.
+        Wartości spoza siatki są przycinane do jej zakresu (jak wejścia w scikit-fuzzy).
+
+        Parameters:
+        values (np.ndarray): Tablica (N, 5) wejść w kolejności INPUT_NAMES.
+
+        Returns:
+        dict: Nazwa wyjścia -> tablica (N,) wartości.
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        result = {}
+        for output in OUTPUT_NAMES:
+            _, strides, corners, _ = self.scalar[output]
+            flat = np.zeros(len(values), dtype=np.intp)
+            weights = np.ones((len(values), len(corners)))
+            for axis_number, (name, column) in enumerate(zip(self.inputs[output], self.columns[output])):
+                axis = self.axes[name]
+                x = np.clip(values[:, column], axis[0], axis[-1])
+                index = np.clip(np.searchsorted(axis, x, side="right") - 1, 0, len(axis) - 2)
+                t = (x - axis[index]) / (axis[index + 1] - axis[index])
+                flat += index * strides[axis_number]
+                # Bit osi w numerze narożnika (kolejność jak w itertools.product)
+                upper = (np.arange(len(corners)) >> (len(strides) - 1 - axis_number)) & 1
+                weights *= np.where(upper, t[:, None], 1 - t[:, None])
+            nodes = flat[:, None] + np.array(corners)
+            area = (self.areas[output].ravel()[nodes] * weights).sum(axis=1)
+            moment = (self.moments[output].ravel()[nodes] * weights).sum(axis=1)
+            defined = area > MIN_AREA
+            result[output] = np.where(defined, moment / np.where(defined, area, 1.0), 0.0)
+        return result
+
+    def compute(self, distance_x, distance_y, velocity_x, velocity_y, angle):
+        """
+        Odczytuje wyjścia dla jednego stanu rakiety (ta sama interpolacja co evaluate,
+        liczona na listach bez narzutu tablic NumPy, dla dowolnej liczby wejść każdego wyjścia).
+
+        Returns:
+        Tuple[float, float]: Wyjścia (thrust, rotate).
+        """
+        values = (distance_x, distance_y, velocity_x, velocity_y, angle)
+        outputs = []
+        for output in OUTPUT_NAMES:
+            axes, strides, corners, nodes = self.scalar[output]
+            base = 0
+            # Corner weights in itertools.product order (first input is the most significant bit)
+            weights = [1.0]
+            for axis, stride, column in zip(axes, strides, self.columns[output]):
+                x = min(max(values[column], axis[0]), axis[-1])
+                index = min(max(bisect.bisect_right(axis, x) - 1, 0), len(axis) - 2)
+                base += index * stride
+                t = (x - axis[index]) / (axis[index + 1] - axis[index])
+                weights = [product for weight in weights for product in (weight * (1 - t), weight * t)]
+            area = moment = 0.0
+            for weight, offset in zip(weights, corners):
+                node_area, node_moment = nodes[base + offset]
+                area += weight * node_area
+                moment += weight * node_moment
+            outputs.append(moment / area if area > MIN_AREA else 0.0)
+        return tuple(outputs)
+
+    def error_report(self, autopilot_ctrl, samples=500, seed=0):
+        """
+        Porównuje tablicę z pełnym wnioskowaniem scikit-fuzzy w losowych stanach (poza węzłami siatki).
+        Kąt losowany jest z wielokrotności Options.ROTATION_SPEED, bo tylko takie występują w grze.
+
+        Parameters:
+        autopilot_ctrl (ControlSystem): System sterowania rozmytego.
+        samples (int): Liczba losowych stanów.
+        seed (int): Ziarno losowania.
+
+        Returns:
+        dict: Maksymalny i średni błąd bezwzględny każdego wyjścia, odsetek stanów, w których zaokrąglona
+              decyzja (jak w FuzzyLogic.apply_control) jest inna, oraz czasy na wywołanie w mikrosekundach.
+        """
+        rng = np.random.default_rng(seed)
+        values = np.column_stack([rng.uniform(self.axes[name][0], self.axes[name][-1], samples)
+                                  for name in INPUT_NAMES])
+        angle_axis = self.axes["angle"]
+        step = Options.ROTATION_SPEED
+        values[:, INPUT_NAMES.index("angle")] = rng.choice(np.arange(angle_axis[0], angle_axis[-1] + step / 2, step),
+                                                           samples)
+
+        simulation = ctrl.ControlSystemSimulation(autopilot_ctrl)
+        start = time.perf_counter()
+        live = np.array([live_outputs(simulation, row) for row in values])
+        live_time = (time.perf_counter() - start) / samples
+
+        rows = values.tolist()
+        start = time.perf_counter()
+        for row in rows:
+            self.compute(*row)
+        table_time = (time.perf_counter() - start) / samples
+        start = time.perf_counter()
+        compiled = self.evaluate(values)
+        batch_time = (time.perf_counter() - start) / samples
+
+        report = {"samples": samples}
+        for column, output in enumerate(OUTPUT_NAMES):
+            error = np.abs(compiled[output] - live[:, column])
+            report[f"{output}_max_error"] = float(error.max())
+            report[f"{output}_mean_error"] = float(error.mean())
+            mismatch = np.rint(compiled[output]) != np.rint(live[:, column])
+            report[f"{output}_decision_mismatch"] = float(mismatch.mean())
+        report["live_us_per_call"] = live_time * 1e6
+        report["table_us_per_call"] = table_time * 1e6
+        report["batch_us_per_state"] = batch_time * 1e6
+        return report
+
+    def save(self, path):
+        """
+        Zapisuje siatki i tablice do pliku .npz.
+
+        Parameters:
+        path (str): Ścieżka pliku.
+        """
+        arrays = {f"axis_{name}": axis for name, axis in self.axes.items()}
+        for output in OUTPUT_NAMES:
+            arrays[f"area_{output}"] = self.areas[output]
+            arrays[f"moment_{output}"] = self.moments[output]
+            arrays[f"inputs_{output}"] = np.array(self.inputs[output])
+        if self.membership is not None:
+            arrays["membership"] = np.array(json.dumps(self.membership, sort_keys=True))
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Wczytuje sterownik zapisany metodą save.
+
+        Parameters:
+        path (str): Ścieżka pliku .npz.
+
+        Returns:
+        CompiledController: Wczytany sterownik.
+        """
+        with np.load(path) as data:
+            axes = {name: data[f"axis_{name}"] for name in INPUT_NAMES}
+            inputs = {output: tuple(str(name) for name in data[f"inputs_{output}"]) for output in OUTPUT_NAMES}
+            areas = {output: data[f"area_{output}"] for output in OUTPUT_NAMES}
+            moments = {output: data[f"moment_{output}"] for output in OUTPUT_NAMES}
+            membership = json.loads(str(data["membership"])) if "membership" in data else None
+        return cls(axes, inputs, areas, moments, membership)
+
+
+def load_compiled(path, params_path=Options.FUZZY_PARAMS_PATH):
+    """
+    Wczytuje skompilowany sterownik, jeśli plik istnieje i został skompilowany z tymi samymi funkcjami
+    przynależności, z którymi FuzzyLogic.load_fuzzy_logic(params_path) buduje pełne wnioskowanie.
+
+    Parameters:
+    path (str | None): Ścieżka pliku .npz.
+    params_path (str): Nastrojone funkcje przynależności (FuzzyTuner.py); bez pliku domyślne.
+
+    Returns:
+    CompiledController | None: Wczytany sterownik albo None, gdy pliku nie ma lub tablica jest nieaktualna.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    controller = CompiledController.load(path)
+    if controller.membership != FuzzyLogic.merge_membership(FuzzyLogic.tuned_membership(params_path)):
+        print(f"Warning: {path} was not compiled with the current membership functions ({params_path} or defaults), "
+              f"using full fuzzy inference (recompile with python FuzzyTable.py)")
+        return None
+    return controller
+
+
+def table_control(rocket, platform, controller):
+    """
+    Steruje rakietą jak FuzzyLogic.fuzzy_control, ale wyjścia odczytuje ze skompilowanej tablicy.
+
+    Parameters:
+    rocket (Rocket): Obiekt rakiety, który ma być sterowany.
+    platform (LandingPlatform): Obiekt platformy lądowania używany do określenia odległości.
+    controller (CompiledController): Skompilowany sterownik.
+
+    Returns:
+    Tuple[float, float]: Wyjścia thrust i rotate sterownika przed zaokrągleniem.
+    """
+    distance_x, distance_y = Landing.get_distance(rocket, platform)
+    thrust_output, rotate_output = controller.compute(distance_x, distance_y, rocket.vel_x, rocket.vel_y,
+                                                      rocket.angleDegrees)
+    FuzzyLogic.apply_control(rocket, thrust_output, rotate_output)
+    return thrust_output, rotate_output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kompilacja sterownika rozmytego autopilota do tablicy")
+    parser.add_argument("--subdivisions", type=int, default=2, help="podział przedziałów między punktami załamania")
+    parser.add_argument("--workers", type=int, default=None, help="domyślnie liczba rdzeni")
+    parser.add_argument("--samples", type=int, default=300, help="liczba losowych stanów w raporcie błędu")
+    parser.add_argument("--output", default=Options.FUZZY_TABLE_PATH)
+    args = parser.parse_args()
+
+    membership = FuzzyLogic.tuned_membership()
+    autopilot_ctrl = FuzzyLogic.setup_fuzzy_logic(membership)
+    start = time.perf_counter()
+    controller = CompiledController.compile(autopilot_ctrl, args.subdivisions, args.workers, membership=membership)
+    print(f"Compiled in {time.perf_counter() - start:.1f} s, "
+          + ", ".join(f"{output}: {table.shape}" for output, table in controller.areas.items()))
+    controller.save(args.output)
+    print(f"Saved to {args.output}")
+
+    for key, value in controller.error_report(autopilot_ctrl, args.samples).items():
+        print(f"{key}: {value:.4g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import BatchSimulation
+import Evaluation
+import FuzzyBatch
+import FuzzyLogic
+import Options
+import Simulation
+
+"""
+Automatyczne strojenie funkcji przynależności autopilota rozmytego.
+
+Strojone są parametry [a, b, c] wszystkich trójkątnych funkcji przynależności wejść (FuzzyLogic.MEMBERSHIP);
+reguły i wyjścia pozostają bez zmian. Przeszukiwanie prowadzi CMA-ES (Covariance Matrix Adaptation Evolution
+Strategy) w NumPy, w przestrzeni parametrów znormalizowanych rozpiętością uniwersum każdego wejścia.
+
+Każde pokolenie jest oceniane jedną symulacją wsadową (BatchSimulation): wszystkie warianty sterownika z populacji
+lecą naraz z tych samych stanów początkowych, a funkcje przynależności są osobne dla każdej rakiety
+(FuzzyBatch.BatchInference.evaluate(..., triangles=...)), więc koszt pokolenia to kilkaset kroków wsadowych zamiast
+wnioskowania scikit-fuzzy dla każdej rakiety. Populacja może być dzielona między procesy.
+
+Na koniec środek rozkładu i najlepszy wariant są sprawdzane na osobnych stanach początkowych razem z domyślnymi
+funkcjami przynależności, a lepszy z nich zapisywany jest do pliku JSON, który Game.main wczytuje
+(FuzzyLogic.load_fuzzy_logic).
+
+Uruchomienie:
+    python FuzzyTuner.py --generations 200 --population 16 --episodes 32 --workers 4
+"""
+
+# Strojone termy wejść w kolejności parametrów
+TERMS = [(name, label) for name, terms in FuzzyLogic.MEMBERSHIP.items() for label in terms]
+# Ocena epizodu bez lądowania: premia za zbliżenie się do platformy (do tej odległości w pikselach)
+CLOSE_DISTANCE = 400
+# Ocena rozbicia na platformie (lepsze niż chybienie albo zawiśnięcie w powietrzu)
+PLATFORM_CRASH_SCORE = 0.25
+
+# Stan procesu roboczego, ustawiany przez _init_worker
+_worker_engine = None
+
+
+class CMAES:
+    def __init__(self, mean, sigma, population, seed=0):
+        """
+        Inicjalizuje strategię ewolucyjną CMA-ES (maksymalizacja oceny).
+
+        Parameters:
+        mean (np.ndarray): Początkowy środek rozkładu (n,).
+        sigma (float): Początkowy krok.
+        population (int): Liczba wariantów w pokoleniu.
+        seed (int): Ziarno losowania.
+
+        Attributes:
+        self.mean (np.ndarray): Bieżący środek rozkładu.
+        self.sigma (float): Bieżący krok.
+        self.covariance (np.ndarray): Macierz kowariancji (n, n).
+        self.generation (int): Liczba zakończonych pokoleń.
+        """
+        n = len(mean)
+        self.mean = np.array(mean, dtype=float)
+        self.sigma = sigma
+        self.population = population
+        self.rng = np.random.default_rng(seed)
+        self.generation = 0
+
+        self.mu = population // 2
+        weights = np.log(self.mu + 0.5) - np.log(np.arange(1, self.mu + 1))
+        self.weights = weights / weights.sum()
+        self.mueff = 1 / np.sum(self.weights ** 2)
+
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(1 - self.c1, 2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff))
+        self.damps = 1 + 2 * max(0.0, np.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chi_n = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+
+        self.pc = np.zeros(n)
+        self.ps = np.zeros(n)
+        self.covariance = np.eye(n)
+        self.basis = np.eye(n)
+        self.scales = np.ones(n)
+
+    def ask(self):
+        """
+        Losuje warianty nowego pokolenia.
+
+        Returns:
+        np.ndarray: Tablica (population, n) wariantów.
+        """
+        z = self.rng.standard_normal((self.population, len(self.mean)))
+        self.steps = z * self.scales @ self.basis.T
+        return self.mean + self.sigma * self.steps
+
+    def tell(self, fitness):
+        """
+        Aktualizuje rozkład na podstawie ocen wariantów z ostatniego ask().
+
+        Parameters:
+        fitness (np.ndarray): Oceny wariantów (większa lepsza).
+        """
+        n = len(self.mean)
+        best = np.argsort(-np.asarray(fitness))[:self.mu]
+        step = self.weights @ self.steps[best]
+        self.mean = self.mean + self.sigma * step
+
+        inverse_sqrt = self.basis @ np.diag(1 / self.scales) @ self.basis.T
+        self.ps = (1 - self.cs) * self.ps + np.sqrt(self.cs * (2 - self.cs) * self.mueff) * inverse_sqrt @ step
+        self.generation += 1
+        hsig = (np.linalg.norm(self.ps) / np.sqrt(1 - (1 - self.cs) ** (2 * self.generation)) / self.chi_n
+                < 1.4 + 2 / (n + 1))
+        self.pc = (1 - self.cc) * self.pc + hsig * np.sqrt(self.cc * (2 - self.cc) * self.mueff) * step
+
+        rank_mu = (self.steps[best].T * self.weights) @ self.steps[best]
+        self.covariance = ((1 - self.c1 - self.cmu) * self.covariance
+                           + self.c1 * (np.outer(self.pc, self.pc) + (1 - hsig) * self.cc * (2 - self.cc) * self.covariance)
+                           + self.cmu * rank_mu)
+        self.sigma *= np.exp(self.cs / self.damps * (np.linalg.norm(self.ps) / self.chi_n - 1))
+
+        self.covariance = np.triu(self.covariance) + np.triu(self.covariance, 1).T
+        eigenvalues, self.basis = np.linalg.eigh(self.covariance)
+        self.scales = np.sqrt(np.maximum(eigenvalues, 1e-20))
+
+
+def parameter_scale():
+    """
+    Rozpiętość uniwersum wejścia każdego parametru (jednostka przestrzeni przeszukiwania).
+
+    Returns:
+    np.ndarray: Tablica (len(TERMS) * 3,).
+    """
+    engine = FuzzyBatch.BatchInference(FuzzyLogic.setup_fuzzy_logic())
+    spans = [engine.antecedents[name][0][-1] - engine.antecedents[name][0][0] for name, _ in TERMS]
+    return np.repeat(spans, 3).astype(float)
+
+
+def encode(membership):
+    """
+    Zamienia funkcje przynależności ({wejście: {term: [a, b, c]}}) na wektor parametrów w kolejności TERMS.
+    """
+    return np.array([membership[name][label] for name, label in TERMS], dtype=float).ravel()
+
+
+def decode(vector):
+    """
+    Zamienia wektor parametrów na funkcje przynależności; parametry każdego trójkąta są sortowane (a <= b <= c).
+    """
+    triangles = np.sort(np.asarray(vector, dtype=float).reshape(len(TERMS), 3), axis=1)
+    membership = {name: {} for name, _ in TERMS}
+    for (name, label), points in zip(TERMS, triangles):
+        membership[name][label] = points.tolist()
+    return membership
+
+
+def episode_scores(results, max_steps, platform):
+    """
+    Ocenia epizody: udane lądowanie 1 (mniej za dłuższy lot), rozbicie na platformie PLATFORM_CRASH_SCORE,
+    a chybienie i przekroczenie limitu kroków - premia do 0.2 za bliskość platformy na końcu lotu.
+
+    Returns:
+    np.ndarray: Ocena każdego epizodu.
+    """
+    center_x, center_y = platform.get_center_pos()
+    scores = np.empty(len(results))
+    for index, result in enumerate(results):
+        if result["status"] == "success":
+            scores[index] = 1 - 0.5 * result["steps"] / max_steps
+        elif result["status"] == "crash" and Evaluation.crash_cause(result, platform) != "miss":
+            scores[index] = PLATFORM_CRASH_SCORE
+        else:
+            distance = np.hypot(result["x"] - center_x, result["y"] - center_y)
+            scores[index] = 0.2 * (1 - min(distance / CLOSE_DISTANCE, 1.0))
+    return scores
+
+
+def evaluate_population(engine, vectors, starts, max_steps):
+    """
+    Ocenia warianty sterownika jedną symulacją wsadową: każdy wariant leci ze wszystkich stanów początkowych.
+
+    Parameters:
+    engine (FuzzyBatch.BatchInference): Wsadowe wnioskowanie sterownika.
+    vectors (np.ndarray): Tablica (P, len(TERMS) * 3) wariantów.
+    starts (List[dict]): Stany początkowe (E).
+    max_steps (int): Limit kroków epizodu.
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: Średnia ocena i odsetek udanych lądowań każdego wariantu (P,).
+    """
+    count = len(vectors)
+    batch = BatchSimulation.RocketBatch.from_starts(starts * count)
+    # Funkcje przynależności rakiety; RocketBatch.select kopiuje je razem ze stanem lecących rakiet
+    batch.triangles = np.repeat(np.sort(vectors.reshape(count, len(TERMS), 3), axis=2), len(starts), axis=0)
+
+    def policy(rockets, platform):
+        distance_x, distance_y = rockets.get_distance(platform)
+        triangles = {term: rockets.triangles[:, index] for index, term in enumerate(TERMS)}
+        outputs = engine.evaluate(np.column_stack((distance_x, distance_y, rockets.vel_x, rockets.vel_y,
+                                                   rockets.angleDegrees)), triangles=triangles)
+        return outputs["thrust"], outputs["rotate"]
+
+    platform = Simulation.default_platform()
+    # Misses are scored by where the rocket passes the platform, so they stop there instead of falling to the limit
+    results = BatchSimulation.run_batch(policy, batch, platform, max_steps, stop_below_platform=True).results()
+    scores = episode_scores(results, max_steps, platform).reshape(count, len(starts))
+    successes = np.array([result["status"] == "success" for result in results]).reshape(count, len(starts))
+    return scores.mean(axis=1), successes.mean(axis=1)
+
+
+def _init_worker():
+    global _worker_engine
+    _worker_engine = FuzzyBatch.BatchInference(FuzzyLogic.setup_fuzzy_logic())
+
+
+def _evaluate_chunk(vectors, starts, max_steps):
+    return evaluate_population(_worker_engine, vectors, starts, max_steps)
+
+
+def tune(generations=200, population=16, episodes=32, sigma=0.02, max_steps=450, workers=1, seed=0, verbose=True):
+    """
+    Stroi funkcje przynależności CMA-ES-em. W każdym pokoleniu losowane są nowe stany początkowe
+    (Evaluation.sample_starts), więc warianty nie dopasowują się do jednego zestawu.
+
+    Parameters:
+    generations (int): Liczba pokoleń.
+    population (int): Liczba wariantów w pokoleniu.
+    episodes (int): Liczba epizodów na wariant w pokoleniu.
+    sigma (float): Początkowy krok (ułamek rozpiętości uniwersum).
+    max_steps (int): Limit kroków epizodu.
+    workers (int): Liczba procesów oceniających części populacji.
+    seed (int): Ziarno losowania.
+    verbose (bool): Czy wypisywać postęp.
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: Środek rozkładu i najlepszy oceniony wariant (wektory parametrów).
+    """
+    scale = parameter_scale()
+    strategy = CMAES(encode(FuzzyLogic.MEMBERSHIP) / scale, sigma, population, seed)
+    best, best_score = None, -np.inf
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker) if workers > 1 else None
+    engine = None if pool else FuzzyBatch.BatchInference(FuzzyLogic.setup_fuzzy_logic())
+    try:
+        for generation in range(generations):
+            start = time.perf_counter()
+            vectors = strategy.ask() * scale
+            starts = Evaluation.sample_starts(episodes, seed * 100003 + generation)
+            if pool:
+                chunks = np.array_split(vectors, workers)
+                parts = list(pool.map(_evaluate_chunk, chunks, [starts] * workers, [max_steps] * workers))
+                scores = np.concatenate([part[0] for part in parts])
+                successes = np.concatenate([part[1] for part in parts])
+            else:
+                scores, successes = evaluate_population(engine, vectors, starts, max_steps)
+            strategy.tell(scores)
+            if scores.max() > best_score:
+                best, best_score = vectors[scores.argmax()], scores.max()
+            if verbose:
+                print(f"generation {generation + 1}: best {scores.max():.3f}, mean {scores.mean():.3f}, "
+                      f"best success {successes.max():.2f}, sigma {strategy.sigma:.4f}, "
+                      f"{time.perf_counter() - start:.2f} s")
+    finally:
+        if pool:
+            pool.shutdown()
+    return strategy.mean * scale, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Strojenie funkcji przynależności autopilota (CMA-ES)")
+    parser.add_argument("--generations", type=int, default=200)
+    parser.add_argument("--population", type=int, default=16)
+    parser.add_argument("--episodes", type=int, default=32, help="epizody na wariant w pokoleniu")
+    parser.add_argument("--sigma", type=float, default=0.02, help="początkowy krok jako ułamek rozpiętości uniwersum")
+    parser.add_argument("--max-steps", type=int, default=450)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--validation", type=int, default=1000, help="epizody sprawdzające na koniec")
+    parser.add_argument("--output", default=Options.FUZZY_PARAMS_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    mean, best = tune(args.generations, args.population, args.episodes, args.sigma, args.max_steps, args.workers,
+                      args.seed)
+    print(f"Tuned in {time.perf_counter() - start:.1f} s")
+
+    engine = FuzzyBatch.BatchInference(FuzzyLogic.setup_fuzzy_logic())
+    starts = Evaluation.sample_starts(args.validation, args.seed + 1_000_000)
+    candidates = np.array([encode(FuzzyLogic.MEMBERSHIP), mean, best])
+    scores, successes = evaluate_population(engine, candidates, starts, Options.SIMULATION_MAX_STEPS)
+    for name, score, success in zip(("default", "mean", "best"), scores, successes):
+        print(f"{name}: score {score:.3f}, success rate {success:.3f}")
+
+    winner = 1 + int(np.argmax(scores[1:]))
+    if scores[winner] > scores[0]:
+        FuzzyLogic.save_membership(args.output, decode(candidates[winner]))
+        print(f"Saved {('mean', 'best')[winner - 1]} membership functions to {args.output}")
+    else:
+        print("No improvement over the default membership functions; nothing saved")
+
+
+if __name__ == "__main__":
+    main()
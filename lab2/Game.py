@@ -1,8 +1,10 @@
+import time
 import pygame
+import Landing
 import Options
 import Rocket
-import Platform
-import FuzzyLogic
+import Simulation
+import Replay
 
 
 """
@@ -21,6 +23,10 @@ Wymagane pakiety pythona do odpalenia gry:
 - networkx
 """
 
+# Maksymalny czas klatki doliczany do fizyki (po dłuższej przerwie gra zwalnia zamiast nadrabiać setki kroków)
+MAX_FRAME_TIME = 0.25
+
+
 def update_status(rocket, platform):
     """
     Sprawdza, czy rakieta wylądowała na platformie, a jeśli tak, ustala wynik lądowania.
@@ -33,16 +39,13 @@ def update_status(rocket, platform):
     rocket (Rocket): Obiekt rakiety.
     platform (LandingPlatform): Obiekt platformy lądowania.
     """
-    if (platform.x < rocket.x < platform.x + platform.width and
-            platform.y < rocket.y + rocket.height // 2 < platform.y + platform.height):
-
-        if abs(rocket.vel_x) <= Options.MAX_SAFE_VELOCITY and abs(rocket.vel_y) <= Options.MAX_SAFE_VELOCITY and abs(
-                rocket.angleDegrees) <= Options.MAX_SAFE_ANGLE:
-            rocket.status = "success"
-            print("SafeLanding")
-        else:
-            rocket.status = "crash"
-            print("Crashed")
+    status = Landing.landing_status(rocket, platform)
+    if status == "success":
+        rocket.status = "success"
+        print("SafeLanding")
+    elif status == "crash":
+        rocket.status = "crash"
+        print("Crashed")
 
 
 def handle_events(rocket):
@@ -56,148 +59,238 @@ def handle_events(rocket):
     rocket (Rocket): Obiekt rakiety.
 
     Returns:
-    bool: True, jeśli gra powinna nadal działać, False w przeciwnym razie.
+    Tuple[bool, Tuple[bool, bool, bool]]: True, jeśli gra powinna nadal działać, False w przeciwnym razie,
+                                          oraz zastosowane klawisze sterowania (lewo, prawo, ciąg) - do zapisu
+                                          przebiegu (Replay.Recorder).
     """
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
-            return False
+            return False, (False, False, False)
 
     # Stearing
     keys = pygame.key.get_pressed()
-    if keys[pygame.K_a]:
+    controls = (bool(keys[pygame.K_a]), bool(keys[pygame.K_d]), bool(keys[pygame.K_w]))
+    apply_keys(rocket, *controls)
+
+    if keys[pygame.K_e]:
+        rocket.autopilot = True
+
+    if keys[pygame.K_r]:
+        rocket.autopilot = False
+
+    if keys[pygame.K_q]:
+        return False, controls
+
+    return True, controls
+
+
+def apply_keys(rocket, left, right, thrust):
+    """
+    Stosuje klawisze sterowania gracza: obrót w lewo (A), w prawo (D) i ciąg (W). Klawisze działają także
+    przy włączonym autopilocie.
+
+    Parameters:
+    rocket (Rocket): Obiekt rakiety.
+    left (bool): Czy wciśnięty jest klawisz obrotu w lewo.
+    right (bool): Czy wciśnięty jest klawisz obrotu w prawo.
+    thrust (bool): Czy wciśnięty jest klawisz ciągu.
+    """
+    if left:
         if rocket.status == "flying":
             rocket.rotate("left")
 
-    if keys[pygame.K_d]:
+    if right:
         if rocket.status == "flying":
             rocket.rotate("right")
 
-    if keys[pygame.K_w]:
+    if thrust:
         if rocket.status == "flying":
             rocket.thrusting = True
             rocket.apply_thrust()
 
-    if not keys[pygame.K_w]:
+    if not thrust:
         rocket.thrusting = False
 
-    if keys[pygame.K_e]:
-        rocket.autopilot = True
 
-    if keys[pygame.K_r]:
-        rocket.autopilot = False
+class TextCache:
+    def __init__(self, font):
+        """
+        Pamięć podręczna napisów interfejsu: każdy napis ma swoje miejsce (slot) i jest renderowany ponownie
+        tylko wtedy, gdy zmieni się jego treść lub kolor.
+
+        Parameters:
+        font (pygame.font.Font): Czcionka do renderowania tekstu.
+
+        Attributes:
+        self.surfaces (dict): Slot -> (tekst, kolor, powierzchnia).
+        self.renders (int): Liczba wywołań font.render (do pomiarów).
+        """
+        self.font = font
+        self.surfaces = {}
+        self.renders = 0
+
+    def render(self, slot, text, color):
+        """
+        Zwraca powierzchnię napisu, renderując go tylko po zmianie.
+
+        Parameters:
+        slot (str): Miejsce napisu w interfejsie.
+        text (str): Treść napisu.
+        color (tuple): Kolor RGB.
+
+        Returns:
+        pygame.Surface: Powierzchnia z napisem.
+        """
+        cached = self.surfaces.get(slot)
+        if cached is None or cached[0] != text or cached[1] != color:
+            cached = (text, color, self.font.render(text, True, color))
+            self.surfaces[slot] = cached
+            self.renders += 1
+        return cached[2]
+
+
+def draw_interface(screen, text_cache, rocket, platform):
+    """
+    Rysuje interfejs wyświetlający stan gry, w tym informacje o paliwie, prędkości,
+    odległości do platformy i kącie rakiety.
 
-    if keys[pygame.K_q]:
-        return False
+    Parameters:
+    screen (pygame.Surface): Powierzchnia, na której rysowany jest interfejs.
+    text_cache (TextCache): Pamięć podręczna napisów.
+    rocket (Rocket): Obiekt rakiety.
+    platform (LandingPlatform): Obiekt platformy lądowania.
+    """
+    distance_x, distance_y = Landing.get_distance(rocket, platform)
+
+    # Info about game in left corner
+    lines = [
+        ("fuel", f"Fuel: {int(rocket.fuel)}", Options.WHITE),
+        ("velocity_x", f"Velocity X: {round(rocket.vel_x, 2)}", Options.WHITE),
+        ("velocity_y", f"Velocity Y: {round(rocket.vel_y, 2)}", Options.WHITE),
+        ("velocity", f"Velocity: {round(rocket.get_velocity(), 2)}", Options.WHITE),
+        ("distance_x", f"Distance X: {round(distance_x, 2)}", Options.WHITE),
+        ("distance_y", f"Distance Y: {round(distance_y, 2)}", Options.WHITE),
+        ("angle", f"Angle: {int(rocket.angleDegrees)}", Options.WHITE),
+        ("autopilot", f"Autopilot: {bool(rocket.autopilot)}", Options.RED),
+    ]
 
-    return True
+    # Draw GUI
+    for row, (slot, text, color) in enumerate(lines):
+        screen.blit(text_cache.render(slot, text, color), (10, 10 + 20 * row))
 
 
-def get_distance(rocket, platform):
+def draw(screen, text_cache, rocket, platform):
     """
-    Oblicza dystans między środkiem rakiety a środkiem platformy lądowania.
+    Rysuje jedną klatkę: tło, komunikat o wyniku lądowania, rakietę, platformę i interfejs.
 
     Parameters:
+    screen (pygame.Surface): Powierzchnia ekranu.
+    text_cache (TextCache): Pamięć podręczna napisów.
     rocket (Rocket): Obiekt rakiety.
     platform (LandingPlatform): Obiekt platformy lądowania.
-
-    Returns:
-    tuple: (float, float) reprezentujące dystans w osi X i Y między rakietą a platformą.
     """
-    rocket_center_x, rocket_center_y = rocket.get_center_pos()
-    platform_center_x, platform_center_y = platform.get_center_pos()
+    screen.fill(Options.BLACK)
 
-    distance_x = platform_center_x - rocket_center_x
-    distance_y = platform_center_y - rocket_center_y
+    if rocket.status == "success":
+        screen.blit(text_cache.render("status", "Landing Successful!", Options.GREEN),
+                    (Options.WIDTH / 2 - 60, Options.HEIGHT / 2))
+    elif rocket.status == "crash":
+        screen.blit(text_cache.render("status", "Crashed!", Options.RED), (Options.WIDTH / 2 - 60, Options.HEIGHT / 2))
 
-    return distance_x, distance_y
+    rocket.draw(screen)
+    platform.draw(screen)
+    draw_interface(screen, text_cache, rocket, platform)
 
+    pygame.display.flip()
 
-def draw_interface(screen, font, rocket, platform):
+
+def update(rocket, platform, controller, recorder=None):
     """
-    Rysuje interfejs wyświetlający stan gry, w tym informacje o paliwie, prędkości,
-    odległości do platformy i kącie rakiety.
+    Wykonuje jeden krok fizyki gry (stała długość 1 / Options.FPS): sterowanie z klawiatury,
+    grawitacja, autopilot, ruch i sprawdzenie lądowania.
 
     Parameters:
-    screen (pygame.Surface): Powierzchnia, na której rysowany jest interfejs.
-    font (pygame.font.Font): Czcionka do renderowania tekstu.
     rocket (Rocket): Obiekt rakiety.
     platform (LandingPlatform): Obiekt platformy lądowania.
-    """
+    controller (Callable): Autopilot (rocket, platform).
+    recorder (Replay.Recorder | None): Zapis przebiegu; krok jest zapisywany, jeśli rakieta jeszcze leciała.
 
-    # Info about game in left corner
-    fuel_text = font.render(f"Fuel: {int(rocket.fuel)}", True, Options.WHITE)
-    velocity_x_text = font.render(f"Velocity X: {round(rocket.vel_x, 2)}", True, Options.WHITE)
-    velocity_y_text = font.render(f"Velocity Y: {round(rocket.vel_y, 2)}", True, Options.WHITE)
-    velocity_text = font.render(f"Velocity: {round(rocket.get_velocity(), 2)}", True, Options.WHITE)
+    Returns:
+    bool: True, jeśli gra powinna nadal działać, False w przeciwnym razie.
+    """
+    # Thrust flag describes the current physics step only
+    rocket.thrusting = False
+    game_running, controls = handle_events(rocket)
 
-    distance_x_text = font.render(f"Distance X: {round(get_distance(rocket, platform)[0], 2)}", True, Options.WHITE)
-    distance_y_text = font.render(f"Distance Y: {round(get_distance(rocket, platform)[1], 2)}", True, Options.WHITE)
-    angle_text = font.render(f"Angle: {int(rocket.angleDegrees)}", True, Options.WHITE)
-    autopilot_text = font.render(f"Autopilot: {bool(rocket.autopilot)}", True, Options.RED)
+    if rocket.status == "flying":
+        rocket.apply_gravity()
+        outputs = controller(rocket, platform) if rocket.autopilot else None
+        rocket.update_position()
+        update_status(rocket, platform)
+        if recorder is not None:
+            recorder.tick(rocket, outputs, controls)
 
-    # Draw GUI
-    screen.blit(fuel_text, (10, 10))
-    screen.blit(velocity_x_text, (10, 30))
-    screen.blit(velocity_y_text, (10, 50))
-    screen.blit(velocity_text, (10, 70))
-    screen.blit(distance_x_text, (10, 90))
-    screen.blit(distance_y_text, (10, 110))
-    screen.blit(angle_text, (10, 130))
-    screen.blit(autopilot_text, (10, 150))
+    return game_running
 
 
-def main():
+def main(render_fps=Options.RENDER_FPS, render=True, record_path=Options.REPLAY_PATH, autopilot=Options.AUTOPILOT):
     """
     Główna funkcja gry Moon Lander, która inicjalizuje wszystkie elementy i obsługuje pętlę gry.
 
-    Tworzy ekran, obiekty rakiety i platformy, oraz kontroler logiki rozmytej. W pętli gry
-    obsługuje zdarzenia, aktualizuje stan rakiety, rysuje obiekty i interfejs, a także sprawdza
-    status lądowania.
+    Tworzy ekran, obiekty rakiety i platformy, oraz autopilota (sterownik rozmyty albo tablicę polityki). Fizyka (zdarzenia, stan rakiety,
+    status lądowania) liczona jest w stałych krokach Options.FPS razy na sekundę, niezależnie od rysowania:
+    w każdej klatce wykonywane są kroki, które przypadają na czas od poprzedniej klatki, a następnie -
+    jeśli rysowanie jest włączone - rysowane są obiekty i interfejs.
 
     Po zakończeniu gry zamyka Pygame.
+
+    Parameters:
+    render_fps (int): Limit klatek rysowania na sekundę; 0 oznacza brak limitu.
+    render (bool): Czy rysować grę (bez rysowania pętla działa w tempie fizyki).
+    record_path (str | None): Plik, do którego zapisywany jest przebieg gry (Replay.py); None wyłącza zapis.
+    autopilot (str): "fuzzy" albo "table" (Simulation.make_controller).
     """
     pygame.init()
     screen = pygame.display.set_mode((Options.WIDTH, Options.HEIGHT))
     pygame.display.set_caption("Moon Lander")
     clock = pygame.time.Clock()
+    text_cache = TextCache(pygame.font.SysFont(None, 24))
 
     rocket = Rocket.Rocket(250, 500)
-    platform = Platform.LandingPlatform((Options.WIDTH - Options.LANDING_PLATFORM_WIDTH)/2, Options.HEIGHT - 100)
+    # Rotated rocket sprites are prepared before the loop (unless Options.ROCKET_ATLAS_LAZY)
+    Rocket.get_atlas(rocket.width, rocket.height)
+    platform = Simulation.default_platform()
 
-    # Setup fuzzy logic controller
-    autopilot_ctrl = FuzzyLogic.setup_fuzzy_logic()
+    # Setup autopilot: fuzzy logic controller (precompiled table from python FuzzyTable.py and tuned membership
+    # functions from python FuzzyTuner.py are used when available) or policy table (python PolicyTable.py)
+    controller = Simulation.make_controller(autopilot)
+    recorder = Replay.Recorder(rocket, platform, autopilot) if record_path else None
 
     game_running = True
+    step = 1 / Options.FPS
+    accumulator = 0.0
+    previous = time.perf_counter()
 
     while game_running:
-        screen.fill(Options.BLACK)
-        game_running = handle_events(rocket)
-        font = pygame.font.SysFont(None, 24)
-
-        # Update rocket
-        if rocket.status == "flying":
-            rocket.apply_gravity()
-            if rocket.autopilot:
-                FuzzyLogic.fuzzy_control(rocket, platform, autopilot_ctrl)  # Use fuzzy control logic
-            rocket.update_position()
-            update_status(rocket, platform)
-
-        elif rocket.status == "success":
-            success_text = font.render("Landing Successful!", True, Options.GREEN)
-            screen.blit(success_text, (Options.WIDTH / 2 - 60, Options.HEIGHT / 2))
-
-        elif rocket.status == "crash":
-            crash_text = font.render("Crashed!", True, Options.RED)
-            screen.blit(crash_text, (Options.WIDTH / 2 - 60, Options.HEIGHT / 2))
-
-        rocket.draw(screen)
-        platform.draw(screen)
-        draw_interface(screen,font, rocket, platform)
-
-        pygame.display.flip()
-        clock.tick(30)
+        now = time.perf_counter()
+        # Cap the catch-up after a long frame so the simulation does not spiral
+        accumulator += min(now - previous, MAX_FRAME_TIME)
+        previous = now
+
+        while game_running and accumulator >= step:
+            game_running = update(rocket, platform, controller, recorder)
+            accumulator -= step
+
+        if render:
+            draw(screen, text_cache, rocket, platform)
+            clock.tick(render_fps)
+        else:
+            clock.tick(Options.FPS)
 
+    if recorder is not None:
+        Replay.save_replay(record_path, recorder.replay(rocket.status))
+        print(f"Replay saved to {record_path}")
     pygame.quit()
 
 
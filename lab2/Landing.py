@@ -0,0 +1,45 @@
+import Options
+
+"""
+Geometria lądowania wspólna dla gry, symulacji bez okna i autopilotów (bez pygame i bez Game).
+"""
+
+
+def get_distance(rocket, platform):
+    """
+    Oblicza dystans między środkiem rakiety a środkiem platformy lądowania.
+
+    Parameters:
+    rocket (Rocket): Obiekt rakiety.
+    platform (LandingPlatform): Obiekt platformy lądowania.
+
+    Returns:
+    tuple: (float, float) reprezentujące dystans w osi X i Y między rakietą a platformą.
+    """
+    rocket_center_x, rocket_center_y = rocket.get_center_pos()
+    platform_center_x, platform_center_y = platform.get_center_pos()
+
+    distance_x = platform_center_x - rocket_center_x
+    distance_y = platform_center_y - rocket_center_y
+
+    return distance_x, distance_y
+
+
+def landing_status(rocket, platform):
+    """
+    Sprawdza, czy rakieta dotknęła platformy i czy lądowanie było bezpieczne.
+
+    Parameters:
+    rocket (Rocket): Obiekt rakiety.
+    platform (LandingPlatform): Obiekt platformy lądowania.
+
+    Returns:
+    str | None: "success" lub "crash", jeśli rakieta jest na platformie, w przeciwnym razie None.
+    """
+    if (platform.x < rocket.x < platform.x + platform.width and
+            platform.y < rocket.y + rocket.height // 2 < platform.y + platform.height):
+        if (abs(rocket.vel_x) <= Options.MAX_SAFE_VELOCITY and abs(rocket.vel_y) <= Options.MAX_SAFE_VELOCITY
+                and abs(rocket.angleDegrees) <= Options.MAX_SAFE_ANGLE):
+            return "success"
+        return "crash"
+    return None
@@ -12,4 +12,26 @@ MAX_SAFE_ANGLE = 10
 FUEL_CONSUMPTION_RATE = 0.3
 ROTATION_SPEED = 2.00
 LANDING_PLATFORM_WIDTH = 150
-MAX_ROCKET_ROTATION = 90
\ No newline at end of file
+MAX_ROCKET_ROTATION = 90
+
+# Liczba klatek (kroków fizyki) na sekundę i limit kroków epizodu symulacji bez okna (Simulation.py)
+FPS = 30
+# Limit klatek rysowania gry na sekundę (0 - bez limitu); fizyka zawsze liczona jest FPS razy na sekundę
+RENDER_FPS = 60
+# Atlas obróconych obrazów rakiety (Rocket.SpriteAtlas): False - wszystkie kąty obracane przy starcie gry,
+# True - każdy kąt obracany przy pierwszym rysowaniu (szybszy start)
+ROCKET_ATLAS_LAZY = False
+SIMULATION_MAX_STEPS = 60 * FPS
+
+# Skompilowana tablica sterownika rozmytego (FuzzyTable.py); jeśli plik istnieje, autopilot korzysta z niej
+FUZZY_TABLE_PATH = "fuzzy_table.npz"
+# Nastrojone funkcje przynależności wejść (FuzzyTuner.py); jeśli plik istnieje, autopilot korzysta z nich
+FUZZY_PARAMS_PATH = "fuzzy_params.json"
+
+# Autopilot gry i symulacji bez okna (Simulation.make_controller): "fuzzy" - sterownik rozmyty,
+# "table" - tablica polityki wyznaczona programowaniem dynamicznym (PolicyTable.py)
+AUTOPILOT = "fuzzy"
+POLICY_TABLE_PATH = "policy_table.npy"
+
+# Plik, do którego gra zapisuje ostatni przebieg (Replay.py); None wyłącza zapis
+REPLAY_PATH = "replay.npz"
\ No newline at end of file
@@ -0,0 +1,380 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+import Evaluation
+import FuzzyLogic
+import Landing
+import Options
+import Simulation
+
+"""
+Autopilot z tablicą polityki wyznaczoną programowaniem dynamicznym.
+
+Stan rakiety względem platformy (distance_x, distance_y, velocity_x, velocity_y, angle, fuel) jest dyskretyzowany
+na regularnej siatce, a iteracja wartości (value iteration) w NumPy wyznacza dla każdego węzła najlepszą akcję:
+ciąg (włączony / wyłączony) i obrót (w lewo / brak / w prawo). Jeden krok iteracji to MACRO_STEPS kroków fizyki
+z tą samą akcją, liczonych dokładnie według reguł gry (Rocket, Simulation.step, Landing.landing_status);
+wartość stanu po kroku jest interpolowana wieloliniowo po położeniu i prędkości, a kąt i paliwo trafiają
+dokładnie w węzły siatki (krok siatki kąta to MACRO_STEPS * Options.ROTATION_SPEED).
+
+Paliwo ma dwa przedziały - puste i dostępne. Pełny bak (1000 przy zużyciu Options.FUEL_CONSUMPTION_RATE na krok)
+wystarcza na więcej kroków ciągu niż Options.SIMULATION_MAX_STEPS, więc ilość paliwa nie ogranicza epizodu;
+dynamikę zmienia tylko pusty bak (ciąg nie działa).
+
+Tablica akcji (int8) zapisywana jest jako plik .npy i wczytywana przez np.load(mmap_mode="r"), a opis siatki
+w pliku .json obok. Odczyt w klatce gry to zaokrąglenie wejść do najbliższego węzła i jeden odczyt z tablicy - O(1).
+
+Uruchomienie (wyznaczenie tablicy, zapis i porównanie z autopilotem rozmytym):
+    python PolicyTable.py --iterations 600 --output policy_table.npy --episodes 200
+"""
+
+# Liczba kroków fizyki z tą samą akcją w jednym kroku iteracji wartości
+MACRO_STEPS = 3
+# Osie siatki stanu: nazwa -> (początek, krok, liczba węzłów); kolejność jak wymiary tablicy
+AXES = {
+    "fuel": (0, 1, 2),
+    "angle": (-30.0, MACRO_STEPS * Options.ROTATION_SPEED, 11),
+    "distance_x": (-600.0, 50.0, 25),
+    "distance_y": (0.0, 35.0, 21),
+    "velocity_x": (-7.5, 1.5, 11),
+    "velocity_y": (-7.5, 1.5, 11),
+}
+# Akcje jako wyjścia thrust i rotate w rozumieniu FuzzyLogic.apply_control
+ACTIONS = tuple((thrust, rotate) for thrust in (0, 1) for rotate in (-1, 0, 1))
+# Nagrody: udane lądowanie, rozbicie lub wylot poza siatkę, koszt kroku iteracji i koszt kroku fizyki z ciągiem
+SUCCESS_REWARD = 100.0
+FAILURE_REWARD = -100.0
+STEP_COST = 0.05
+THRUST_COST = 0.01
+
+FLYING, SUCCESS, CRASH = 0, 1, 2
+
+
+def axis_values(name):
+    """
+    Returns:
+    np.ndarray: Wartości węzłów osi siatki.
+    """
+    start, step, count = AXES[name]
+    return start + step * np.arange(count)
+
+
+def landing_window(rocket=None, platform=None):
+    """
+    Wyznacza okno lądowania we współrzędnych Landing.get_distance (odległość środka platformy od środka rakiety).
+
+    Parameters:
+    rocket (Rocket | None): Rakieta (jej wymiary); domyślnie Simulation.make_rocket().
+    platform (LandingPlatform | None): Platforma (jej wymiary); domyślnie Simulation.default_platform().
+
+    Returns:
+    Tuple[float, float, float]: Zakres distance_x (od, do) nad platformą i połowa wysokości platformy -
+                                rakieta dotyka platformy, gdy |distance_y| < połowa wysokości, a rozbija się
+                                o podłoże, gdy distance_y <= -połowa wysokości.
+    """
+    rocket = rocket or Simulation.make_rocket()
+    platform = platform or Simulation.default_platform()
+    # Landing.landing_status: platform.x < rocket.x < platform.x + width
+    low = -platform.width / 2 - rocket.width / 2
+    return low, low + platform.width, platform.height / 2
+
+
+def transition(distance_x, distance_y, vel_x, vel_y, angle, fuel, action):
+    """
+    Wykonuje MACRO_STEPS kroków fizyki z tą samą akcją dla wielu stanów naraz (w kolejności Simulation.step:
+    grawitacja, ciąg, obrót, ruch, sprawdzenie lądowania).
+
+    Parameters:
+    distance_x, distance_y, vel_x, vel_y (np.ndarray): Stany ciągłe.
+    angle (float): Kąt rakiety w stopniach (wspólny dla wszystkich stanów).
+    fuel (int): Przedział paliwa (0 - pusty bak).
+    action (tuple): Wyjścia thrust i rotate.
+
+    Returns:
+    tuple: distance_x, distance_y, vel_x, vel_y po krokach, kąt po krokach, status (FLYING, SUCCESS, CRASH)
+           i suma kosztów kroków.
+    """
+    thrust, rotate = action
+    low, high, half_height = landing_window()
+    distance_x, distance_y, vel_x, vel_y = (np.array(values, dtype=float) for values in
+                                            (distance_x, distance_y, vel_x, vel_y))
+    status = np.full(distance_x.shape, FLYING, dtype=np.int8)
+    reward = np.full(distance_x.shape, -STEP_COST)
+
+    for _ in range(MACRO_STEPS):
+        flying = status == FLYING
+        vel_y = np.where(flying, vel_y + Options.GRAVITY, vel_y)
+        if thrust > 0 and fuel:
+            radians = np.radians(angle)
+            vel_x = np.where(flying, vel_x + Options.THRUST * np.sin(radians), vel_x)
+            vel_y = np.where(flying, vel_y - Options.THRUST * np.cos(radians), vel_y)
+            reward -= THRUST_COST * flying
+        if rotate < 0 and angle > -Options.MAX_ROCKET_ROTATION:
+            angle -= Options.ROTATION_SPEED
+        elif rotate > 0 and angle < Options.MAX_ROCKET_ROTATION:
+            angle += Options.ROTATION_SPEED
+        distance_x = np.where(flying, distance_x - vel_x, distance_x)
+        distance_y = np.where(flying, distance_y - vel_y, distance_y)
+
+        touching = flying & (low < distance_x) & (distance_x < high) & (np.abs(distance_y) < half_height)
+        safe = ((np.abs(vel_x) <= Options.MAX_SAFE_VELOCITY) & (np.abs(vel_y) <= Options.MAX_SAFE_VELOCITY)
+                & (abs(angle) <= Options.MAX_SAFE_ANGLE))
+        status[touching & safe] = SUCCESS
+        status[touching & ~safe] = CRASH
+        # Deviation from the game: the grid ends at the platform, so falling below it counts as a crash,
+        # although in the game the rocket could still thrust back up
+        status[(status == FLYING) & (distance_y <= -half_height)] = CRASH
+
+    return distance_x, distance_y, vel_x, vel_y, angle, status, reward
+
+
+def interpolate(values, points):
+    """
+    Interpoluje wieloliniowo tablicę wartości na siatce położenia i prędkości.
+
+    Parameters:
+    values (np.ndarray): Wartości w węzłach, kształt (distance_x, distance_y, velocity_x, velocity_y) osi AXES.
+    points (List[np.ndarray]): Współrzędne punktów w tej samej kolejności.
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: Wartości w punktach i maska punktów leżących wewnątrz siatki.
+    """
+    flat = values.ravel()
+    strides = np.array(values.strides) // values.itemsize
+    base = np.zeros(points[0].shape, dtype=np.int64)
+    fractions = []
+    inside = np.ones(points[0].shape, dtype=bool)
+    for name, stride, point in zip(("distance_x", "distance_y", "velocity_x", "velocity_y"), strides, points):
+        start, step, count = AXES[name]
+        position = (point - start) / step
+        inside &= (position >= 0) & (position <= count - 1)
+        position = np.clip(position, 0, count - 1 - 1e-9)
+        index = position.astype(np.int64)
+        fractions.append(position - index)
+        base += index * stride
+
+    result = np.zeros(points[0].shape)
+    for corner in range(2 ** len(points)):
+        weight = np.ones(points[0].shape)
+        offset = 0
+        for dimension, (fraction, stride) in enumerate(zip(fractions, strides)):
+            if corner >> dimension & 1:
+                weight *= fraction
+                offset += stride
+            else:
+                weight *= 1 - fraction
+        result += weight * flat[base + offset]
+    return result, inside
+
+
+class PolicyTable:
+    def __init__(self, actions, axes=None):
+        """
+        Tablica polityki autopilota.
+
+        Parameters:
+        actions (np.ndarray): Indeksy akcji (ACTIONS) w węzłach siatki, kształt zgodny z osiami
+                              (może być tablicą np.memmap).
+        axes (dict | None): Osie siatki jak AXES; domyślnie AXES.
+
+        Attributes:
+        self.actions (np.ndarray): Tablica akcji.
+        self.axes (dict): Osie siatki: nazwa -> (początek, krok, liczba węzłów).
+        """
+        self.actions = actions
+        self.axes = dict(axes or AXES)
+
+    @classmethod
+    def solve(cls, iterations=600, tolerance=1e-2, verbose=False):
+        """
+        Wyznacza tablicę iteracją wartości. Przejścia (stany po MACRO_STEPS krokach dla każdego węzła i akcji)
+        liczone są raz, a każda iteracja interpoluje na nich wartości z poprzedniej iteracji.
+
+        Parameters:
+        iterations (int): Maksymalna liczba iteracji (jedna iteracja to MACRO_STEPS kroków fizyki horyzontu).
+        tolerance (float): Iteracja kończy się, gdy największa zmiana wartości jest mniejsza; jeśli nie osiągnie
+                           jej w iterations iteracjach, solve wypisuje ostrzeżenie.
+        verbose (bool): Czy wypisywać postęp.
+
+        Returns:
+        PolicyTable: Wyznaczona tablica.
+        """
+        names = ("distance_x", "distance_y", "velocity_x", "velocity_y")
+        grid = [values.ravel() for values in np.meshgrid(*(axis_values(name) for name in names), indexing="ij")]
+        fuel_bins, angles = axis_values("fuel"), axis_values("angle")
+        angle_start, angle_step, angle_count = AXES["angle"]
+        shape = tuple(AXES[name][2] for name in AXES)
+
+        # Fixed part of Q (costs and terminal rewards), next angle index and continuous next states
+        transitions = {}
+        for fuel in fuel_bins:
+            for angle_index, angle in enumerate(angles):
+                for action_index, action in enumerate(ACTIONS):
+                    *points, next_angle, status, reward = transition(*grid, angle, fuel, action)
+                    next_index = int(round((next_angle - angle_start) / angle_step))
+                    if not 0 <= next_index < angle_count:
+                        continue
+                    fixed = reward + np.where(status == SUCCESS, SUCCESS_REWARD, 0.0)
+                    fixed += np.where(status == CRASH, FAILURE_REWARD, 0.0)
+                    transitions[fuel, angle_index, action_index] = (points, next_index, status == FLYING, fixed)
+
+        values = np.full(shape, FAILURE_REWARD)
+        actions = np.zeros(shape, dtype=np.int8)
+        start = time.perf_counter()
+        for iteration in range(iterations):
+            new_values = np.empty_like(values)
+            for fuel in fuel_bins:
+                for angle_index in range(angle_count):
+                    q = np.full((len(ACTIONS), len(grid[0])), -np.inf)
+                    for action_index in range(len(ACTIONS)):
+                        if (fuel, angle_index, action_index) not in transitions:
+                            continue
+                        points, next_index, flying, fixed = transitions[fuel, angle_index, action_index]
+                        value, inside = interpolate(values[fuel, next_index], points)
+                        # Leaving the grid counts as a failure
+                        q[action_index] = fixed + np.where(flying, np.where(inside, value, FAILURE_REWARD), 0.0)
+                    actions[fuel, angle_index] = q.argmax(axis=0).reshape(shape[2:])
+                    new_values[fuel, angle_index] = q.max(axis=0).reshape(shape[2:])
+            change = float(np.abs(new_values - values).max())
+            values = new_values
+            if verbose and iteration % 20 == 0:
+                print(f"iteration {iteration}: max change {change:.4f} ({time.perf_counter() - start:.0f} s)")
+            if change < tolerance:
+                if verbose:
+                    print(f"converged after {iteration + 1} iterations (max change {change:.4f})")
+                break
+        else:
+            print(f"Warning: value iteration did not converge in {iterations} iterations "
+                  f"(max change {change:.4f}, tolerance {tolerance})")
+        return cls(actions)
+
+    def lookup(self, distance_x, distance_y, vel_x, vel_y, angle, fuel):
+        """
+        Zwraca indeks akcji w najbliższym węźle siatki (wartości spoza siatki są przycinane do jej brzegu).
+
+        Returns:
+        int: Indeks akcji w ACTIONS.
+        """
+        index = []
+        for (start, step, count), value in zip(self.axes.values(),
+                                               (fuel > 0, angle, distance_x, distance_y, vel_x, vel_y)):
+            index.append(min(max(int(round((value - start) / step)), 0), count - 1))
+        return int(self.actions[tuple(index)])
+
+    def compute(self, distance_x, distance_y, vel_x, vel_y, angle, fuel):
+        """
+        Returns:
+        Tuple[int, int]: Wyjścia thrust i rotate dla stanu rakiety.
+        """
+        return ACTIONS[self.lookup(distance_x, distance_y, vel_x, vel_y, angle, fuel)]
+
+    def save(self, path):
+        """
+        Zapisuje tablicę akcji do pliku .npy, a opis siatki do pliku .json o tej samej nazwie.
+
+        Parameters:
+        path (str): Ścieżka pliku .npy.
+        """
+        table = np.lib.format.open_memmap(path, mode="w+", dtype=np.int8, shape=self.actions.shape)
+        table[...] = self.actions
+        table.flush()
+        del table
+        with open(os.path.splitext(path)[0] + ".json", "w") as file:
+            json.dump({"axes": self.axes, "actions": ACTIONS, "macro_steps": MACRO_STEPS}, file, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Wczytuje tablicę zapisaną metodą save jako tablicę odwzorowaną w pamięci (np.memmap).
+
+        Parameters:
+        path (str): Ścieżka pliku .npy.
+
+        Returns:
+        PolicyTable: Wczytana tablica.
+        """
+        with open(os.path.splitext(path)[0] + ".json") as file:
+            axes = {name: tuple(axis) for name, axis in json.load(file)["axes"].items()}
+        return cls(np.load(path, mmap_mode="r"), axes)
+
+
+def policy_control(rocket, platform, table):
+    """
+    Steruje rakietą akcją odczytaną z tablicy polityki.
+
+    Parameters:
+    rocket (Rocket): Obiekt rakiety, który ma być sterowany.
+    platform (LandingPlatform): Obiekt platformy lądowania używany do określenia odległości.
+    table (PolicyTable): Tablica polityki.
+
+    Returns:
+    Tuple[int, int]: Wyjścia thrust i rotate.
+    """
+    distance_x, distance_y = Landing.get_distance(rocket, platform)
+    thrust_output, rotate_output = table.compute(distance_x, distance_y, rocket.vel_x, rocket.vel_y,
+                                                 rocket.angleDegrees, rocket.fuel)
+    FuzzyLogic.apply_control(rocket, thrust_output, rotate_output)
+    return thrust_output, rotate_output
+
+
+def benchmark(controller, starts):
+    """
+    Rozgrywa epizody bez okna i mierzy czas każdego wywołania sterownika.
+
+    Parameters:
+    controller (Callable): Sterownik (rocket, platform).
+    starts (List[dict]): Stany początkowe.
+
+    Returns:
+    dict: Odsetki wyników (Simulation.summarize) i czas kroku sterownika w mikrosekundach (średnia, mediana, p95).
+    """
+    latencies = []
+
+    def timed_controller(rocket, platform):
+        start = time.perf_counter()
+        outputs = controller(rocket, platform)
+        latencies.append(time.perf_counter() - start)
+        return outputs
+
+    summary = Simulation.summarize(Simulation.run_episodes(timed_controller, starts))
+    latencies = np.array(latencies) * 1e6
+    summary["step_us"] = {"mean": float(latencies.mean()), "median": float(np.median(latencies)),
+                          "p95": float(np.percentile(latencies, 95))}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tablica polityki autopilota wyznaczona iteracją wartości")
+    parser.add_argument("--iterations", type=int, default=600)
+    parser.add_argument("--tolerance", type=float, default=1e-2)
+    parser.add_argument("--output", default=Options.POLICY_TABLE_PATH)
+    parser.add_argument("--skip-solve", action="store_true", help="porównaj istniejącą tablicę bez wyznaczania")
+    parser.add_argument("--episodes", type=int, default=200, help="epizody porównania (0 - bez porównania); autopilot rozmyty "
+                        "porównywany jest tylko ze skompilowanej tablicy (FuzzyTable.py)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if not args.skip_solve:
+        start = time.perf_counter()
+        table = PolicyTable.solve(args.iterations, args.tolerance, verbose=True)
+        print(f"Solved in {time.perf_counter() - start:.1f} s, table {table.actions.shape}")
+        table.save(args.output)
+        print(f"Saved to {args.output}")
+
+    if args.episodes:
+        starts = Evaluation.sample_starts(args.episodes, args.seed)
+        for name in Simulation.CONTROLLERS:
+            controller = Simulation.make_controller(name, policy_path=args.output, live_fallback=False)
+            if controller is None:
+                print(f"{name}: skipped, no up-to-date {Options.FUZZY_TABLE_PATH} (full fuzzy inference takes minutes "
+                      f"per episode; compile it with python FuzzyTable.py)")
+                continue
+            print(name, json.dumps(benchmark(controller, starts)))
+
+
+if __name__ == "__main__":
+    main()
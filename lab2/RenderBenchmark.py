@@ -0,0 +1,145 @@
+import argparse
+import functools
+import os
+import time
+
+import numpy as np
+
+# Without a display the benchmark runs on SDL's dummy video driver
+if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import Game
+import Landing
+import Options
+import Rocket
+import Simulation
+
+"""
+Pomiar czasu rysowania klatki gry Moon Lander.
+
+Trajektoria autopilota (Simulation.run_episode) jest odtwarzana klatka po klatce dwoma sposobami:
+- "legacy": rysowanie jak w dawnej pętli gry - czcionka tworzona w każdej klatce, wszystkie napisy
+  renderowane od nowa, obraz rakiety obracany w każdej klatce,
+- "cached": Game.draw - jedna czcionka, napisy z Game.TextCache, obrócone obrazy z atlasu (Rocket.get_atlas).
+Wynikiem jest średni, medianowy i 95. percentyl czasu klatki w milisekundach.
+
+Uruchomienie (bez ekranu używany jest sterownik SDL "dummy"):
+    python RenderBenchmark.py --repeats 3
+"""
+
+
+def legacy_frame(screen, rocket, platform):
+    """
+    Rysuje klatkę tak jak pętla gry przed wprowadzeniem pamięci podręcznych (punkt odniesienia pomiaru).
+
+    Parameters:
+    screen (pygame.Surface): Powierzchnia ekranu.
+    rocket (Rocket): Obiekt rakiety.
+    platform (LandingPlatform): Obiekt platformy lądowania.
+    """
+    screen.fill(Options.BLACK)
+    font = pygame.font.SysFont(None, 24)
+
+    if rocket.status == "success":
+        screen.blit(font.render("Landing Successful!", True, Options.GREEN), (Options.WIDTH / 2 - 60, Options.HEIGHT / 2))
+    elif rocket.status == "crash":
+        screen.blit(font.render("Crashed!", True, Options.RED), (Options.WIDTH / 2 - 60, Options.HEIGHT / 2))
+
+    rotated_image = pygame.transform.rotate(rocket.get_image(), -rocket.angleDegrees)
+    screen.blit(rotated_image, rotated_image.get_rect(center=(rocket.x, rocket.y)).topleft)
+    platform.draw(screen)
+
+    texts = [
+        (f"Fuel: {int(rocket.fuel)}", Options.WHITE),
+        (f"Velocity X: {round(rocket.vel_x, 2)}", Options.WHITE),
+        (f"Velocity Y: {round(rocket.vel_y, 2)}", Options.WHITE),
+        (f"Velocity: {round(rocket.get_velocity(), 2)}", Options.WHITE),
+        (f"Distance X: {round(Landing.get_distance(rocket, platform)[0], 2)}", Options.WHITE),
+        (f"Distance Y: {round(Landing.get_distance(rocket, platform)[1], 2)}", Options.WHITE),
+        (f"Angle: {int(rocket.angleDegrees)}", Options.WHITE),
+        (f"Autopilot: {bool(rocket.autopilot)}", Options.RED),
+    ]
+    for row, (text, color) in enumerate(texts):
+        screen.blit(font.render(text, True, color), (10, 10 + 20 * row))
+
+    pygame.display.flip()
+
+
+def autopilot_trajectory():
+    """
+    Rozgrywa epizod autopilota gry (Simulation.make_controller) ze startu gry.
+
+    Returns:
+    np.ndarray: Trajektoria (kroki + 1, len(Simulation.TRAJECTORY_COLUMNS)).
+    """
+    return Simulation.run_episode(Simulation.make_controller())["trajectory"]
+
+
+def set_state(rocket, state):
+    """
+    Ustawia stan rakiety z wiersza trajektorii.
+
+    Parameters:
+    rocket (Rocket): Obiekt rakiety.
+    state (np.ndarray): Wiersz trajektorii w kolejności Simulation.TRAJECTORY_COLUMNS.
+    """
+    rocket.x, rocket.y, rocket.vel_x, rocket.vel_y, rocket.angleDegrees, rocket.fuel, thrusting = state
+    rocket.thrusting = bool(thrusting)
+
+
+def time_frames(draw_frame, trajectory, repeats=1):
+    """
+    Odtwarza trajektorię i mierzy czas rysowania każdej klatki.
+
+    Parameters:
+    draw_frame (Callable): Funkcja (rocket, platform) rysująca klatkę.
+    trajectory (np.ndarray): Trajektoria do odtworzenia.
+    repeats (int): Liczba odtworzeń.
+
+    Returns:
+    np.ndarray: Czasy klatek w milisekundach.
+    """
+    platform = Simulation.default_platform()
+    times = []
+    for _ in range(repeats):
+        rocket = Rocket.Rocket(250, 500)
+        rocket.autopilot = True
+        for state in trajectory:
+            set_state(rocket, state)
+            start = time.perf_counter()
+            draw_frame(rocket, platform)
+            times.append((time.perf_counter() - start) * 1000)
+            pygame.event.pump()
+    return np.array(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pomiar czasu rysowania klatki gry Moon Lander")
+    parser.add_argument("--repeats", type=int, default=3, help="liczba odtworzeń trajektorii")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((Options.WIDTH, Options.HEIGHT))
+    trajectory = autopilot_trajectory()
+    text_cache = Game.TextCache(pygame.font.SysFont(None, 24))
+    sample = Rocket.Rocket(0, 0)
+    Rocket.get_atlas(sample.width, sample.height)
+
+    results = {
+        "legacy": time_frames(functools.partial(legacy_frame, screen), trajectory, args.repeats),
+        "cached": time_frames(functools.partial(Game.draw, screen, text_cache), trajectory, args.repeats),
+    }
+    print(f"{len(trajectory)} frames x {args.repeats}, video driver: {pygame.display.get_driver()}")
+    for name, times in results.items():
+        print(f"{name}: mean {times.mean():.3f} ms, median {np.median(times):.3f} ms, "
+              f"p95 {np.percentile(times, 95):.3f} ms")
+    print(f"speedup (mean): {results['legacy'].mean() / results['cached'].mean():.2f}x, "
+          f"text renders (cached): {text_cache.renders}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+import argparse
+import json
+import time
+
+import numpy as np
+import pygame
+
+import FuzzyLogic
+import Game
+import Landing
+import Options
+import Platform
+import Rocket
+import Simulation
+
+"""
+Zapis i odtwarzanie przebiegów Moon Lander.
+
+Przebieg to tablica strukturalna NumPy z jednym wierszem na krok fizyki (wiersz 0 to stan początkowy):
+stan rakiety po kroku, wyjścia thrust i rotate sterownika przed zaokrągleniem (NaN, gdy autopilot był wyłączony)
+oraz klawisze sterowania gracza zastosowane w kroku (Game.apply_keys, działają także przy włączonym autopilocie).
+Zapisywany jest do pliku .npz razem z metadanymi (platforma, wynik, sterownik, stałe fizyki).
+Gra zapisuje ostatni przebieg do Options.REPLAY_PATH.
+
+Odtwarzanie:
+- play - rysuje zapisane stany z dowolną szybkością (0 - bez limitu),
+- resimulate - liczy przebieg od nowa bez okna: z zapisanych klawiszy i wyjść sterownika dokładnie jak Game.update
+  (powinien dać identyczny przebieg) albo z innym sterownikiem,
+- diff_replays - porównuje dwa przebiegi krok po kroku.
+
+Uruchomienie:
+    python Replay.py record --controller fuzzy --x 400 --y 300 --output fuzzy.npz
+    python Replay.py record --controller fuzzy --fuzzy-table "" --x 400 --y 300 --output live.npz
+    python Replay.py diff fuzzy.npz live.npz
+    python Replay.py play replay.npz --speed 4
+    python Replay.py play replay.npz --headless --controller table
+"""
+
+REPLAY_DTYPE = np.dtype([
+    ("x", "f8"), ("y", "f8"), ("vel_x", "f8"), ("vel_y", "f8"), ("angle", "f8"), ("fuel", "f8"),
+    ("thrusting", "?"), ("thrust_output", "f8"), ("rotate_output", "f8"),
+    ("key_left", "?"), ("key_right", "?"), ("key_thrust", "?"),
+])
+# Kolumny stanu porównywane przez diff_replays
+STATE_COLUMNS = ("x", "y", "vel_x", "vel_y", "angle", "fuel")
+# Stałe, od których zależy przebieg; odtwarzanie ostrzega, jeśli różnią się od zapisanych
+PHYSICS_OPTIONS = ("GRAVITY", "THRUST", "FUEL_CONSUMPTION_RATE", "ROTATION_SPEED", "MAX_ROCKET_ROTATION",
+                   "MAX_SAFE_VELOCITY", "MAX_SAFE_ANGLE", "FPS")
+
+
+class Recorder:
+    def __init__(self, rocket, platform, controller=""):
+        """
+        Zapisuje przebieg gry krok po kroku; pierwszy wiersz to stan początkowy rakiety.
+
+        Parameters:
+        rocket (Rocket): Obiekt rakiety.
+        platform (LandingPlatform): Obiekt platformy lądowania.
+        controller (str): Opis sterownika zapisywany w metadanych.
+
+        Attributes:
+        self.rows (list): Zapisane wiersze w kolejności REPLAY_DTYPE.
+        """
+        self.platform = platform
+        self.controller = controller
+        self.rows = []
+        self.tick(rocket)
+
+    def tick(self, rocket, outputs=None, controls=(False, False, False)):
+        """
+        Zapisuje stan rakiety po kroku fizyki.
+
+        Parameters:
+        rocket (Rocket): Obiekt rakiety.
+        outputs (Tuple[float, float] | None): Wyjścia thrust i rotate sterownika; None, gdy autopilot był wyłączony.
+        controls (Tuple[bool, bool, bool]): Klawisze gracza zastosowane w kroku (lewo, prawo, ciąg).
+        """
+        thrust_output, rotate_output = outputs if outputs is not None else (np.nan, np.nan)
+        self.rows.append((rocket.x, rocket.y, rocket.vel_x, rocket.vel_y, rocket.angleDegrees, rocket.fuel,
+                          bool(rocket.thrusting), thrust_output, rotate_output, *controls))
+
+    def replay(self, status):
+        """
+        Zwraca zapisany przebieg.
+
+        Parameters:
+        status (str): Wynik przebiegu ("success", "crash", "timeout" albo "flying", jeśli gra została przerwana).
+
+        Returns:
+        dict: Przebieg: "ticks" (tablica REPLAY_DTYPE) i "meta" (metadane).
+        """
+        meta = {
+            "status": status,
+            "controller": self.controller,
+            "platform": [self.platform.x, self.platform.y],
+            "options": {name: getattr(Options, name) for name in PHYSICS_OPTIONS},
+        }
+        return {"ticks": np.array(self.rows, dtype=REPLAY_DTYPE), "meta": meta}
+
+
+def record_episode(controller, start=None, platform=None, max_steps=None, name=""):
+    """
+    Rozgrywa epizod bez okna (Simulation.run_episode) i zapisuje jego przebieg razem z wyjściami sterownika.
+
+    Parameters:
+    controller (Callable): Sterownik (rocket, platform) zwracający wyjścia thrust i rotate.
+    start (dict | None): Stan początkowy - argumenty Simulation.make_rocket.
+    platform (LandingPlatform | None): Platforma lądowania; domyślnie Simulation.default_platform().
+    max_steps (int | None): Limit kroków epizodu.
+    name (str): Opis sterownika zapisywany w metadanych.
+
+    Returns:
+    dict: Przebieg jak w Recorder.replay.
+    """
+    platform = platform or Simulation.default_platform()
+    outputs = []
+
+    def recording_controller(rocket, platform):
+        outputs.append(controller(rocket, platform))
+
+    result = Simulation.run_episode(recording_controller, start, platform, max_steps)
+    recorder = Recorder(Simulation.make_rocket(**(start or {})), platform, name)
+    for state, output in zip(result["trajectory"][1:], outputs):
+        recorder.rows.append((*state, *(output if output is not None else (np.nan, np.nan)), False, False, False))
+    return recorder.replay(result["status"])
+
+
+def save_replay(path, replay):
+    """
+    Zapisuje przebieg do pliku .npz (bez obiektów Pythona, więc odczyt nie wymaga allow_pickle).
+
+    Parameters:
+    path (str): Ścieżka pliku.
+    replay (dict): Przebieg jak w Recorder.replay.
+    """
+    np.savez_compressed(path, ticks=replay["ticks"], meta=np.array(json.dumps(replay["meta"])))
+
+
+def load_replay(path):
+    """
+    Wczytuje przebieg zapisany przez save_replay.
+
+    Parameters:
+    path (str): Ścieżka pliku.
+
+    Returns:
+    dict: Przebieg jak w Recorder.replay.
+    """
+    with np.load(path) as data:
+        replay = {"ticks": data["ticks"], "meta": json.loads(str(data["meta"]))}
+    changed = [name for name, value in replay["meta"]["options"].items() if getattr(Options, name) != value]
+    if changed:
+        print(f"Warning: physics options changed since recording: {', '.join(changed)}")
+    return replay
+
+
+def replay_start(replay):
+    """
+    Returns:
+    dict: Stan początkowy przebiegu - argumenty Simulation.make_rocket.
+    """
+    first = replay["ticks"][0]
+    return {"x": float(first["x"]), "y": float(first["y"]), "vel_x": float(first["vel_x"]),
+            "vel_y": float(first["vel_y"]), "angle": float(first["angle"]), "fuel": float(first["fuel"])}
+
+
+def replay_platform(replay):
+    """
+    Returns:
+    LandingPlatform: Platforma lądowania przebiegu.
+    """
+    return Platform.LandingPlatform(*replay["meta"]["platform"])
+
+
+def resimulate(replay, controller=None, name=""):
+    """
+    Liczy przebieg od nowa bez okna, od zapisanego stanu początkowego.
+
+    Bez sterownika każdy krok liczony jest dokładnie jak w Game.update: zapisane klawisze gracza
+    (Game.apply_keys), grawitacja, zapisane wyjścia autopilota (FuzzyLogic.apply_control), ruch i sprawdzenie
+    lądowania. Wynik powinien być identyczny z zapisem.
+    Ze sterownikiem rozgrywany jest nowy epizod (record_episode) z tym samym limitem kroków.
+
+    Parameters:
+    replay (dict): Przebieg jak w Recorder.replay.
+    controller (Callable | None): Sterownik (rocket, platform); None - zapisane sterowania.
+    name (str): Opis sterownika zapisywany w metadanych.
+
+    Returns:
+    dict: Nowy przebieg.
+    """
+    platform = replay_platform(replay)
+    ticks = replay["ticks"]
+    if controller is not None:
+        return record_episode(controller, replay_start(replay), platform, max(len(ticks) - 1, 1), name)
+
+    rocket = Simulation.make_rocket(**replay_start(replay))
+    recorder = Recorder(rocket, platform, replay["meta"]["controller"])
+    for row in ticks[1:]:
+        rocket.thrusting = False
+        controls = (bool(row["key_left"]), bool(row["key_right"]), bool(row["key_thrust"]))
+        Game.apply_keys(rocket, *controls)
+        rocket.apply_gravity()
+        outputs = None
+        if not np.isnan(row["thrust_output"]):
+            outputs = (float(row["thrust_output"]), float(row["rotate_output"]))
+            FuzzyLogic.apply_control(rocket, *outputs)
+        rocket.update_position()
+        rocket.status = Landing.landing_status(rocket, platform) or rocket.status
+        recorder.tick(rocket, outputs, controls)
+        if rocket.status != "flying":
+            break
+
+    # The recorded steps ran out in flight: the recording ended at the step limit or when the game was closed
+    status = rocket.status
+    if status == "flying" and replay["meta"]["status"] == "timeout":
+        status = "timeout"
+    return recorder.replay(status)
+
+
+def diff_replays(first, second, tolerance=0.0):
+    """
+    Porównuje dwa przebiegi krok po kroku.
+
+    Parameters:
+    first (dict): Pierwszy przebieg.
+    second (dict): Drugi przebieg.
+    tolerance (float): Dopuszczalna różnica stanu.
+
+    Returns:
+    dict: Liczby kroków i wyniki obu przebiegów, pierwszy krok, w którym stan się różni (None, jeśli wspólne
+          kroki są zgodne), największe różnice kolumn stanu i liczba kroków z inną decyzją sterownika
+          (zaokrąglone wyjścia jak w FuzzyLogic.apply_control).
+    """
+    count = min(len(first["ticks"]), len(second["ticks"]))
+    a, b = first["ticks"][:count], second["ticks"][:count]
+    differences = {column: np.abs(a[column] - b[column]) for column in STATE_COLUMNS}
+    diverged = np.flatnonzero(np.any([difference > tolerance for difference in differences.values()], axis=0)
+                              | (a["thrusting"] != b["thrusting"]))
+
+    decisions = []
+    for ticks in (a, b):
+        thrust = np.where(np.isnan(ticks["thrust_output"]), np.nan, np.round(ticks["thrust_output"]) > 0)
+        rotate = np.where(np.isnan(ticks["rotate_output"]), np.nan, np.sign(np.round(ticks["rotate_output"])))
+        decisions.append((thrust, rotate))
+    both = ~np.isnan(decisions[0][0]) & ~np.isnan(decisions[1][0])
+    control_mismatches = int(np.sum(both & ((decisions[0][0] != decisions[1][0])
+                                            | (decisions[0][1] != decisions[1][1]))))
+
+    return {
+        "ticks": [len(first["ticks"]), len(second["ticks"])],
+        "status": [first["meta"]["status"], second["meta"]["status"]],
+        "first_divergence": int(diverged[0]) if len(diverged) else None,
+        "max_difference": {column: float(difference.max(initial=0.0)) for column, difference in differences.items()},
+        "control_mismatches": control_mismatches,
+    }
+
+
+def play(replay, speed=1.0):
+    """
+    Rysuje zapisany przebieg w oknie gry (Game.draw). Zamknięcie okna albo klawisz Q kończy odtwarzanie.
+
+    Parameters:
+    replay (dict): Przebieg jak w Recorder.replay.
+    speed (float): Szybkość względem gry (Options.FPS kroków na sekundę); 0 - bez limitu.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((Options.WIDTH, Options.HEIGHT))
+    pygame.display.set_caption("Moon Lander - replay")
+    clock = pygame.time.Clock()
+    text_cache = Game.TextCache(pygame.font.SysFont(None, 24))
+    platform = replay_platform(replay)
+    rocket = Rocket.Rocket(0, 0)
+    Rocket.get_atlas(rocket.width, rocket.height)
+
+    ticks = replay["ticks"]
+    for index, row in enumerate(ticks):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_q):
+                pygame.quit()
+                return
+        rocket.x, rocket.y, rocket.vel_x, rocket.vel_y = row["x"], row["y"], row["vel_x"], row["vel_y"]
+        rocket.angleDegrees, rocket.fuel, rocket.thrusting = row["angle"], row["fuel"], bool(row["thrusting"])
+        rocket.autopilot = not np.isnan(row["thrust_output"])
+        if index == len(ticks) - 1 and replay["meta"]["status"] in ("success", "crash"):
+            rocket.status = replay["meta"]["status"]
+        Game.draw(screen, text_cache, rocket, platform)
+        clock.tick(Options.FPS * speed if speed > 0 else 0)
+
+    # Keep the final frame visible for a moment
+    pygame.time.wait(1000)
+    pygame.quit()
+
+
+def print_diff(difference):
+    print(json.dumps(difference, indent=2))
+    first_ticks, second_ticks = difference["ticks"]
+    first_status, second_status = difference["status"]
+    if first_ticks != second_ticks:
+        print(f"Tick counts differ: {first_ticks} vs {second_ticks}")
+    if first_status != second_status:
+        print(f"Statuses differ: {first_status} vs {second_status}")
+    if difference["first_divergence"] is not None:
+        print(f"Replays diverge at tick {difference['first_divergence']}")
+    elif first_ticks == second_ticks and first_status == second_status:
+        print("Replays are identical")
+
+
+def add_controller_arguments(parser):
+    parser.add_argument("--fuzzy-table", default=Options.FUZZY_TABLE_PATH,
+                        help="skompilowana tablica sterownika rozmytego; pusta - pełne wnioskowanie")
+    parser.add_argument("--params", default=Options.FUZZY_PARAMS_PATH)
+    parser.add_argument("--policy", default=Options.POLICY_TABLE_PATH, help="tablica polityki (PolicyTable.py)")
+
+
+def make_controller(args):
+    return Simulation.make_controller(args.controller, args.fuzzy_table, args.params, args.policy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zapis i odtwarzanie przebiegów Moon Lander")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="rozegraj epizod bez okna i zapisz przebieg")
+    record.add_argument("--controller", choices=Simulation.CONTROLLERS, default=Options.AUTOPILOT)
+    add_controller_arguments(record)
+    for name, default in (("x", 250.0), ("y", 500.0), ("vel-x", 0.0), ("vel-y", 0.0), ("angle", 0.0),
+                          ("fuel", 1000.0)):
+        record.add_argument(f"--{name}", type=float, default=default)
+    record.add_argument("--max-steps", type=int, default=None)
+    record.add_argument("--output", default=Options.REPLAY_PATH)
+
+    play_parser = commands.add_parser("play", help="odtwórz przebieg w oknie albo przelicz go bez okna")
+    play_parser.add_argument("path")
+    play_parser.add_argument("--speed", type=float, default=1.0, help="0 - bez limitu")
+    play_parser.add_argument("--headless", action="store_true",
+                             help="przelicz przebieg bez okna i porównaj z zapisem")
+    play_parser.add_argument("--controller", choices=Simulation.CONTROLLERS, default=None,
+                             help="przy --headless: przelicz z innym sterownikiem zamiast zapisanych sterowań")
+    add_controller_arguments(play_parser)
+    play_parser.add_argument("--output", default=None, help="plik .npz z przeliczonym przebiegiem")
+
+    diff = commands.add_parser("diff", help="porównaj dwa przebiegi krok po kroku")
+    diff.add_argument("first")
+    diff.add_argument("second")
+    diff.add_argument("--tolerance", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        start = {"x": args.x, "y": args.y, "vel_x": args.vel_x, "vel_y": args.vel_y, "angle": args.angle,
+                 "fuel": args.fuel}
+        replay = record_episode(make_controller(args), start,
+                                max_steps=args.max_steps, name=args.controller)
+        save_replay(args.output, replay)
+        print(f"{replay['meta']['status']} after {len(replay['ticks']) - 1} ticks, saved to {args.output}")
+
+    elif args.command == "play":
+        replay = load_replay(args.path)
+        if not args.headless:
+            play(replay, args.speed)
+            return
+        controller = make_controller(args) if args.controller else None
+        start = time.perf_counter()
+        resimulated = resimulate(replay, controller, args.controller or replay["meta"]["controller"])
+        elapsed = time.perf_counter() - start
+        print(f"{len(resimulated['ticks']) - 1} ticks in {elapsed * 1000:.1f} ms, "
+              f"status: {resimulated['meta']['status']}")
+        print_diff(diff_replays(replay, resimulated))
+        if args.output:
+            save_replay(args.output, resimulated)
+
+    else:
+        print_diff(diff_replays(load_replay(args.first), load_replay(args.second), args.tolerance))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,137 @@ import math
 import numpy as np
 import Options
 
+
+class SpriteAtlas:
+    def __init__(self, images, lazy=False):
+        """
+        Atlas obróconych obrazów rakiety. Kąt rakiety zmienia się o Options.ROTATION_SPEED w granicach
+        +-Options.MAX_ROCKET_ROTATION, więc osiągalnych kątów jest niewiele (91 dla domyślnych opcji) - każdy obraz
+        obracany jest raz, razem z przesunięciem lewego górnego rogu względem środka rakiety.
+
+        Parameters:
+        images (Tuple[pygame.Surface, ...]): Obrazy do obracania (wyłączony i włączony napęd).
+        lazy (bool): Czy obracać obrazy dopiero przy pierwszym użyciu kąta (zamiast od razu).
+
+        Attributes:
+        self.sprites (List[List[pygame.Surface | None]]): Obrócone obrazy [obraz][indeks kąta].
+        self.offsets (List[List[tuple | None]]): Przesunięcia (dx, dy) lewego górnego rogu względem środka.
+        self.extra (dict): Obrazy dla kątów spoza siatki (np. stan ustawiony ręcznie), obracane przy użyciu.
+        """
+        self.images = images
+        self.count = int(round(2 * Options.MAX_ROCKET_ROTATION / Options.ROTATION_SPEED)) + 1
+        self.sprites = [[None] * self.count for _ in images]
+        self.offsets = [[None] * self.count for _ in images]
+        self.extra = {}
+        if not lazy:
+            for image in range(len(images)):
+                for index in range(self.count):
+                    self.sprites[image][index], self.offsets[image][index] = self.rotate(image, self.angle(index))
+
+    def angle(self, index):
+        """
+        Returns:
+        float: Kąt w stopniach odpowiadający indeksowi atlasu.
+        """
+        return -Options.MAX_ROCKET_ROTATION + index * Options.ROTATION_SPEED
+
+    def index(self, angle):
+        """
+        Zwraca indeks atlasu dla kąta albo None, jeśli kąt nie leży na siatce osiągalnych kątów.
+
+        Parameters:
+        angle (float): Kąt rakiety w stopniach.
+
+        Returns:
+        int | None: Indeks kąta.
+        """
+        position = (angle + Options.MAX_ROCKET_ROTATION) / Options.ROTATION_SPEED
+        index = int(round(position))
+        if 0 <= index < self.count and abs(position - index) < 1e-9:
+            return index
+        return None
+
+    def rotate(self, image, angle):
+        """
+        Obraca obraz o kąt rakiety.
+
+        Returns:
+        Tuple[pygame.Surface, tuple]: Obrócony obraz i przesunięcie (dx, dy) lewego górnego rogu względem środka.
+        """
+        sprite = pygame.transform.rotate(self.images[image], -angle)
+        return sprite, (-(sprite.get_width() // 2), -(sprite.get_height() // 2))
+
+    def get(self, image, angle):
+        """
+        Zwraca obrócony obraz i jego przesunięcie dla kąta (obracając go, jeśli jeszcze go nie ma w atlasie).
+
+        Parameters:
+        image (int): Indeks obrazu (0 - napęd wyłączony, 1 - włączony).
+        angle (float): Kąt rakiety w stopniach.
+
+        Returns:
+        Tuple[pygame.Surface, tuple]: Obrócony obraz i przesunięcie (dx, dy) lewego górnego rogu względem środka.
+        """
+        index = self.index(angle)
+        if index is None:
+            key = (image, angle)
+            if key not in self.extra:
+                self.extra[key] = self.rotate(image, angle)
+            return self.extra[key]
+        if self.sprites[image][index] is None:
+            self.sprites[image][index], self.offsets[image][index] = self.rotate(image, angle)
+        return self.sprites[image][index], self.offsets[image][index]
+
+
+def load_images(width, height):
+    """
+    Wczytuje i skaluje obrazy rakiety.
+
+    Parameters:
+    width (int): Szerokość obrazu rakiety.
+    height (int): Wysokość obrazu rakiety.
+
+    Returns:
+    Tuple[pygame.Surface, pygame.Surface]: Obrazy z wyłączonym i włączonym napędem.
+    """
+    return (pygame.transform.scale(pygame.image.load('rocketOff.png'), (width, height)),
+            pygame.transform.scale(pygame.image.load('rocketOn.png'), (width, height)))
+
+
+# Atlasy współdzielone przez rakiety o tym samym rozmiarze, (width, height) -> SpriteAtlas
+_atlases = {}
+
+
+def get_atlas(width, height, lazy=None):
+    """
+    Zwraca atlas obrazów rakiety o podanym rozmiarze, tworząc go przy pierwszym wywołaniu.
+    Gra wywołuje tę funkcję przy starcie, więc w pętli gry obrazy nie są już obracane.
+
+    Parameters:
+    width (int): Szerokość obrazu rakiety.
+    height (int): Wysokość obrazu rakiety.
+    lazy (bool | None): Czy obracać obrazy przy pierwszym użyciu; domyślnie Options.ROCKET_ATLAS_LAZY.
+
+    Returns:
+    SpriteAtlas: Atlas obrazów rakiety.
+    """
+    atlas = _atlases.get((width, height))
+    if atlas is None:
+        images = load_images(width, height)
+        if pygame.display.get_surface() is not None:
+            # Pixel format of the screen makes every blit a plain copy
+            images = [image.convert_alpha() for image in images]
+        lazy = Options.ROCKET_ATLAS_LAZY if lazy is None else lazy
+        atlas = SpriteAtlas(tuple(images), lazy)
+        _atlases[(width, height)] = atlas
+    return atlas
+
+
 class Rocket:
     def __init__(self, x, y):
         """
-        Inicjalizuje obiekt Rocket z jego pozycją, prędkością, kątem, paliwem oraz obrazami.
+        Inicjalizuje obiekt Rocket z jego pozycją, prędkością, kątem i paliwem. Obrazy rakiety są wczytywane
+        dopiero przy pierwszym rysowaniu, więc symulacja bez okna (Simulation.py) nie potrzebuje plików PNG.
 
         Parameters:
         x (float): Początkowa współrzędna x rakiety.
@@ -20,12 +147,30 @@ class Rocket:
         self.fuel = 1000
         self.width = 30
         self.height = 60
-        self.rocketOff = pygame.transform.scale(pygame.image.load('rocketOff.png'),(self.width, self.height))
-        self.rocketOn = pygame.transform.scale(pygame.image.load('rocketOn.png'),(self.width, self.height))
+        self._images = None
         self.thrusting = False
         self.status = "flying"
         self.autopilot = True
 
+    def load_images(self):
+        """
+        Wczytuje i skaluje obrazy rakiety (przy pierwszym wywołaniu).
+
+        Returns:
+        Tuple[pygame.Surface, pygame.Surface]: Obrazy z wyłączonym i włączonym napędem.
+        """
+        if self._images is None:
+            self._images = load_images(self.width, self.height)
+        return self._images
+
+    @property
+    def rocketOff(self):
+        return self.load_images()[0]
+
+    @property
+    def rocketOn(self):
+        return self.load_images()[1]
+
     def get_image(self):
         """
         Zwraca aktualny obraz rakiety w zależności od jej stanu napędu.
@@ -99,6 +244,15 @@ class Rocket:
         """
         return np.sqrt(self.vel_x ** 2 + self.vel_y ** 2)
 
+    def get_rotated_image(self):
+        """
+        Zwraca obraz rakiety obrócony o jej kąt z atlasu obrazów (get_atlas).
+
+        Returns:
+        Tuple[pygame.Surface, tuple]: Obrócony obraz i przesunięcie (dx, dy) lewego górnego rogu względem środka.
+        """
+        return get_atlas(self.width, self.height).get(int(bool(self.thrusting)), self.angleDegrees)
+
     def draw(self, screen):
         """
         Rysuje rakietę na ekranie w jej aktualnej pozycji i orientacji.
@@ -106,7 +260,5 @@ class Rocket:
         Parameters:
         screen (pygame.Surface): Powierzchnia ekranu, na której rysowana jest rakieta.
         """
-        rotated_image = pygame.transform.rotate(self.get_image(), -self.angleDegrees)
-        rect = rotated_image.get_rect(center=(self.x, self.y))
-        screen.blit(rotated_image, rect.topleft)
-        self.thrusting = False
\ No newline at end of file
+        rotated_image, (dx, dy) = self.get_rotated_image()
+        screen.blit(rotated_image, (round(self.x) + dx, round(self.y) + dy))
\ No newline at end of file
@@ -0,0 +1,267 @@
+import argparse
+import functools
+import time
+
+import numpy as np
+
+import Landing
+import Options
+import Platform
+import Rocket
+
+"""
+Symulacja Moon Lander bez okna i renderowania.
+
+Fizyka gry jest liczona w stałych krokach - jeden krok odpowiada jednej klatce gry (Options.FPS klatek na sekundę),
+tak samo jak w Game.main, ale bez czekania na zegar. Pozwala to rozgrywać tysiące epizodów autopilota
+na minutę (np. do oceny i strojenia sterownika rozmytego).
+
+Sterownik to funkcja (rocket, platform) ustawiająca ciąg i obrót rakiety, np.
+functools.partial(FuzzyLogic.fuzzy_control, autopilot_ctrl=autopilot_ctrl) albo
+functools.partial(FuzzyTable.table_control, controller=compiled_ctrl); make_controller tworzy go po nazwie.
+
+Uruchomienie (losowe stany początkowe, autopilot rozmyty albo tablica polityki):
+    python Simulation.py --episodes 1000 --seed 0 --controller fuzzy
+"""
+
+# Kolumny tablicy trajektorii zwracanej przez run_episode
+TRAJECTORY_COLUMNS = ("x", "y", "vel_x", "vel_y", "angle", "fuel", "thrusting")
+# Zakresy losowych stanów początkowych (random_starts)
+START_X_RANGE = (50, Options.WIDTH - 50)
+START_Y_RANGE = (50, 500)
+START_VELOCITY_RANGE = (-2, 2)
+# Nazwy autopilotów make_controller
+CONTROLLERS = ("fuzzy", "table")
+
+
+def default_platform():
+    """
+    Tworzy platformę lądowania w tym samym miejscu co w grze (na środku, 100 pikseli nad dolną krawędzią).
+
+    Returns:
+    LandingPlatform: Platforma lądowania.
+    """
+    return Platform.LandingPlatform((Options.WIDTH - Options.LANDING_PLATFORM_WIDTH) / 2, Options.HEIGHT - 100)
+
+
+def make_controller(name=Options.AUTOPILOT, fuzzy_table_path=Options.FUZZY_TABLE_PATH,
+                    params_path=Options.FUZZY_PARAMS_PATH, policy_path=Options.POLICY_TABLE_PATH, live_fallback=True):
+    """
+    Tworzy autopilota po nazwie.
+
+    Parameters:
+    name (str): "fuzzy" - sterownik rozmyty: skompilowana tablica (FuzzyTable.py), jeśli plik istnieje
+                i pasuje do params_path, w przeciwnym razie pełne wnioskowanie; "table" - tablica polityki
+                (PolicyTable.py).
+    fuzzy_table_path (str | None): Skompilowana tablica sterownika rozmytego.
+    params_path (str): Nastrojone funkcje przynależności (FuzzyTuner.py); bez pliku domyślne.
+    policy_path (str): Tablica polityki.
+    live_fallback (bool): Czy bez aktualnej skompilowanej tablicy używać pełnego wnioskowania rozmytego
+                          (dziesiątki milisekund na krok); False - make_controller zwraca wtedy None.
+
+    Returns:
+    Callable | None: Sterownik (rocket, platform) zwracający wyjścia thrust i rotate.
+    """
+    # Imported on demand: the autopilots depend on this module, and the physics core does not depend on them
+    import FuzzyLogic
+    import FuzzyTable
+    import PolicyTable
+
+    if name == "table":
+        return functools.partial(PolicyTable.policy_control, table=PolicyTable.PolicyTable.load(policy_path))
+    if name != "fuzzy":
+        raise ValueError(f"Unknown controller: {name} (expected one of {CONTROLLERS})")
+    compiled = FuzzyTable.load_compiled(fuzzy_table_path, params_path)
+    if compiled is not None:
+        return functools.partial(FuzzyTable.table_control, controller=compiled)
+    if not live_fallback:
+        return None
+    return functools.partial(FuzzyLogic.fuzzy_control, autopilot_ctrl=FuzzyLogic.load_fuzzy_logic(params_path))
+
+
+def make_rocket(x=250, y=500, vel_x=0, vel_y=0, angle=0, fuel=1000):
+    """
+    Tworzy rakietę w podanym stanie początkowym (obrazy rakiety nie są wczytywane).
+
+    Parameters:
+    x (float): Początkowa współrzędna x rakiety.
+    y (float): Początkowa współrzędna y rakiety.
+    vel_x (float): Początkowa prędkość w osi X.
+    vel_y (float): Początkowa prędkość w osi Y.
+    angle (float): Początkowy kąt rakiety w stopniach.
+    fuel (float): Początkowa ilość paliwa.
+
+    Returns:
+    Rocket: Rakieta gotowa do symulacji.
+    """
+    rocket = Rocket.Rocket(x, y)
+    rocket.vel_x = vel_x
+    rocket.vel_y = vel_y
+    rocket.angleDegrees = angle
+    rocket.fuel = fuel
+    return rocket
+
+
+def step(rocket, platform, controller=None):
+    """
+    Wykonuje jeden krok fizyki (jedną klatkę gry): grawitacja, sterowanie, ruch i sprawdzenie lądowania.
+
+    Parameters:
+    rocket (Rocket): Obiekt rakiety w stanie "flying".
+    platform (LandingPlatform): Obiekt platformy lądowania.
+    controller (Callable | None): Sterownik (rocket, platform); None, gdy rakietą steruje gracz.
+
+    Returns:
+    str: Status rakiety po kroku ("flying", "success" albo "crash").
+    """
+    rocket.apply_gravity()
+    if controller is not None:
+        controller(rocket, platform)
+    rocket.update_position()
+    rocket.status = Landing.landing_status(rocket, platform) or rocket.status
+    return rocket.status
+
+
+def rocket_state(rocket):
+    """
+    Returns:
+    tuple: Stan rakiety w kolejności TRAJECTORY_COLUMNS.
+    """
+    return rocket.x, rocket.y, rocket.vel_x, rocket.vel_y, rocket.angleDegrees, rocket.fuel, rocket.thrusting
+
+
+def run_episode(controller, start=None, platform=None, max_steps=None, record=True, stop_below_platform=False):
+    """
+    Rozgrywa jeden epizod do lądowania, rozbicia albo przekroczenia limitu kroków, jak w grze.
+    Przy stop_below_platform=True rakieta, która spadnie poniżej platformy, kończy epizod jako "crash" - to
+    odstępstwo od gry (tam rakieta może jeszcze wznieść się napędem), skracające epizody chybionych lotów.
+
+    Parameters:
+    controller (Callable): Sterownik (rocket, platform).
+    start (dict | None): Stan początkowy - argumenty make_rocket; domyślnie stan startowy gry.
+    platform (LandingPlatform | None): Platforma lądowania; domyślnie default_platform().
+    max_steps (int | None): Limit kroków; domyślnie Options.SIMULATION_MAX_STEPS.
+    record (bool): Czy zapisywać trajektorię.
+    stop_below_platform (bool): Czy kończyć epizod rakiety poniżej platformy.
+
+    Returns:
+    dict: Wynik epizodu: status ("success", "crash" albo "timeout"), liczba kroków, czas lotu w sekundach gry,
+          końcowy stan rakiety i - przy record=True - trajektoria: tablica (kroki + 1, len(TRAJECTORY_COLUMNS))
+          ze stanem początkowym i stanem po każdym kroku.
+    """
+    rocket = make_rocket(**(start or {}))
+    platform = platform or default_platform()
+    max_steps = Options.SIMULATION_MAX_STEPS if max_steps is None else max_steps
+    floor = platform.y + platform.height
+    trajectory = [rocket_state(rocket)] if record else None
+    status = "timeout"
+    steps = 0
+
+    while steps < max_steps:
+        rocket.thrusting = False
+        steps += 1
+        step(rocket, platform, controller)
+        if record:
+            trajectory.append(rocket_state(rocket))
+        if rocket.status != "flying":
+            status = rocket.status
+            break
+        if stop_below_platform and rocket.y + rocket.height // 2 >= floor:
+            status = "crash"
+            break
+
+    result = {
+        "status": status,
+        "steps": steps,
+        "time": steps / Options.FPS,
+        "x": rocket.x,
+        "y": rocket.y,
+        "vel_x": rocket.vel_x,
+        "vel_y": rocket.vel_y,
+        "angle": rocket.angleDegrees,
+        "fuel": rocket.fuel,
+    }
+    if record:
+        result["trajectory"] = np.array(trajectory, dtype=float)
+    return result
+
+
+def random_starts(count, seed=0):
+    """
+    Losuje stany początkowe rakiety (pozycja, prędkość; kąt zero i pełny bak).
+
+    Parameters:
+    count (int): Liczba stanów.
+    seed (int): Ziarno losowania.
+
+    Returns:
+    List[dict]: Stany początkowe w postaci argumentów make_rocket.
+    """
+    rng = np.random.default_rng(seed)
+    return [{"x": float(rng.uniform(*START_X_RANGE)), "y": float(rng.uniform(*START_Y_RANGE)),
+             "vel_x": float(rng.uniform(*START_VELOCITY_RANGE)), "vel_y": float(rng.uniform(*START_VELOCITY_RANGE))}
+            for _ in range(count)]
+
+
+def run_episodes(controller, starts, max_steps=None, record=False, stop_below_platform=False):
+    """
+    Rozgrywa epizody dla listy stanów początkowych.
+
+    Parameters:
+    controller (Callable): Sterownik (rocket, platform).
+    starts (List[dict]): Stany początkowe.
+    max_steps (int | None): Limit kroków epizodu.
+    record (bool): Czy zapisywać trajektorie.
+    stop_below_platform (bool): Czy kończyć epizody rakiet poniżej platformy (run_episode).
+
+    Returns:
+    List[dict]: Wyniki run_episode w kolejności stanów początkowych.
+    """
+    platform = default_platform()
+    return [run_episode(controller, start, platform, max_steps, record, stop_below_platform) for start in starts]
+
+
+def summarize(results):
+    """
+    Podsumowuje wyniki epizodów.
+
+    Parameters:
+    results (List[dict]): Wyniki run_episode.
+
+    Returns:
+    dict: Liczba epizodów, odsetki wyników, średni czas lotu i pozostałe paliwo udanych lądowań.
+    """
+    summary = {"episodes": len(results)}
+    for status in ("success", "crash", "timeout"):
+        summary[f"{status}_rate"] = sum(result["status"] == status for result in results) / len(results)
+    landed = [result for result in results if result["status"] == "success"]
+    summary["mean_landing_time"] = float(np.mean([result["time"] for result in landed])) if landed else 0.0
+    summary["mean_landing_fuel"] = float(np.mean([result["fuel"] for result in landed])) if landed else 0.0
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Symulacja autopilota Moon Lander bez okna")
+    parser.add_argument("--episodes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-steps", type=int, default=None)
+    parser.add_argument("--controller", choices=CONTROLLERS, default=Options.AUTOPILOT)
+    parser.add_argument("--fuzzy-table", default=Options.FUZZY_TABLE_PATH,
+                        help="skompilowana tablica sterownika (FuzzyTable.py); bez pliku pełne wnioskowanie")
+    parser.add_argument("--policy", default=Options.POLICY_TABLE_PATH, help="tablica polityki (PolicyTable.py)")
+    args = parser.parse_args()
+
+    controller = make_controller(args.controller, args.fuzzy_table, policy_path=args.policy)
+
+    start = time.perf_counter()
+    results = run_episodes(controller, random_starts(args.episodes, args.seed), args.max_steps)
+    elapsed = time.perf_counter() - start
+
+    for key, value in summarize(results).items():
+        print(f"{key}: {value:.4g}")
+    print(f"{args.episodes / elapsed * 60:.0f} episodes per minute, "
+          f"{sum(result['steps'] for result in results) / elapsed:.0f} steps per second")
+
+
+if __name__ == "__main__":
+    main()